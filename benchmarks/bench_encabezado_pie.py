@@ -0,0 +1,60 @@
+"""
+Benchmark del costo por página del encabezado y pie de PDFHeaderFooter.
+
+Arma documentos de 10 a 500 páginas (solo encabezado y pie) y muestra el
+tiempo y los bytes por página. Además cuenta los objetos imagen del PDF
+resultante: deben ser exactamente 2 (encabezado y pie) sin importar el
+número de páginas; si no, el script termina con error.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_encabezado_pie
+"""
+import os
+import re
+import sys
+import tempfile
+import time
+
+from benchmarks.datos_sinteticos import generar_plantillas
+from modules.CREATE_PDF_V1 import PDFHeaderFooter
+
+PAGINAS = [10, 50, 200, 500]
+RE_IMAGEN = re.compile(rb"/Subtype\s*/Image\b")
+
+
+def contar_imagenes(ruta_pdf) -> int:
+    """Número de XObjects imagen en el PDF (fpdf2 no comprime los diccionarios)."""
+    with open(ruta_pdf, "rb") as f:
+        return len(RE_IMAGEN.findall(f.read()))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            generar_plantillas()
+            errores = 0
+            print(f"{'páginas':>8} {'total s':>9} {'ms/pág':>8} {'KB/pág':>8} {'imágenes':>9}")
+            for n in PAGINAS:
+                t0 = time.perf_counter()
+                pdf = PDFHeaderFooter(usar_miniaturas=False)
+                for _ in range(n - 1):
+                    pdf.add_page()
+                salida = f"paginas_{n}.pdf"
+                pdf.output(salida)
+                seg = time.perf_counter() - t0
+
+                imagenes = contar_imagenes(salida)
+                tam = os.path.getsize(salida)
+                print(f"{n:>8} {seg:>9.3f} {seg / n * 1000:>8.3f} {tam / n / 1024:>8.2f} {imagenes:>9}")
+                if imagenes != 2:
+                    print(f"❌ Se esperaban 2 imágenes (encabezado y pie) y hay {imagenes}")
+                    errores += 1
+        finally:
+            os.chdir(cwd)
+    return errores
+
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
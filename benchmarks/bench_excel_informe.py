@@ -0,0 +1,55 @@
+"""
+Benchmark del informe Excel (CREATE_EXCEL_RESUME, modo write_only).
+
+Escribe el informe para 10k, 100k y 500k actividades repartidas en un año
+y muestra tiempo, memoria del proceso (RSS actual antes de escribir, con
+el DataFrame ya en memoria, y RSS máximo al terminar) y tamaño del archivo.
+Cada tamaño corre en un proceso aparte para que la memoria no se acumule.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_excel_informe [n_filas ...]
+"""
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+TAMANOS = [10_000, 100_000, 500_000]
+
+
+def _rss_actual_mb():
+    """RSS actual del proceso (Linux: /proc/self/statm, en páginas)."""
+    with open("/proc/self/statm") as f:
+        paginas = int(f.read().split()[1])
+    return paginas * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def _medir(n_filas):
+    from benchmarks.datos_sinteticos import generar_df_actividades
+    from modules.CREATE_EXCEL_RESUME import CREATE_EXCEL_RESUME
+
+    df = generar_df_actividades(n_filas)
+    rss_inicial = _rss_actual_mb()
+    with tempfile.TemporaryDirectory() as tmp:
+        t0 = time.perf_counter()
+        ruta = CREATE_EXCEL_RESUME(output_dir=tmp).crear_informe(df, "2025-01-01", "2025-12-31")
+        seg = time.perf_counter() - t0
+        tam = os.path.getsize(ruta)
+    # ru_maxrss está en KB en Linux
+    rss_max = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{n_filas:>9,} {seg:>9.2f} {rss_inicial:>10.1f} {rss_max:>10.1f} {tam / 1e6:>9.2f}")
+
+
+def main(tamanos):
+    print(f"{'filas':>9} {'seg':>9} {'RSS antes':>10} {'RSS máx':>10} {'xlsx MB':>9}")
+    for n in tamanos:
+        subprocess.run([sys.executable, "-m", "benchmarks.bench_excel_informe", "--una", str(n)], check=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--una":
+        _medir(int(sys.argv[2]))
+    else:
+        main([int(a) for a in sys.argv[1:]] or TAMANOS)
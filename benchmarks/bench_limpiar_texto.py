@@ -0,0 +1,72 @@
+"""
+Benchmark de la limpieza de DESCRIPCION para el PDF.
+
+Compara la versión original (fila por fila con ~25 `str.replace`,
+`re.sub`, NFKD y ida y vuelta a latin-1) contra LIMPIAR_TEXTO.serie_pdf
+sobre 100.000 descripciones sintéticas, y verifica que el resultado sea igual.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_limpiar_texto [n_filas]
+"""
+import random
+import re
+import sys
+import time
+import unicodedata
+
+import pandas as pd
+
+from modules.LIMPIAR_TEXTO import LIMPIAR_TEXTO
+
+
+def _limpiar_texto_pdf_original(texto):
+    """Copia de la implementación previa, usada como referencia."""
+    if pd.isna(texto):
+        return ""
+    texto = str(texto)
+    for t in ["\u200b", "\u200c", "\u200d", "\ufeff", "\xa0", "\t", "\r"]:
+        texto = texto.replace(t, " ")
+    for raro, simple in LIMPIAR_TEXTO.REEMPLAZOS_PDF.items():
+        texto = texto.replace(raro, simple)
+    texto = re.sub(r'[^\x00-\xFF]', '', texto)
+    texto = unicodedata.normalize("NFKD", texto)
+    texto = texto.encode("latin-1", "ignore").decode("latin-1")
+    return " ".join(texto.split())
+
+
+def descripciones_sinteticas(n, semilla=7, n_unicas=5000):
+    """Descripciones con tildes, comillas tipográficas, emojis y espacios raros."""
+    rnd = random.Random(semilla)
+    palabras = [
+        "llenado", "tanque", "suministro", "agua", "revisión", "bomba",
+        "baño", "muelle", "bodega", "cubierta", "válvula", "tubería",
+        "–", "—", "“", "”", "’", "…", "•", "\U0001F600", "\u200b", "\xa0", "\t", "½", "ñ",
+    ]
+    unicas = [
+        " ".join(rnd.choice(palabras) for _ in range(rnd.randrange(5, 60)))
+        for _ in range(n_unicas)
+    ]
+    return pd.Series([rnd.choice(unicas) for _ in range(n)])
+
+
+def main(n=100_000):
+    serie = descripciones_sinteticas(n)
+
+    t0 = time.perf_counter()
+    original = serie.astype(str).apply(_limpiar_texto_pdf_original)
+    t_original = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    nuevo = LIMPIAR_TEXTO.serie_pdf(serie.astype(str))
+    t_nuevo = time.perf_counter() - t0
+
+    iguales = bool((original == nuevo).all())
+    print(f"Filas: {n:,}")
+    print(f"Original (apply por fila): {t_original:8.3f} s")
+    print(f"LIMPIAR_TEXTO.serie_pdf:   {t_nuevo:8.3f} s  (x{t_original / t_nuevo:,.1f})")
+    print(f"Resultados idénticos: {'sí' if iguales else 'NO'}")
+    return 0 if iguales else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000))
@@ -0,0 +1,67 @@
+"""
+Benchmark de las miniaturas de fotos en el PDF.
+
+Genera en una carpeta temporal un conjunto de actividades con fotos grandes
+y arma el PDF de varios días tres veces:
+- sin miniaturas (fotos originales),
+- con miniaturas en frío (se crean),
+- con miniaturas en caliente (se reutilizan).
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_miniaturas [n_actividades]
+"""
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.datos_sinteticos import generar_fotos, generar_plantillas
+from modules.CREATE_PDF_V1 import PDFHeaderFooter
+
+
+def _armar_pdf(df, ruta_salida, usar_miniaturas):
+    t0 = time.perf_counter()
+    pdf = PDFHeaderFooter(usar_miniaturas=usar_miniaturas)
+    for i, (fecha, df_dia) in enumerate(df.groupby("FECHA")):
+        pdf.agregar_tabla_actividades_dia(i + 1, fecha.year, fecha, df_dia, descripcion_servicio="-")
+    pdf.output(ruta_salida)
+    return time.perf_counter() - t0, os.path.getsize(ruta_salida), pdf.pages_count
+
+
+def main(n_actividades=40):
+    fechas = pd.date_range("2025-01-01", periods=10, freq="D")
+    df = pd.DataFrame({
+        "ID_ACTIVIDAD": range(1, n_actividades + 1),
+        "FECHA": [fechas[i % len(fechas)] for i in range(n_actividades)],
+        "ZONA": "MUELLE 1",
+        "DESCRIPCION": "Llenado de tanque de almacenamiento de agua potable",
+        "UNIDAD_MEDIDA": "M3",
+        "CANTIDAD": 10,
+        "VALOR_UNITARIO": 32000,
+        "VALOR_TOTAL": 320000,
+    })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            generar_plantillas()
+            generar_fotos(df["ID_ACTIVIDAD"])
+
+            casos = [
+                ("sin miniaturas", "a.pdf", False),
+                ("miniaturas (frío)", "b.pdf", True),
+                ("miniaturas (caliente)", "c.pdf", True),
+            ]
+            print(f"Actividades: {n_actividades} (3 fotos 3000x4000 c/u)")
+            for nombre, salida, usar in casos:
+                seg, tam, paginas = _armar_pdf(df, salida, usar)
+                print(f"{nombre:<24} {seg:7.2f} s  {tam / 1e6:9.2f} MB  {paginas} páginas")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
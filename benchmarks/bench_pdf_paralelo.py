@@ -0,0 +1,69 @@
+"""
+Benchmark del PDF en paralelo (PDF_PARALELO).
+
+Genera en una carpeta temporal actividades con fotos grandes repartidas en
+varios días y arma el informe con 1, 2, 4, ... procesos, primero con la
+caché de miniaturas vacía y luego llena (solo el dibujo), para ver cómo
+escala el tiempo con los núcleos.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_pdf_paralelo [n_actividades]
+"""
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.datos_sinteticos import generar_fotos, generar_plantillas
+from modules.PDF_PARALELO import PDF_PARALELO
+
+
+def main(n_actividades=60):
+    fechas = pd.date_range("2025-01-01", periods=20, freq="D")
+    df = pd.DataFrame({
+        "ID_ACTIVIDAD": range(1, n_actividades + 1),
+        "FECHA": [fechas[i % len(fechas)] for i in range(n_actividades)],
+        "ZONA": "MUELLE 1",
+        "DESCRIPCION": "Llenado de tanque de almacenamiento de agua potable",
+        "UNIDAD_MEDIDA": "M3",
+        "CANTIDAD": 10,
+        "VALOR_UNITARIO": 32000,
+        "VALOR_TOTAL": 320000,
+    })
+    dias = [
+        dict(num_dia=i + 1, anio=fecha.year, fecha_dia=fecha, df_dia=df_dia, descripcion_servicio="-")
+        for i, (fecha, df_dia) in enumerate(df.groupby("FECHA"))
+    ]
+
+    procesos = [1]
+    while procesos[-1] * 2 <= (os.cpu_count() or 1):
+        procesos.append(procesos[-1] * 2)
+    if len(procesos) == 1:
+        procesos.append(2)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)
+        try:
+            generar_plantillas()
+            generar_fotos(df["ID_ACTIVIDAD"])
+
+            print(f"Actividades: {n_actividades} en {len(dias)} días, núcleos: {os.cpu_count()}")
+            for n in procesos:
+                shutil.rmtree(os.path.join("BD", "CACHE", "MINIATURAS"), ignore_errors=True)
+                tiempos = []
+                for _ in ("vacía", "llena"):
+                    t0 = time.perf_counter()
+                    salida = PDF_PARALELO(max_procesos=n).generar(dias, f"informe_{n}.pdf")
+                    tiempos.append(time.perf_counter() - t0)
+                print(f"{n:>2} procesos  caché vacía {tiempos[0]:7.2f} s  llena {tiempos[1]:7.2f} s  "
+                      f"{os.path.getsize(salida) / 1e6:7.2f} MB")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 60)
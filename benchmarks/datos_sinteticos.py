@@ -0,0 +1,129 @@
+"""
+Datos sintéticos para los benchmarks: libro BD_ACTIVIDADES, plantillas
+de encabezado/pie y árbol de fotos BD/FOTOS/ACTIVIDADES_FOTOS/<ID_ACTIVIDAD>.
+"""
+import datetime as dt
+import os
+import random
+
+from openpyxl import Workbook
+from PIL import Image
+
+COLUMNAS = [
+    "ID_ACTIVIDAD", "FECHA", "ID_ITEM", "ACTIVIDAD", "TIPO_ACT", "ZONA",
+    "DESCRIPCION", "UNIDAD_MEDIDA", "CANTIDAD", "VALOR_UNITARIO",
+    "VALOR_TOTAL", "RESPONSABLE", "OBSERVACIONES",
+]
+
+ZONAS = ["MUELLE 1", "MUELLE 2", "BODEGA 3", "OFICINAS ADMINISTRATIVAS", "PATIO 5", "PORTERÍA"]
+UNIDADES = ["ML", "M2", "M3", "UND"]
+PALABRAS = [
+    "llenado", "tanque", "suministro", "agua", "revisión", "bomba", "baño",
+    "válvula", "tubería", "cubierta", "limpieza", "reparación", "zona",
+]
+BASURA_UNICODE = ["–", "—", "“", "”", "’", "…", "•", "\u200b", "\xa0", "\t", "\U0001F600", "½"]
+
+
+def generar_libro_actividades(ruta, n_filas=1000, semilla=1, proporcion_31=0.6,
+                              fecha_inicio=dt.datetime(2024, 1, 1), dias=730,
+                              zonas=ZONAS, unidades=UNIDADES, palabras_descripcion=(4, 80),
+                              proporcion_basura=0.08, proporcion_moneda_texto=0.0):
+    """
+    Escribe un libro con la hoja 'BD' y `n_filas` actividades:
+    mezcla de ID_ITEM (proporcion_31 con 3.1), zonas, unidades y
+    descripciones de largo variable con caracteres Unicode problemáticos.
+
+    - palabras_descripcion: (mínimo, máximo) de palabras por descripción.
+    - proporcion_basura: fracción de palabras reemplazadas por BASURA_UNICODE.
+    - proporcion_moneda_texto: fracción de filas con los montos escritos como
+      texto ("$ 1.200.000", "$1,200") en lugar de número, como pasa al pegar
+      desde otros libros.
+    """
+    rnd = random.Random(semilla)
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("BD")
+    ws.append(COLUMNAS)
+
+    otros_items = [1.0, 2.4, 3.2, 4.1]
+    for i in range(n_filas):
+        fecha = fecha_inicio + dt.timedelta(days=rnd.randrange(dias))
+        cantidad = rnd.choice([1, 2, 3.5, 10, 12.25])
+        unitario = rnd.choice([15000, 32000, 85000, 120000])
+        n_palabras = rnd.randrange(*palabras_descripcion)
+        descripcion = " ".join(
+            rnd.choice(BASURA_UNICODE) if rnd.random() < proporcion_basura else rnd.choice(PALABRAS)
+            for _ in range(n_palabras)
+        )
+        total = cantidad * unitario
+        if rnd.random() < proporcion_moneda_texto:
+            unitario = f"$ {unitario:,.0f}".replace(",", ".") if rnd.random() < 0.5 else f"${unitario:,.0f}"
+            total = f"$ {total:,.0f}".replace(",", ".") if rnd.random() < 0.5 else f"${total:,.2f}"
+        ws.append([
+            i + 1,
+            fecha,
+            3.1 if rnd.random() < proporcion_31 else rnd.choice(otros_items),
+            "SUMINISTRO Y LLENADO DE AGUA",
+            rnd.choice(["HIDROSANITARIO", "CUBIERTAS", "CUBIERTA METÁLICA"]),
+            rnd.choice(zonas),
+            descripcion,
+            rnd.choice(unidades),
+            cantidad,
+            unitario,
+            total,
+            "CUADRILLA",
+            None,
+        ])
+    wb.save(ruta)
+    return ruta
+
+
+def generar_plantillas(base="."):
+    """Imágenes de encabezado y pie que exige PDFHeaderFooter."""
+    for carpeta, nombre, tam in [
+        ("templates/ENCABEZADO", "encabezado.jpeg", (2400, 140)),
+        ("templates/FOOTER", "footer.jpeg", (800, 100)),
+    ]:
+        os.makedirs(os.path.join(base, carpeta), exist_ok=True)
+        Image.new("RGB", tam, (30, 80, 160)).save(os.path.join(base, carpeta, nombre), quality=90)
+
+
+def generar_fotos(ids_actividad, base=".", por_actividad=3, tam=(3000, 4000), semilla=3):
+    """Fotos tipo celular (JPEG grandes, horizontales y verticales) por actividad."""
+    rnd = random.Random(semilla)
+    for id_act in ids_actividad:
+        carpeta = os.path.join(base, "BD", "FOTOS", "ACTIVIDADES_FOTOS", str(id_act))
+        os.makedirs(carpeta, exist_ok=True)
+        for k in range(por_actividad):
+            w, h = tam if rnd.random() < 0.5 else tam[::-1]
+            img = Image.effect_noise((w // 8, h // 8), 60).convert("RGB").resize((w, h))
+            img.save(os.path.join(carpeta, f"foto_{k}.jpg"), quality=92)
+
+
+def generar_df_actividades(n_filas=1000, semilla=1, fecha_inicio="2025-01-01", dias=365):
+    """
+    DataFrame ya limpio (como el de get_dataframe_actividades) con `n_filas`
+    actividades, generado directamente en memoria para los benchmarks de
+    escritura (Excel/PDF) con cientos de miles de filas.
+    """
+    import numpy as np
+    import pandas as pd
+
+    rnd = np.random.default_rng(semilla)
+    cantidad = rnd.choice([1, 2, 3.5, 10, 12.25], n_filas)
+    unitario = rnd.choice([15000, 32000, 85000, 120000], n_filas)
+    descripciones = [
+        " ".join(random.Random(semilla + k).choices(PALABRAS, k=4 + k % 40)) for k in range(200)
+    ]
+    return pd.DataFrame({
+        "ID_ACTIVIDAD": np.arange(1, n_filas + 1),
+        "FECHA": pd.Timestamp(fecha_inicio) + pd.to_timedelta(rnd.integers(0, dias, n_filas), unit="D"),
+        "ID_ITEM": 3.1,
+        "ACTIVIDAD": "SUMINISTRO Y LLENADO DE AGUA",
+        "TIPO_ACT": rnd.choice(["HIDROSANITARIO", "CUBIERTAS"], n_filas),
+        "ZONA": rnd.choice(ZONAS, n_filas),
+        "DESCRIPCION": rnd.choice(descripciones, n_filas),
+        "UNIDAD_MEDIDA": rnd.choice(UNIDADES, n_filas),
+        "CANTIDAD": cantidad,
+        "VALOR_UNITARIO": unitario,
+        "VALOR_TOTAL": cantidad * unitario,
+    })
@@ -0,0 +1,252 @@
+"""
+Suite de benchmarks de las entradas públicas del informe.
+
+Para cada tamaño (por defecto 1k, 10k y 100k filas) genera un libro
+BD_ACTIVIDADES sintético (ver datos_sinteticos) y un árbol de fotos, y mide:
+
+    dataframes.read_excel      DATAFRAMES_ACTIVIDADES_SPRBUN(..., usar_cache=False)
+    dataframes.lector_bd       DATAFRAMES_ACTIVIDADES_SPRBUN(..., filtrar_al_leer=True)
+    dataframes.limpiar         get_dataframe_actividades()
+    resumen_general            GENERATE_GENERAL_RESUME(df).generate_text()
+    pdf.dia                    PDFHeaderFooter.agregar_tabla_actividades_dia (por día)
+    pdf.output                 PDFHeaderFooter.output de esos días
+    excel.crear_informe        CREATE_EXCEL_RESUME.crear_informe (todo el rango)
+
+Cada tamaño corre en un proceso aparte (la memoria no se acumula) y el
+resultado se guarda en JSON: tiempo real (mínimo y mediana de las
+repeticiones), CPU y RSS máximo del proceso. Con --comparar se muestra la
+razón contra un JSON anterior (>1 = más lento ahora).
+
+Los libros se generan una vez por (filas, semilla) en --datos y se reutilizan.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.suite [--filas 1000 10000 100000] [--repeticiones 3]
+                               [--salida resultados.json] [--comparar base.json]
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+TAMANOS = [1_000, 10_000, 100_000]
+DIAS_PDF = 5
+DATOS_DEFAULT = os.path.join(tempfile.gettempdir(), "benchmarks_sprbun")
+
+
+def _rss_max_mb():
+    # ru_maxrss está en KB en Linux
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def _medir(funcion, repeticiones):
+    """Corre `funcion` varias veces; devuelve (último resultado, métricas)."""
+    tiempos, cpus = [], []
+    resultado = None
+    for _ in range(repeticiones):
+        c0, t0 = time.process_time(), time.perf_counter()
+        # Los módulos imprimen avisos por fila; no cuentan en la medición
+        with contextlib.redirect_stdout(io.StringIO()):
+            resultado = funcion()
+        tiempos.append(time.perf_counter() - t0)
+        cpus.append(time.process_time() - c0)
+    return resultado, {
+        "seg_min": round(min(tiempos), 4),
+        "seg_mediana": round(statistics.median(tiempos), 4),
+        "cpu_mediana": round(statistics.median(cpus), 4),
+        "rss_max_mb": round(_rss_max_mb(), 1),
+        "repeticiones": repeticiones,
+    }
+
+
+def _combinar(medidas, divisor=1):
+    """Une medidas de una repetición cada una (tiempos divididos por `divisor`)."""
+    tiempos = [m["seg_min"] / divisor for m in medidas]
+    cpus = [m["cpu_mediana"] / divisor for m in medidas]
+    return {
+        "seg_min": round(min(tiempos), 4),
+        "seg_mediana": round(statistics.median(tiempos), 4),
+        "cpu_mediana": round(statistics.median(cpus), 4),
+        "rss_max_mb": round(_rss_max_mb(), 1),
+        "repeticiones": len(medidas),
+    }
+
+
+def preparar_libro(n_filas, semilla, carpeta_datos):
+    """Ruta del libro sintético de `n_filas` (se genera solo si no existe)."""
+    from benchmarks.datos_sinteticos import generar_libro_actividades
+
+    os.makedirs(carpeta_datos, exist_ok=True)
+    ruta = os.path.join(carpeta_datos, f"BD_ACTIVIDADES_{n_filas}_{semilla}.xlsx")
+    if not os.path.isfile(ruta):
+        t0 = time.perf_counter()
+        generar_libro_actividades(ruta + ".tmp.xlsx", n_filas=n_filas, semilla=semilla,
+                                  proporcion_moneda_texto=0.05)
+        os.replace(ruta + ".tmp.xlsx", ruta)
+        print(f"   libro de {n_filas:,} filas generado en {time.perf_counter() - t0:.1f} s", file=sys.stderr)
+    return ruta
+
+
+def medir_tamano(n_filas, semilla, repeticiones, carpeta_datos) -> dict:
+    """Mide todas las entradas para un tamaño. Corre en su propio proceso."""
+    import pandas as pd
+
+    from benchmarks.datos_sinteticos import generar_fotos, generar_plantillas
+    from modules.CREATE_EXCEL_RESUME import CREATE_EXCEL_RESUME
+    from modules.CREATE_PDF_V1 import PDFHeaderFooter
+    from modules.GENERATE_GENERAL_RESUME import GENERATE_GENERAL_RESUME
+    from modules.GET_DATAFRAMES import DATAFRAMES_ACTIVIDADES_SPRBUN
+
+    ruta_libro = os.path.abspath(preparar_libro(n_filas, semilla, carpeta_datos))
+    resultados = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cwd = os.getcwd()
+        os.chdir(tmp)   # plantillas, fotos y cachés relativas (BD/...) en la carpeta temporal
+        try:
+            # 1. Lectura del libro (sin caché: se mide el parseo)
+            _, resultados["dataframes.read_excel"] = _medir(
+                lambda: DATAFRAMES_ACTIVIDADES_SPRBUN(ruta_libro, usar_cache=False), repeticiones)
+            _, resultados["dataframes.lector_bd"] = _medir(
+                lambda: DATAFRAMES_ACTIVIDADES_SPRBUN(ruta_libro, usar_cache=False, filtrar_al_leer=True),
+                repeticiones)
+
+            # 2. Limpieza (cada repetición sobre una carga nueva)
+            cargas = [DATAFRAMES_ACTIVIDADES_SPRBUN(ruta_libro, usar_cache=False, filtrar_al_leer=True)
+                      for _ in range(repeticiones)]
+            datos = cargas[-1]
+            _, resultados["dataframes.limpiar"] = _medir(
+                lambda: cargas.pop().get_dataframe_actividades(), repeticiones)
+            df = datos.df_actividades
+            resultados["dataframes.limpiar"]["filas_3_1"] = len(df)
+
+            # 3. Resumen general del periodo completo
+            _, resultados["resumen_general"] = _medir(
+                lambda: GENERATE_GENERAL_RESUME(df).generate_text(), repeticiones)
+
+            # 4. PDF: los primeros días con actividades, con fotos
+            fechas = pd.to_datetime(df["FECHA"]).dt.normalize()
+            dias = sorted(fechas.unique())[:DIAS_PDF]
+            df_dias = [(dia, df[fechas == dia]) for dia in dias]
+            generar_plantillas()
+            generar_fotos(pd.concat([d for _, d in df_dias])["ID_ACTIVIDAD"], por_actividad=2,
+                          tam=(900, 1200), semilla=semilla)
+
+            # Cada repetición: PDF nuevo y caché de miniaturas vacía (fotos en frío)
+            por_dia, salida = [], []
+            for _ in range(repeticiones):
+                shutil.rmtree(os.path.join("BD", "CACHE", "MINIATURAS"), ignore_errors=True)
+                pdf = PDFHeaderFooter()
+                _, medida = _medir(lambda: [
+                    pdf.agregar_tabla_actividades_dia(i + 1, dia.year, dia, df_dia, descripcion_servicio="-")
+                    for i, (dia, df_dia) in enumerate(df_dias)
+                ], 1)
+                por_dia.append(medida)
+                _, medida = _medir(lambda: pdf.output("informe.pdf"), 1)
+                salida.append(medida)
+
+            resultados["pdf.dia"] = _combinar(por_dia, divisor=len(df_dias))
+            resultados["pdf.dia"]["filas_por_dia"] = round(sum(len(d) for _, d in df_dias) / len(df_dias), 1)
+            resultados["pdf.output"] = _combinar(salida)
+            resultados["pdf.output"]["paginas"] = pdf.page_no()
+
+            # 5. Excel de todo el rango
+            inicio, fin = fechas.min(), fechas.max()
+            _, resultados["excel.crear_informe"] = _medir(
+                lambda: CREATE_EXCEL_RESUME(output_dir=tmp).crear_informe(df, inicio, fin), repeticiones)
+        finally:
+            os.chdir(cwd)
+
+    return resultados
+
+
+# ----------------------------------------------------------------------
+# Comparación
+# ----------------------------------------------------------------------
+def comparar(actual: dict, base: dict):
+    """Tabla de razones seg_mediana actual / base por tamaño y entrada."""
+    print(f"\n{'filas':>9} {'entrada':<24} {'base s':>9} {'ahora s':>9} {'razón':>7}")
+    for filas, entradas in actual["resultados"].items():
+        for nombre, medida in entradas.items():
+            anterior = base.get("resultados", {}).get(filas, {}).get(nombre)
+            if not anterior or not anterior.get("seg_mediana"):
+                continue
+            razon = medida["seg_mediana"] / anterior["seg_mediana"]
+            marca = "  ⚠️" if razon > 1.10 else ""
+            print(f"{int(filas):>9,} {nombre:<24} {anterior['seg_mediana']:>9.3f} "
+                  f"{medida['seg_mediana']:>9.3f} {razon:>7.2f}{marca}")
+
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.suite", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=TAMANOS)
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--semilla", type=int, default=1)
+    parser.add_argument("--datos", default=DATOS_DEFAULT, help="carpeta de los libros sintéticos")
+    parser.add_argument("--salida", default=None, help="JSON de resultados (por defecto benchmarks_<fecha>.json)")
+    parser.add_argument("--comparar", default=None, help="JSON anterior para comparar")
+    parser.add_argument("--una", type=int, help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    # Proceso hijo: un solo tamaño, JSON por stdout
+    if args.una is not None:
+        # Los avisos de los módulos no deben mezclarse con el JSON
+        with contextlib.redirect_stdout(io.StringIO()):
+            medidas = medir_tamano(args.una, args.semilla, args.repeticiones, args.datos)
+        json.dump(medidas, sys.stdout)
+        return
+
+    reporte = {
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "commit": _commit(),
+        "python": sys.version.split()[0],
+        "plataforma": platform.platform(),
+        "nucleos": os.cpu_count(),
+        "semilla": args.semilla,
+        "repeticiones": args.repeticiones,
+        "resultados": {},
+    }
+
+    print(f"{'filas':>9} {'entrada':<24} {'mediana s':>10} {'CPU s':>8} {'RSS máx MB':>11}")
+    for n in args.filas:
+        salida = subprocess.run(
+            [sys.executable, "-m", "benchmarks.suite", "--una", str(n), "--semilla", str(args.semilla),
+             "--repeticiones", str(args.repeticiones), "--datos", args.datos],
+            check=True, capture_output=True, text=True,
+        )
+        sys.stderr.write(salida.stderr)
+        medidas = json.loads(salida.stdout)
+        reporte["resultados"][str(n)] = medidas
+        for nombre, medida in medidas.items():
+            print(f"{n:>9,} {nombre:<24} {medida['seg_mediana']:>10.3f} "
+                  f"{medida['cpu_mediana']:>8.3f} {medida['rss_max_mb']:>11.1f}")
+
+    ruta = args.salida or f"benchmarks_{datetime.now():%Y%m%d_%H%M%S}.json"
+    with open(ruta, "w", encoding="utf-8") as f:
+        json.dump(reporte, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Resultados guardados en {ruta}")
+
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            comparar(reporte, json.load(f))
+
+
+if __name__ == "__main__":
+    main()
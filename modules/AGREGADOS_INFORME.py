@@ -0,0 +1,106 @@
+import re
+
+import pandas as pd
+
+from modules.PARSEAR_MONEDA import PARSEAR_MONEDA
+
+class AGREGADOS_INFORME:
+    """
+    Todas las cifras agregadas de un periodo, calculadas en UNA pasada.
+
+    Un solo groupby por (día, UNIDAD_MEDIDA, ZONA, TIPO_ACT) deja una tabla
+    pequeña con el número de actividades y la suma de CANTIDAD y VALOR_TOTAL
+    de cada combinación. De ella salen, sin volver a recorrer el DataFrame:
+
+    - subtotales por día (PDF y Excel),
+    - cantidad y valor por unidad de medida (resumen del Excel),
+    - métricas generales (GENERATE_GENERAL_RESUME): total de actividades,
+      zonas, zonas principales, hidrosanitarias, cubiertas y valor global.
+    """
+
+    UNIDADES_ORDEN = ["ML", "M2", "M3", "UND"]
+    RE_CUBIERTAS = re.compile("CUB", re.IGNORECASE)
+
+    def __init__(self, df: pd.DataFrame):
+        self.n_filas = len(df)
+
+        def col(nombre):
+            return df[nombre] if nombre in df.columns else pd.Series("", index=df.index, dtype=object)
+
+        base = pd.DataFrame({
+            "DIA": pd.to_datetime(col("FECHA"), errors="coerce").dt.normalize(),
+            "UNIDAD": col("UNIDAD_MEDIDA"),
+            "ZONA": col("ZONA"),
+            "TIPO": col("TIPO_ACT"),
+            "CANTIDAD": pd.to_numeric(col("CANTIDAD"), errors="coerce"),
+            "VALOR": self.valores_numericos(col("VALOR_TOTAL")) if "VALOR_TOTAL" in df.columns else 0,
+        })
+
+        # 🔁 La única pasada sobre las filas
+        self.tabla = (
+            base.groupby(["DIA", "UNIDAD", "ZONA", "TIPO"], sort=False, dropna=False, observed=True)
+            .agg(N=("VALOR", "size"), CANTIDAD=("CANTIDAD", "sum"), VALOR=("VALOR", "sum"))
+        )
+
+        self._calcular()
+
+    # ------------------------------------------------------------------
+    # Limpieza de montos
+    # ------------------------------------------------------------------
+    @staticmethod
+    def valores_numericos(serie: pd.Series) -> pd.Series:
+        """Montos como número (ver PARSEAR_MONEDA); lo inválido queda NaN."""
+        return PARSEAR_MONEDA.serie(serie)
+
+    # ------------------------------------------------------------------
+    # Derivados de la tabla agregada
+    # ------------------------------------------------------------------
+    def _calcular(self):
+        tabla = self.tabla
+
+        # Subtotal de VALOR_TOTAL por día {Timestamp normalizado: float}
+        por_dia = tabla.groupby(level="DIA", sort=False, observed=True)["VALOR"].sum()
+        self.subtotales_dia = {dia: float(valor) for dia, valor in por_dia.items()}
+
+        # Cantidad y valor por unidad de medida {unidad: (cantidad, valor)}
+        por_unidad = tabla.groupby(level="UNIDAD", sort=False, observed=True)[["CANTIDAD", "VALOR"]].sum()
+        self.por_unidad = {
+            unidad: (float(cantidad), float(valor))
+            for unidad, cantidad, valor in zip(por_unidad.index, por_unidad["CANTIDAD"], por_unidad["VALOR"])
+        }
+
+        # Actividades por zona, en orden de aparición (como value_counts)
+        por_zona = tabla.groupby(level="ZONA", sort=False, observed=True)["N"].sum()
+        self.actividades_por_zona = por_zona.sort_values(ascending=False)
+
+        # Actividades por tipo
+        por_tipo = tabla.groupby(level="TIPO", sort=False, dropna=False, observed=True)["N"].sum()
+        self.actividades_hidrosanitarias = int(por_tipo.get("HIDROSANITARIO", 0))
+        self.actividades_cubiertas = int(sum(
+            n for tipo, n in por_tipo.items()
+            if not pd.isna(tipo) and self.RE_CUBIERTAS.search(str(tipo))
+        ))
+
+        self.valor_global = tabla["VALOR"].sum()
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def subtotal_dia(self, fecha) -> float:
+        """Suma de VALOR_TOTAL de un día (0.0 si no tuvo actividades)."""
+        return self.subtotales_dia.get(pd.Timestamp(fecha).normalize(), 0.0)
+
+    def resumen_unidad(self, unidad):
+        """(cantidad total, valor total) de una unidad de medida (0.0 si no hay)."""
+        return self.por_unidad.get(unidad, (0.0, 0.0))
+
+    def metricas(self) -> dict:
+        """Métricas del resumen general del periodo."""
+        return {
+            "total_actividades": self.n_filas,
+            "total_zonas": len(self.actividades_por_zona),
+            "zonas_principales": ", ".join(self.actividades_por_zona.head(3).index.tolist()),
+            "actividades_hidrosanitarias": self.actividades_hidrosanitarias,
+            "actividades_cubiertas": self.actividades_cubiertas,
+            "valor_global": self.valor_global,
+        }
@@ -0,0 +1,117 @@
+import json
+import os
+from pathlib import Path
+
+import pandas as pd
+
+
+class CACHE_EXCEL:
+    """
+    Caché binaria (pickle de pandas, columnar por bloques) de una hoja de Excel.
+
+    La caché se guarda junto al libro de origen, en una carpeta `.cache/`,
+    y se identifica por la ruta, el tamaño y la fecha de modificación del
+    archivo. Si el libro cambia, la hoja se vuelve a leer y la caché se
+    reconstruye; si no, se carga directamente desde el archivo binario.
+    """
+
+    VERSION = 1
+
+    def __init__(self, ruta_excel, hoja="BD", variante=""):
+        """
+        - ruta_excel: ruta del libro .xlsx de origen.
+        - hoja: nombre de la hoja a cachear.
+        - variante: texto opcional para distinguir lecturas distintas
+          de la misma hoja (por ejemplo, con columnas filtradas).
+        """
+        self.ruta_excel = Path(ruta_excel)
+        self.hoja = hoja
+        self.variante = variante
+
+        self.carpeta_cache = self.ruta_excel.parent / ".cache"
+        sufijo = f".{variante}" if variante else ""
+        base = f"{self.ruta_excel.stem}.{hoja}{sufijo}"
+        self.ruta_datos = self.carpeta_cache / f"{base}.pkl"
+        self.ruta_meta = self.carpeta_cache / f"{base}.json"
+
+    # ------------------------------------------------------------------
+    # Firma del libro de origen
+    # ------------------------------------------------------------------
+    def firma(self) -> dict:
+        """Ruta absoluta, tamaño y mtime del libro (lo que invalida la caché)."""
+        stat = os.stat(self.ruta_excel)
+        return {
+            "version": self.VERSION,
+            "ruta": str(self.ruta_excel.resolve()),
+            "hoja": self.hoja,
+            "variante": self.variante,
+            "tamano": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+        }
+
+    def es_valida(self) -> bool:
+        """True si existe una caché que corresponde al libro actual."""
+        if not (self.ruta_datos.is_file() and self.ruta_meta.is_file()):
+            return False
+        try:
+            with open(self.ruta_meta, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return False
+        return meta == self.firma()
+
+    # ------------------------------------------------------------------
+    # Lectura / escritura
+    # ------------------------------------------------------------------
+    def cargar(self, lector=None) -> pd.DataFrame:
+        """
+        Devuelve la hoja como DataFrame.
+
+        - Si la caché es válida, la carga desde disco.
+        - Si no, llama a `lector()` (por defecto `pd.read_excel` de la hoja),
+          guarda el resultado en la caché y lo devuelve.
+        """
+        if self.es_valida():
+            try:
+                return pd.read_pickle(self.ruta_datos)
+            except Exception as e:
+                print(f"⚠️ Caché ilegible en {self.ruta_datos}, se reconstruye: {e}")
+
+        # La firma se toma ANTES de leer: si el libro cambia durante la
+        # lectura, la próxima carga detectará la diferencia.
+        firma = self.firma()
+
+        if lector is None:
+            df = pd.read_excel(self.ruta_excel, sheet_name=self.hoja)
+        else:
+            df = lector()
+
+        self.guardar(df, firma)
+        return df
+
+    def guardar(self, df: pd.DataFrame, firma=None):
+        """Escribe la caché de forma atómica (archivo temporal + replace)."""
+        if firma is None:
+            firma = self.firma()
+        try:
+            self.carpeta_cache.mkdir(parents=True, exist_ok=True)
+
+            tmp_datos = self.ruta_datos.with_suffix(".pkl.tmp")
+            df.to_pickle(tmp_datos, protocol=5)
+            os.replace(tmp_datos, self.ruta_datos)
+
+            tmp_meta = self.ruta_meta.with_suffix(".json.tmp")
+            with open(tmp_meta, "w", encoding="utf-8") as f:
+                json.dump(firma, f)
+            os.replace(tmp_meta, self.ruta_meta)
+        except OSError as e:
+            # La caché es una optimización: si no se puede escribir, se sigue sin ella.
+            print(f"⚠️ No se pudo escribir la caché en {self.carpeta_cache}: {e}")
+
+    def invalidar(self):
+        """Elimina la caché de esta hoja (se reconstruirá en la próxima carga)."""
+        for ruta in (self.ruta_datos, self.ruta_meta):
+            try:
+                ruta.unlink()
+            except FileNotFoundError:
+                pass
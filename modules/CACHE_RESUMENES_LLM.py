@@ -0,0 +1,114 @@
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+
+class CACHE_RESUMENES_LLM:
+    """
+    Caché persistente (SQLite) de respuestas del modelo, direccionada por
+    contenido: la clave es el SHA-256 del nombre del modelo + el prompt.
+
+    Si un día no cambió (mismas ZONAS y DESCRIPCIONES → mismo prompt), el
+    resumen sale de la caché sin volver a llamar a la API.
+
+    Desalojo:
+    - max_dias: las entradas más antiguas que esto se eliminan.
+    - max_entradas: si se supera, se eliminan las menos usadas recientemente.
+
+    `aciertos` y `fallos` cuentan las consultas de esta instancia.
+    """
+
+    RUTA_DEFAULT = "BD/CACHE/resumenes_llm.sqlite"
+
+    def __init__(self, ruta_bd=RUTA_DEFAULT, max_entradas: int = 5000, max_dias: float = 180):
+        self.ruta_bd = Path(ruta_bd)
+        self.ruta_bd.parent.mkdir(parents=True, exist_ok=True)
+        self.max_entradas = max_entradas
+        self.max_dias = max_dias
+
+        self.aciertos = 0
+        self.fallos = 0
+
+        # Una sola conexión compartida entre hilos (generate_summaries), protegida por lock
+        self._lock = threading.Lock()
+        self._con = sqlite3.connect(self.ruta_bd, check_same_thread=False)
+        with self._lock, self._con:
+            self._con.execute(
+                "CREATE TABLE IF NOT EXISTS resumenes ("
+                "clave TEXT PRIMARY KEY, "
+                "modelo TEXT NOT NULL, "
+                "respuesta TEXT NOT NULL, "
+                "creado REAL NOT NULL, "
+                "usado REAL NOT NULL)"
+            )
+            self._con.execute("CREATE INDEX IF NOT EXISTS idx_resumenes_usado ON resumenes (usado)")
+            self._con.execute("CREATE INDEX IF NOT EXISTS idx_resumenes_creado ON resumenes (creado)")
+        self._desalojar()
+
+    @staticmethod
+    def clave(modelo: str, prompt: str) -> str:
+        return hashlib.sha256(f"{modelo}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Consulta / escritura
+    # ------------------------------------------------------------------
+    def obtener(self, modelo: str, prompt: str):
+        """Devuelve la respuesta guardada o None si no está (o ya expiró)."""
+        clave = self.clave(modelo, prompt)
+        limite = time.time() - self.max_dias * 86400
+
+        with self._lock, self._con:
+            fila = self._con.execute(
+                "SELECT respuesta FROM resumenes WHERE clave = ? AND creado >= ?",
+                (clave, limite),
+            ).fetchone()
+            if fila is None:
+                self.fallos += 1
+                return None
+            self._con.execute("UPDATE resumenes SET usado = ? WHERE clave = ?", (time.time(), clave))
+            self.aciertos += 1
+            return fila[0]
+
+    def guardar(self, modelo: str, prompt: str, respuesta: str):
+        """Guarda una respuesta válida (las vacías no se cachean)."""
+        if not respuesta or not isinstance(respuesta, str):
+            return
+        ahora = time.time()
+        with self._lock, self._con:
+            self._con.execute(
+                "INSERT OR REPLACE INTO resumenes (clave, modelo, respuesta, creado, usado) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (self.clave(modelo, prompt), modelo, respuesta, ahora, ahora),
+            )
+        self._desalojar()
+
+    def _desalojar(self):
+        limite = time.time() - self.max_dias * 86400
+        with self._lock, self._con:
+            self._con.execute("DELETE FROM resumenes WHERE creado < ?", (limite,))
+            self._con.execute(
+                "DELETE FROM resumenes WHERE clave IN ("
+                "SELECT clave FROM resumenes ORDER BY usado DESC LIMIT -1 OFFSET ?)",
+                (self.max_entradas,),
+            )
+
+    # ------------------------------------------------------------------
+    # Métricas
+    # ------------------------------------------------------------------
+    def estadisticas(self) -> dict:
+        """Aciertos, fallos, tasa de aciertos y entradas guardadas (para logs)."""
+        with self._lock:
+            entradas = self._con.execute("SELECT COUNT(*) FROM resumenes").fetchone()[0]
+        consultas = self.aciertos + self.fallos
+        return {
+            "aciertos": self.aciertos,
+            "fallos": self.fallos,
+            "tasa_aciertos": self.aciertos / consultas if consultas else 0.0,
+            "entradas": entradas,
+        }
+
+    def cerrar(self):
+        with self._lock:
+            self._con.close()
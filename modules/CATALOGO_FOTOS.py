@@ -0,0 +1,185 @@
+import json
+import os
+from pathlib import Path
+
+from PIL import Image
+
+
+class CATALOGO_FOTOS:
+    """
+    Índice de las fotos de actividades: {ID_ACTIVIDAD: [foto, ...]}.
+
+    Recorre UNA vez BD/FOTOS/ACTIVIDADES_FOTOS y, por cada carpeta de
+    actividad, guarda la ruta, extensión, dimensiones en píxeles, mtime y
+    tamaño de cada foto (.jpg, .jpeg, .png), en el mismo orden que
+    `sorted(os.listdir(...))`. Así el PDF consulta las fotos de una fila
+    en O(1), sin `isdir`/`listdir` ni abrir cada imagen para leer su tamaño.
+
+    El resultado se guarda en un manifiesto JSON. En la siguiente ejecución
+    solo se vuelven a listar las carpetas cuyo mtime cambió (fotos
+    agregadas, borradas o renombradas); las demás se toman del manifiesto
+    sin tocar el disco (una llamada a stat por carpeta, que en una carpeta
+    de red es lo que cuesta). Al releer una carpeta solo se abren las fotos
+    cuyo mtime_ns o tamaño cambió.
+
+    Reemplazar una foto con el mismo nombre no cambia el mtime de la
+    carpeta: con revalidar_fotos=True (--revalidar-fotos) cada foto de las
+    carpetas sin cambios se compara también por mtime_ns y tamaño, como la
+    clave de MINIATURAS_FOTOS, a costa de un stat por foto.
+    """
+
+    CARPETA_DEFAULT = os.path.join("BD", "FOTOS", "ACTIVIDADES_FOTOS")
+    MANIFIESTO_DEFAULT = os.path.join("BD", "CACHE", "catalogo_fotos.json")
+    EXTENSIONES = (".jpg", ".jpeg", ".png")
+    VERSION = 1
+
+    def __init__(self, carpeta=CARPETA_DEFAULT, ruta_manifiesto=MANIFIESTO_DEFAULT, revalidar_fotos=False):
+        """
+        - carpeta: raíz con una subcarpeta por ID_ACTIVIDAD.
+        - ruta_manifiesto: JSON donde se persiste el índice (None = no persistir).
+        - revalidar_fotos: comparar cada foto por mtime_ns y tamaño aunque su
+          carpeta no haya cambiado (detecta fotos reemplazadas en el sitio).
+        """
+        self.carpeta = carpeta
+        self.ruta_manifiesto = Path(ruta_manifiesto) if ruta_manifiesto else None
+        self.revalidar_fotos = revalidar_fotos
+        self._indice = None
+
+    # ------------------------------------------------------------------
+    # Construcción del índice
+    # ------------------------------------------------------------------
+    def _leer_manifiesto(self) -> dict:
+        if self.ruta_manifiesto is None or not self.ruta_manifiesto.is_file():
+            return {}
+        try:
+            with open(self.ruta_manifiesto, "r", encoding="utf-8") as f:
+                datos = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if datos.get("version") != self.VERSION or datos.get("carpeta") != os.path.abspath(self.carpeta):
+            return {}
+        return datos.get("actividades", {})
+
+    def _guardar_manifiesto(self, actividades: dict):
+        if self.ruta_manifiesto is None:
+            return
+        datos = {
+            "version": self.VERSION,
+            "carpeta": os.path.abspath(self.carpeta),
+            "actividades": actividades,
+        }
+        try:
+            self.ruta_manifiesto.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.ruta_manifiesto.with_suffix(".json.tmp")
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(datos, f)
+            os.replace(tmp, self.ruta_manifiesto)
+        except OSError as e:
+            print(f"⚠️ No se pudo guardar el catálogo de fotos en {self.ruta_manifiesto}: {e}")
+
+    @staticmethod
+    def _leer_foto(ruta, ext, previa=None):
+        """
+        Datos de una foto. Si `previa` (del manifiesto) tiene el mismo
+        mtime_ns y tamaño, se reutiliza sin abrir la imagen. Devuelve
+        (foto, cambió).
+        """
+        try:
+            stat = os.stat(ruta)
+        except OSError:
+            stat = None
+        if (previa is not None and stat is not None and previa["ancho"] is not None
+                and previa["mtime_ns"] == stat.st_mtime_ns and previa["tamano"] == stat.st_size):
+            return previa, False
+
+        try:
+            if stat is None:
+                raise FileNotFoundError(ruta)
+            with Image.open(ruta) as img:
+                ancho, alto = img.size
+        except Exception as e:
+            print(f"⚠️ Error cargando imagen {ruta}: {e}")
+            ancho = alto = None
+        return {
+            "ruta": ruta,
+            "ext": ext,
+            "ancho": ancho,
+            "alto": alto,
+            "mtime_ns": stat.st_mtime_ns if stat else None,
+            "tamano": stat.st_size if stat else None,
+        }, True
+
+    def _leer_carpeta(self, ruta_carpeta, previas=()) -> list:
+        """Lista la carpeta; las fotos sin cambios se toman de `previas`."""
+        por_ruta = {f["ruta"]: f for f in previas}
+        fotos = []
+        for nombre in sorted(os.listdir(ruta_carpeta)):
+            ext = os.path.splitext(nombre)[1].lower()
+            if not nombre.lower().endswith(self.EXTENSIONES):
+                continue
+            ruta = os.path.join(ruta_carpeta, nombre)
+            fotos.append(self._leer_foto(ruta, ext, por_ruta.get(ruta))[0])
+        return fotos
+
+    def _revalidar(self, fotos) -> tuple:
+        """Carpeta sin cambios en su listado: solo re-lee las fotos modificadas."""
+        nuevas, cambios = [], 0
+        for previa in fotos:
+            foto, cambio = self._leer_foto(previa["ruta"], previa["ext"], previa)
+            nuevas.append(foto)
+            cambios += cambio
+        return nuevas, cambios
+
+    def escanear(self):
+        """
+        Construye (o actualiza) el índice. Las carpetas con el mismo mtime
+        que en el manifiesto se toman tal cual (con revalidar_fotos, cada
+        foto se compara por mtime_ns y tamaño); el resto de carpetas se
+        vuelven a leer (abriendo solo las fotos nuevas o modificadas).
+        """
+        previo = self._leer_manifiesto()
+        actividades = {}
+        leidas = 0
+
+        if os.path.isdir(self.carpeta):
+            with os.scandir(self.carpeta) as entradas:
+                for entrada in entradas:
+                    if not entrada.is_dir():
+                        continue
+                    mtime = entrada.stat().st_mtime_ns
+                    anterior = previo.get(entrada.name)
+                    if anterior is not None and anterior["mtime_ns"] == mtime:
+                        if self.revalidar_fotos:
+                            fotos, cambios = self._revalidar(anterior["fotos"])
+                            anterior = {"mtime_ns": mtime, "fotos": fotos}
+                            leidas += cambios
+                        actividades[entrada.name] = anterior
+                        continue
+                    actividades[entrada.name] = {
+                        "mtime_ns": mtime,
+                        "fotos": self._leer_carpeta(entrada.path, anterior["fotos"] if anterior else ()),
+                    }
+                    leidas += 1
+
+        if leidas or len(actividades) != len(previo):
+            self._guardar_manifiesto(actividades)
+
+        self._indice = {id_act: datos["fotos"] for id_act, datos in actividades.items()}
+        return self
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def fotos(self, id_actividad) -> list:
+        """
+        Fotos de una actividad (lista de dicts con ruta, ext, ancho, alto,
+        mtime_ns y tamano), o [] si no tiene carpeta.
+        """
+        if self._indice is None:
+            self.escanear()
+        return self._indice.get(str(id_actividad).strip(), [])
+
+    def __len__(self) -> int:
+        if self._indice is None:
+            self.escanear()
+        return len(self._indice)
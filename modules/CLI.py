@@ -0,0 +1,125 @@
+import argparse
+import os
+
+from modules.CONFIG_INFORMES import CONFIG_INFORMES
+from modules.INFORMES_MENSUALES import INFORMES_MENSUALES
+from modules.INSTRUMENTACION import INSTRUMENTACION
+from modules.MENU import AdminFechas
+
+
+def _mes(texto: str) -> int:
+    """'11', 'noviembre' o 'nov' -> 11"""
+    try:
+        return AdminFechas().parsear_mes(texto)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"mes inválido: {texto!r}")
+
+
+def _anio_mes(texto: str) -> tuple:
+    """'2025-03' -> (2025, 3)"""
+    try:
+        anio, mes = texto.split("-")
+        return int(anio), _mes(mes)
+    except (ValueError, argparse.ArgumentTypeError):
+        raise argparse.ArgumentTypeError(f"use AAAA-MM (ej. 2025-03), no {texto!r}")
+
+
+def crear_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m modules",
+        description="Genera los informes mensuales (PDF y Excel) sin menú interactivo.",
+    )
+
+    periodo = parser.add_mutually_exclusive_group(required=True)
+    periodo.add_argument("--anio", type=int, help="año del informe (con --mes; sin --mes, los 12 meses)")
+    periodo.add_argument("--desde", type=_anio_mes, metavar="AAAA-MM", help="primer mes de un rango (con --hasta)")
+    periodo.add_argument("--all-missing", action="store_true",
+                         help="todos los meses con actividades a los que les falta el PDF o el Excel")
+
+    parser.add_argument("--mes", type=_mes, help="mes del informe: número o nombre (con --anio)")
+    parser.add_argument("--hasta", type=_anio_mes, metavar="AAAA-MM", help="último mes del rango (con --desde)")
+
+    rutas = parser.add_argument_group("rutas")
+    rutas.add_argument("--ruta-excel", default=None,
+                       help="libro de actividades, hoja BD (por defecto $SPRBUN_RUTA_EXCEL o "
+                            "BD/EXCEL/ACTIVIDADES/BD_ACTIVIDADES_HIDROSANITARIAS_CUBIERTAS.xlsx)")
+    rutas.add_argument("--store", default=CONFIG_INFORMES.RUTA_STORE_DEFAULT,
+                       help="almacén SQLite de actividades ('' = leer el libro directamente)")
+    rutas.add_argument("--salida-pdf", default=None, help="carpeta de los PDF")
+    rutas.add_argument("--salida-excel", default=None,
+                       help="carpeta de los Excel (por defecto $SPRBUN_DIR_EXCEL o BD/INFORMES/SPRBUN)")
+
+    parser.add_argument("--only", choices=["pdf", "excel"], default=None,
+                        help="generar solo el PDF o solo el Excel")
+    parser.add_argument("--forzar", action="store_true",
+                        help="rehacer todas las etapas aunque haya resultados guardados")
+    parser.add_argument("--revalidar-fotos", action="store_true",
+                        help="comparar cada foto por fecha y tamaño, no solo cada carpeta "
+                             "(detecta fotos reemplazadas con el mismo nombre)")
+    parser.add_argument("--procesos", type=int, default=None, help="procesos para dibujar el PDF")
+    parser.add_argument("--procesos-meses", type=int, default=1, metavar="N",
+                        help="backfill: generar N meses a la vez en procesos separados "
+                             "(0 = núcleos disponibles; por defecto 1, en serie)")
+
+    medicion = parser.add_argument_group("medición")
+    medicion.add_argument("--instrumentar", metavar="RUTA.json", default=None,
+                          help="guardar tiempos, CPU, memoria y conteos por etapa en un JSON")
+    medicion.add_argument("--cprofile", metavar="RUTA.prof", default=None,
+                          help="guardar además un perfil cProfile de toda la corrida")
+    medicion.add_argument("--sin-tracemalloc", action="store_true",
+                          help="no medir picos con tracemalloc (menos sobrecosto)")
+    return parser
+
+
+def meses_pedidos(args, informes: INFORMES_MENSUALES) -> list:
+    """Lista de (anio, mes) según los argumentos."""
+    if args.all_missing:
+        return informes.meses_faltantes(args.only)
+    if args.desde is not None:
+        return INFORMES_MENSUALES.meses_entre(args.desde, args.hasta or args.desde)
+    if args.mes is not None:
+        return [(args.anio, args.mes)]
+    return [(args.anio, mes) for mes in range(1, 13)]
+
+
+def main(argv=None) -> int:
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+
+    if args.mes is not None and args.anio is None:
+        parser.error("--mes requiere --anio")
+    if args.hasta is not None and args.desde is None:
+        parser.error("--hasta requiere --desde")
+    if args.desde is not None and args.hasta is not None and args.hasta < args.desde:
+        parser.error("--hasta es anterior a --desde")
+
+    config = CONFIG_INFORMES(
+        ruta_excel=args.ruta_excel,
+        ruta_store=args.store or None,
+        dir_pdf=args.salida_pdf,
+        dir_excel=args.salida_excel,
+        max_procesos=args.procesos,
+        forzar=args.forzar,
+        revalidar_fotos=args.revalidar_fotos,
+    )
+    informes = INFORMES_MENSUALES(config)
+
+    ruta_reporte = args.instrumentar
+    if ruta_reporte is None and args.cprofile:
+        ruta_reporte = os.path.splitext(args.cprofile)[0] + ".json"
+    if ruta_reporte:
+        INSTRUMENTACION.activar(memoria=not args.sin_tracemalloc, perfil=args.cprofile)
+
+    try:
+        meses = meses_pedidos(args, informes)
+        if args.procesos_meses != 1:
+            resultados = informes.generar_paralelo(meses, procesos=args.procesos_meses or None, solo=args.only)
+        else:
+            resultados = informes.generar(meses, solo=args.only)
+    finally:
+        if ruta_reporte:
+            INSTRUMENTACION.guardar(ruta_reporte)
+            INSTRUMENTACION.desactivar()
+
+    fallidos = [m for m, r in resultados.items() if isinstance(r, Exception)]
+    return 1 if fallidos else 0
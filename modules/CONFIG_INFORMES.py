@@ -0,0 +1,77 @@
+import os
+
+
+class CONFIG_INFORMES:
+    """
+    Rutas y opciones de una corrida de informes (interactiva o por consola).
+
+    Reúne en un solo objeto lo que antes estaba fijo en main.py: el libro de
+    actividades, el almacén SQLite, las carpetas de salida del PDF y del
+    Excel, y el número de procesos para el PDF.
+
+    Como el resto de BD/, las rutas por defecto son relativas a la raíz del
+    proyecto (la carpeta desde donde se corre main.py o `python -m modules`).
+    El libro y la carpeta de los Excel se pueden cambiar sin tocar el código
+    con las variables de entorno SPRBUN_RUTA_EXCEL y SPRBUN_DIR_EXCEL.
+    """
+
+    RUTA_EXCEL_DEFAULT = os.path.join(
+        "BD", "EXCEL", "ACTIVIDADES", "BD_ACTIVIDADES_HIDROSANITARIAS_CUBIERTAS.xlsx"
+    )
+    RUTA_STORE_DEFAULT = os.path.join("BD", "CACHE", "actividades.sqlite")
+    DIR_PDF_DEFAULT = os.path.join("BD", "INFORMES", "SPRBUN")
+    DIR_EXCEL_DEFAULT = os.path.join("BD", "INFORMES", "SPRBUN")
+    DIR_MEMO_DEFAULT = os.path.join("BD", "CACHE", "PIPELINE")
+
+    MESES_ES = {
+        1: "ENERO",
+        2: "FEBRERO",
+        3: "MARZO",
+        4: "ABRIL",
+        5: "MAYO",
+        6: "JUNIO",
+        7: "JULIO",
+        8: "AGOSTO",
+        9: "SEPTIEMBRE",
+        10: "OCTUBRE",
+        11: "NOVIEMBRE",
+        12: "DICIEMBRE",
+    }
+
+    def __init__(self, ruta_excel=None, ruta_store=RUTA_STORE_DEFAULT, dir_pdf=None,
+                 dir_excel=None, max_procesos=None, dir_memo=DIR_MEMO_DEFAULT, forzar=False,
+                 revalidar_fotos=False):
+        """
+        - ruta_excel: libro con la hoja 'BD' de actividades (None =
+          $SPRBUN_RUTA_EXCEL o RUTA_EXCEL_DEFAULT).
+        - ruta_store: almacén SQLite por mes (None = leer el libro con CACHE_EXCEL).
+        - dir_pdf / dir_excel: carpetas de salida de cada informe (dir_excel
+          None = $SPRBUN_DIR_EXCEL o DIR_EXCEL_DEFAULT).
+        - max_procesos: procesos para dibujar el PDF (None = núcleos disponibles).
+        - dir_memo: resultados guardados de las etapas de cada mes (ver PIPELINE).
+        - forzar: rehacer todas las etapas aunque haya resultados guardados.
+        - revalidar_fotos: comparar cada foto por mtime y tamaño, no solo cada
+          carpeta (ver CATALOGO_FOTOS).
+        """
+        self.ruta_excel = ruta_excel or os.environ.get("SPRBUN_RUTA_EXCEL") or self.RUTA_EXCEL_DEFAULT
+        self.ruta_store = ruta_store
+        self.dir_pdf = dir_pdf or self.DIR_PDF_DEFAULT
+        self.dir_excel = dir_excel or os.environ.get("SPRBUN_DIR_EXCEL") or self.DIR_EXCEL_DEFAULT
+        self.max_procesos = max_procesos
+        self.dir_memo = dir_memo
+        self.forzar = forzar
+        self.revalidar_fotos = revalidar_fotos
+
+    @classmethod
+    def nombre_archivo(cls, anio: int, mes: int, extension: str = "xlsx") -> str:
+        """Nombre del informe de un mes, ej: INFORME_SUMISTRO_LLENADO_AGUA_NOVIEMBRE_2025.xlsx"""
+        mes_nombre = cls.MESES_ES.get(mes, str(mes))
+        return f"INFORME_SUMISTRO_LLENADO_AGUA_{mes_nombre}_{anio}.{extension}"
+
+    def ruta_pdf(self, anio: int, mes: int) -> str:
+        """Ruta del PDF de un mes (mismo nombre que el Excel, extensión .pdf)."""
+        return os.path.join(self.dir_pdf, self.nombre_archivo(anio, mes, "pdf"))
+
+    def ruta_excel_informe(self, anio: int, mes: int) -> str:
+        """Ruta del Excel de un mes (la que genera CREATE_EXCEL_RESUME.crear_informe)."""
+        return os.path.join(self.dir_excel, self.nombre_archivo(anio, mes))
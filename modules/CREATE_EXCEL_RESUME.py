@@ -1,10 +1,16 @@
 import os
 import pandas as pd
-from datetime import datetime
+from copy import copy
 
 from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
-from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, numbers
+from openpyxl.styles import Font, Alignment, Border, Side, PatternFill, NamedStyle, numbers, DEFAULT_FONT
+
+from modules.AGREGADOS_INFORME import AGREGADOS_INFORME
+from modules.CONFIG_INFORMES import CONFIG_INFORMES
+from modules.FILAS_INFORME import FILAS_INFORME
+from modules.INSTRUMENTACION import INSTRUMENTACION
 
 
 class CREATE_EXCEL_RESUME:
@@ -21,26 +27,61 @@ class CREATE_EXCEL_RESUME:
         * Solo las columnas:
           FECHA, ZONA, DESCRIPCION, UNIDAD_MEDIDA, CANTIDAD,
           VALOR_UNITARIO, VALOR_TOTAL
+
+    El libro se escribe en modo write_only de openpyxl: las filas se agregan
+    en orden como listas de WriteOnlyCell y se vuelcan a disco al vuelo, sin
+    mantener la hoja completa en memoria. Los estilos se definen una sola
+    vez como NamedStyle (ver ESTILOS) y cada celda solo referencia su nombre.
     """
 
-    OUTPUT_DIR_DEFAULT = (
-        "/home/sr_camilot/Documents/AMC/TEC/"
-        "REPORTES_SUMINISTRO_LLENADO_AGUA_SPRBUN/BD/INFORMES/SPRBUN"
+    # Carpeta y nombres de archivo viven en CONFIG_INFORMES (sin openpyxl)
+    OUTPUT_DIR_DEFAULT = CONFIG_INFORMES.DIR_EXCEL_DEFAULT
+    MESES_ES = CONFIG_INFORMES.MESES_ES
+
+    # Alineaciones, borde y formato reutilizados por varios estilos
+    _CENTRO = Alignment(horizontal="center", vertical="center")
+    _CENTRO_ARRIBA_AJUSTE = Alignment(horizontal="center", vertical="top", wrap_text=True)
+    _IZQ_ARRIBA_AJUSTE = Alignment(horizontal="left", vertical="top", wrap_text=True)
+    _BORDE = Border(
+        left=Side(style="thin"),
+        right=Side(style="thin"),
+        top=Side(style="thin"),
+        bottom=Side(style="thin"),
     )
+    _MONEDA = numbers.FORMAT_CURRENCY_USD_SIMPLE
+
+    # nombre -> atributos del NamedStyle (se registran una vez por libro)
+    ESTILOS = {
+        # Hoja BASE DATOS
+        "bd_encabezado": dict(font=Font(bold=True), border=_BORDE,
+                              alignment=Alignment(horizontal="center", vertical="center", wrap_text=True)),
+        "bd_fecha": dict(alignment=_CENTRO, border=_BORDE, number_format="yyyy-mm-dd"),
+        "centro": dict(alignment=_CENTRO, border=_BORDE),
+        "centro_arriba": dict(alignment=_CENTRO_ARRIBA_AJUSTE, border=_BORDE),
+        "texto": dict(alignment=_IZQ_ARRIBA_AJUSTE, border=_BORDE),
+        "moneda": dict(alignment=_CENTRO, border=_BORDE, number_format=_MONEDA),
+        # Hoja INFORME
+        "titulo": dict(font=Font(bold=True, size=14), alignment=Alignment(horizontal="center")),
+        "titulo_dia": dict(font=Font(bold=True, size=12)),
+        "resumen_dia": dict(alignment=_IZQ_ARRIBA_AJUSTE),
+        "tabla_encabezado": dict(font=Font(bold=True), border=_BORDE,
+                                 alignment=Alignment(horizontal="center", wrap_text=True),
+                                 fill=PatternFill("solid", fgColor="D9D9D9")),
+        "borde": dict(border=_BORDE),
+        "borde_negrita": dict(font=Font(bold=True), border=_BORDE),
+        "subtotal": dict(font=Font(bold=True), border=_BORDE, number_format=_MONEDA),
+        "borde_moneda": dict(border=_BORDE, number_format=_MONEDA),
+        "total_general": dict(font=Font(bold=True, size=12, color="00008B"), border=_BORDE,
+                              alignment=Alignment(horizontal="center"),
+                              fill=PatternFill("solid", fgColor="BDD7EE")),
+    }
 
-    MESES_ES = {
-        1: "ENERO",
-        2: "FEBRERO",
-        3: "MARZO",
-        4: "ABRIL",
-        5: "MAYO",
-        6: "JUNIO",
-        7: "JULIO",
-        8: "AGOSTO",
-        9: "SEPTIEMBRE",
-        10: "OCTUBRE",
-        11: "NOVIEMBRE",
-        12: "DICIEMBRE",
+    # Color del recuadro de cada unidad en el resumen final
+    COLORES_UNIDAD = {
+        "ML": "99CCFF",
+        "M2": "CC99FF",
+        "M3": "99CC00",
+        "UND": "FFCC99",
     }
 
     def __init__(self, output_dir: str | None = None):
@@ -48,27 +89,36 @@ class CREATE_EXCEL_RESUME:
         os.makedirs(self.output_dir, exist_ok=True)
 
         # Estilos básicos para la hoja 1
-        self.thin_border = Border(
-            left=Side(style="thin"),
-            right=Side(style="thin"),
-            top=Side(style="thin"),
-            bottom=Side(style="thin"),
-        )
+        self.thin_border = self._BORDE
 
     # ---------- API PÚBLICA ----------
 
-    def crear_informe(self, df: pd.DataFrame, fecha_inicio: str, fecha_fin: str) -> str:
+    @staticmethod
+    def nombre_archivo(anio: int, mes: int, extension: str = "xlsx") -> str:
+        """Nombre del informe de un mes (ver CONFIG_INFORMES.nombre_archivo)."""
+        return CONFIG_INFORMES.nombre_archivo(anio, mes, extension)
+
+    @INSTRUMENTACION.medir("excel.crear_informe")
+    def crear_informe(self, df: pd.DataFrame, fecha_inicio: str, fecha_fin: str, resumenes=None,
+                      agregados=None) -> str:
         """
         Crea el archivo Excel del informe para un rango de fechas dado.
 
         fecha_inicio y fecha_fin deben venir como 'YYYY-MM-DD',
         por ejemplo: '2025-10-27' y '2025-11-25'.
+
+        resumenes (opcional): REPOSITORIO_RESUMENES; si se pasa, bajo el título
+        de cada día se escribe su "Descripción del servicio".
+
+        agregados (opcional): AGREGADOS_INFORME ya calculado sobre las mismas
+        filas del rango; si no se pasa (o no corresponde), se calcula aquí.
         """
         # Filtrar el dataframe por el rango de fechas
         df_filtrado = self._filtrar_dataframe_rango_fechas(df, fecha_inicio, fecha_fin)
 
         if df_filtrado.empty:
             raise ValueError("No hay registros en el rango de fechas indicado.")
+        INSTRUMENTACION.contar(filas=len(df_filtrado))
 
         # Usamos la fecha de fin para el nombre del archivo (ej: NOVIEMBRE 2025)
         fecha_fin_dt = pd.to_datetime(fecha_fin)
@@ -77,24 +127,73 @@ class CREATE_EXCEL_RESUME:
         mes_nombre = self.MESES_ES.get(mes_num, str(mes_num))
 
         # Nombre del archivo
-        nombre_archivo = f"INFORME_SUMISTRO_LLENADO_AGUA_{mes_nombre}_{anio}.xlsx"
-        ruta_archivo = os.path.join(self.output_dir, nombre_archivo)
+        ruta_archivo = os.path.join(self.output_dir, self.nombre_archivo(anio, mes_num))
 
-        # Crear libro
-        wb = Workbook()
-        ws_informe = wb.active
-        ws_informe.title = "INFORME"
+        # Crear libro (streaming: las filas se escriben a disco al agregarlas)
+        wb = Workbook(write_only=True)
+        self._registrar_estilos(wb)
 
+        ws_informe = wb.create_sheet("INFORME")
         ws_bd = wb.create_sheet("BASE DATOS")
 
+        # Formatear las filas y agregar (subtotales, unidades) una sola vez
+        filas = FILAS_INFORME.formatear(df_filtrado)
+        if agregados is None or agregados.n_filas != len(df_filtrado):
+            agregados = AGREGADOS_INFORME(df_filtrado)
+
         # Escribir hojas
-        self._escribir_hoja_bd(ws_bd, df_filtrado)
-        self._escribir_hoja_informe(ws_informe, df_filtrado, mes_nombre, anio)
+        self._escribir_hoja_bd(ws_bd, df_filtrado, filas)
+        self._escribir_hoja_informe(ws_informe, df_filtrado, mes_nombre, anio, resumenes, filas, agregados)
 
         # Guardar
         wb.save(ruta_archivo)
         return ruta_archivo
 
+    # ---------- UTILIDADES WRITE-ONLY ----------
+
+    def _registrar_estilos(self, wb):
+        """
+        Registra ESTILOS (y un recuadro por unidad) como NamedStyle del libro y
+        guarda, por nombre, el arreglo de estilo ya resuelto para copiarlo a
+        cada celda sin volver a buscar el NamedStyle en la lista del libro.
+        """
+        estilos = dict(self.ESTILOS)
+        for unidad, color in self.COLORES_UNIDAD.items():
+            estilos[f"unidad_{unidad}"] = self._estilo_unidad(color)
+        estilos["unidad_otra"] = self._estilo_unidad("D9D9D9")
+
+        self._estilos = {}
+        for nombre, atributos in estilos.items():
+            # Sin fuente/borde propios, la celda conserva los del estilo Normal
+            atributos = {"font": DEFAULT_FONT, "border": Border(), **atributos}
+            estilo = NamedStyle(name=nombre, **atributos)
+            wb.add_named_style(estilo)
+            self._estilos[nombre] = estilo.as_tuple()
+
+    @classmethod
+    def _estilo_unidad(cls, color):
+        """Recuadro de título de una unidad en el resumen final."""
+        return dict(
+            font=Font(bold=True),
+            border=cls._BORDE,
+            alignment=Alignment(horizontal="center"),
+            fill=PatternFill("solid", fgColor=color),
+        )
+
+    def _celda(self, ws, valor=None, estilo=None):
+        """WriteOnlyCell con uno de los estilos registrados en _registrar_estilos."""
+        celda = WriteOnlyCell(ws, value=valor)
+        if estilo:
+            # Equivale a `celda.style = estilo`, sin la búsqueda por nombre
+            celda._style = copy(self._estilos[estilo])
+        return celda
+
+    @staticmethod
+    def _anchos(ws, anchos: dict):
+        """En write_only los anchos deben fijarse antes de agregar filas."""
+        for col_idx, ancho in anchos.items():
+            ws.column_dimensions[get_column_letter(col_idx)].width = ancho
+
     def _filtrar_dataframe_rango_fechas(self, df: pd.DataFrame, fecha_inicio: str, fecha_fin: str):
         df = df.copy()
 
@@ -114,299 +213,182 @@ class CREATE_EXCEL_RESUME:
 
         return df_filtrado
 
-    def _escribir_hoja_bd(self, ws, df: pd.DataFrame):
-        """Segunda hoja: BD completa, con texto centrado y descripción ajustada."""
+    def _escribir_hoja_bd(self, ws, df: pd.DataFrame, filas=None):
+        """
+        Segunda hoja: BD completa, con texto centrado y descripción ajustada.
 
-        # 1) NUEVAS COLUMNAS A EXPORTAR (incluye ACTIVIDAD -> DESCRIPCION_ITEM)
-        columnas_df = [
+        filas: FILAS_INFORME.formatear(df), si ya se calcularon.
+        """
+        if filas is None:
+            filas = FILAS_INFORME.formatear(df)
+
+        # -------- ANCHO DE COLUMNAS --------
+        self._anchos(ws, {
+            1: 12,   # FECHA
+            2: 25,   # ZONA
+            3: 35,   # DESCRIPCION ITEM
+            4: 60,   # DESCRIPCION
+            5: 12,   # UNIDAD_MEDIDA
+            6: 10,   # CANTIDAD
+            7: 18,   # VALOR_UNITARIO
+            8: 18,   # VALOR_TOTAL
+        })
+
+        # -------- ENCABEZADOS --------
+        # (ACTIVIDAD se exporta como DESCRIPCION ITEM; si falta, va vacía)
+        encabezados = [
             "FECHA",
             "ZONA",
-            "ACTIVIDAD",        # <- viene del df
+            "DESCRIPCION ITEM",
             "DESCRIPCION",
             "UNIDAD_MEDIDA",
             "CANTIDAD",
             "VALOR_UNITARIO",
             "VALOR_TOTAL",
         ]
-
-        # Si tu df no siempre trae ACTIVIDAD, puedes protegerte así:
-        for c in columnas_df:
-            if c not in df.columns:
-                df[c] = ""
-
-        df_bd = df[columnas_df].copy()
-
-        # 2) RENOMBRAR SOLO PARA EL EXCEL (encabezado)
-        df_bd = df_bd.rename(columns={"ACTIVIDAD": "DESCRIPCION ITEM"})
-
-        # FECHA como fecha sin hora
-        df_bd["FECHA"] = pd.to_datetime(df_bd["FECHA"], errors="coerce").dt.date
-
-        # -------- ENCABEZADOS --------
-        columnas_excel = list(df_bd.columns)
-        for col_idx, col_name in enumerate(columnas_excel, start=1):
-            celda = ws.cell(row=1, column=col_idx, value=col_name)
-            celda.font = Font(bold=True)
-            celda.alignment = Alignment(horizontal="center", vertical="center", wrap_text=True)
-            celda.border = self.thin_border
+        ws.append([self._celda(ws, texto, "bd_encabezado") for texto in encabezados])
 
         # -------- DATOS --------
-        for row_idx, (_, fila) in enumerate(df_bd.iterrows(), start=2):
-
-            # FECHA
-            c_fecha = ws.cell(row=row_idx, column=1, value=fila["FECHA"])
-            c_fecha.alignment = Alignment(horizontal="center", vertical="center")
-            c_fecha.border = self.thin_border
-
-            # ZONA
-            c_zona = ws.cell(row=row_idx, column=2, value=fila["ZONA"])
-            c_zona.alignment = Alignment(horizontal="center", vertical="top", wrap_text=True)
-            c_zona.border = self.thin_border
-
-            # DESCRIPCION ITEM (ACTIVIDAD)
-            c_item = ws.cell(row=row_idx, column=3, value=fila["DESCRIPCION ITEM"])
-            c_item.alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
-            c_item.border = self.thin_border
-
-            # DESCRIPCION
-            c_desc = ws.cell(row=row_idx, column=4, value=fila["DESCRIPCION"])
-            c_desc.alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
-            c_desc.border = self.thin_border
-
-            # UNIDAD_MEDIDA
-            c_um = ws.cell(row=row_idx, column=5, value=fila["UNIDAD_MEDIDA"])
-            c_um.alignment = Alignment(horizontal="center", vertical="center")
-            c_um.border = self.thin_border
-
-            # CANTIDAD
-            c_cant = ws.cell(row=row_idx, column=6, value=fila["CANTIDAD"])
-            c_cant.alignment = Alignment(horizontal="center", vertical="center")
-            c_cant.border = self.thin_border
-
-            # VALOR_UNITARIO
-            c_vu = ws.cell(row=row_idx, column=7, value=float(fila["VALOR_UNITARIO"]))
-            c_vu.number_format = numbers.FORMAT_CURRENCY_USD_SIMPLE
-            c_vu.alignment = Alignment(horizontal="center", vertical="center")
-            c_vu.border = self.thin_border
-
-            # VALOR_TOTAL
-            c_vt = ws.cell(row=row_idx, column=8, value=float(fila["VALOR_TOTAL"]))
-            c_vt.number_format = numbers.FORMAT_CURRENCY_USD_SIMPLE
-            c_vt.alignment = Alignment(horizontal="center", vertical="center")
-            c_vt.border = self.thin_border
+        celda = lambda valor, estilo: self._celda(ws, valor, estilo)
+        for f in filas:
+            ws.append([
+                celda(f.fecha, "bd_fecha"),             # fecha sin hora
+                celda(f.zona, "centro_arriba"),
+                celda(f.actividad, "texto"),
+                celda(f.descripcion, "texto"),
+                celda(f.unidad, "centro"),
+                celda(f.cantidad, "centro"),
+                celda(f.valor_unitario, "moneda"),
+                celda(f.valor_total, "moneda"),
+            ])
+
+    def _escribir_hoja_informe(self, ws, df: pd.DataFrame, mes_nombre: str, anio: int, resumenes=None,
+                               filas=None, agregados=None):
+        """
+        Primera hoja: título, tablas por día y resumen por unidad de medida.
 
-        # -------- ANCHO DE COLUMNAS --------
-        anchos = {
-            1: 12,   # FECHA
-            2: 25,   # ZONA
-            3: 35,   # DESCRIPCION ITEM
-            4: 60,   # DESCRIPCION
-            5: 12,   # UNIDAD_MEDIDA
-            6: 10,   # CANTIDAD
-            7: 18,   # VALOR_UNITARIO
-            8: 18,   # VALOR_TOTAL
-        }
-        for col_idx, ancho in anchos.items():
-            ws.column_dimensions[get_column_letter(col_idx)].width = ancho
+        filas: FILAS_INFORME.formatear(df) (en el orden de df), si ya se calcularon.
+        agregados: AGREGADOS_INFORME(df), si ya se calculó.
+        """
+        celda = lambda valor=None, estilo=None: self._celda(ws, valor, estilo)
+        if filas is None:
+            filas = FILAS_INFORME.formatear(df)
+        if agregados is None:
+            agregados = AGREGADOS_INFORME(df)
 
-    def _escribir_hoja_informe(self, ws, df: pd.DataFrame, mes_nombre: str, anio: int):
-        """Primera hoja: título, tablas por día y resumen por unidad de medida."""
+        # Ajustar anchos de columna
+        self._anchos(ws, {
+            1: 12,   # Fecha
+            2: 25,   # Área / Ubicación
+            3: 60,   # Actividad
+            4: 8,    # Unidad
+            5: 10,   # Cantidad
+            6: 18,   # Valor Unitario
+            7: 18,   # Valor Total
+        })
 
         # TÍTULO PRINCIPAL
         fila_actual = 1
-        ws.merge_cells(start_row=fila_actual, start_column=1, end_row=fila_actual, end_column=7)
-        celda_titulo = ws.cell(
-            row=fila_actual,
-            column=1,
-            value=f"INFORME GENERAL DE ACTIVIDADES EJECUTADAS - {mes_nombre} {anio}"
-        )
-        celda_titulo.font = Font(bold=True, size=14)
-        celda_titulo.alignment = Alignment(horizontal="center")
+        ws.merged_cells.add(f"A{fila_actual}:G{fila_actual}")
+        ws.append([celda(f"INFORME GENERAL DE ACTIVIDADES EJECUTADAS - {mes_nombre} {anio}", "titulo")])
+        ws.append([])
         fila_actual += 2
 
-        # Ordenar por fecha
+        # Ordenar por fecha (y las filas formateadas en el mismo orden)
         df_ordenado = df.sort_values("FECHA")
+        orden = df.reset_index(drop=True).sort_values("FECHA").index
+        filas_ordenadas = [filas[i] for i in orden]
+        inicio = 0
+
+        # Encabezados de tabla por día
+        encabezados = [
+            "Fecha",
+            "Área / Ubicación",
+            "Actividad Realizada",
+            "Unidad",
+            "Cantidad",
+            "Valor Unitario ($)",
+            "Valor Total ($)",
+        ]
 
         # BLOQUES POR FECHA
         for fecha, grupo in df_ordenado.groupby(df_ordenado["FECHA"].dt.date):
             # Título de fecha
-            ws.merge_cells(start_row=fila_actual, start_column=1, end_row=fila_actual, end_column=7)
-            celda_fecha = ws.cell(
-                row=fila_actual,
-                column=1,
-                value=f"Fecha: {fecha.strftime('%d/%m/%Y')}"
-            )
-            celda_fecha.font = Font(bold=True, size=12)
+            ws.merged_cells.add(f"A{fila_actual}:G{fila_actual}")
+            ws.append([celda(f"Fecha: {fecha.strftime('%d/%m/%Y')}", "titulo_dia")])
             fila_actual += 1
 
-            # Encabezados de tabla por día
-            encabezados = [
-                "Fecha",
-                "Área / Ubicación",
-                "Actividad Realizada",
-                "Unidad",
-                "Cantidad",
-                "Valor Unitario ($)",
-                "Valor Total ($)",
-            ]
-            for col_idx, texto in enumerate(encabezados, start=1):
-                celda = ws.cell(row=fila_actual, column=col_idx, value=texto)
-                celda.font = Font(bold=True)
-                celda.alignment = Alignment(horizontal="center", wrap_text=True)
-                celda.border = self.thin_border
-                celda.fill = PatternFill("solid", fgColor="D9D9D9")
-            fila_actual += 1
+            # Descripción del servicio (resumen diario), si existe
+            resumen_dia = resumenes.get(fecha) if resumenes is not None else None
+            if resumen_dia:
+                texto_resumen = f"Descripción del servicio: {resumen_dia}"
+                ws.merged_cells.add(f"A{fila_actual}:G{fila_actual}")
+                # ~150 caracteres por línea en el ancho de las 7 columnas
+                lineas = max(1, len(texto_resumen) // 150 + 1)
+                ws.row_dimensions[fila_actual].height = 15 * lineas
+                ws.append([celda(texto_resumen, "resumen_dia")])
+                fila_actual += 1
 
-            # Filas de datos
-            # Filas de datos
-            for _, fila in grupo.iterrows():
-
-                # FECHA
-                celda_fecha = ws.cell(row=fila_actual, column=1, value=fila["FECHA"].strftime("%d/%m/%Y"))
-                celda_fecha.alignment = Alignment(horizontal="center", vertical="center")
-                celda_fecha.border = self.thin_border
-
-                # ZONA
-                celda_zona = ws.cell(row=fila_actual, column=2, value=fila["ZONA"])
-                celda_zona.alignment = Alignment(horizontal="center", vertical="top", wrap_text=True)
-                celda_zona.border = self.thin_border
-
-                # DESCRIPCIÓN (SE LLENA COMPLETA)
-                celda_desc = ws.cell(row=fila_actual, column=3, value=fila["DESCRIPCION"])
-                celda_desc.alignment = Alignment(horizontal="left", vertical="top", wrap_text=True)
-                celda_desc.border = self.thin_border
-
-                # UNIDAD
-                celda_unidad = ws.cell(row=fila_actual, column=4, value=fila["UNIDAD_MEDIDA"])
-                celda_unidad.alignment = Alignment(horizontal="center", vertical="center")
-                celda_unidad.border = self.thin_border
-
-                # CANTIDAD
-                celda_cant = ws.cell(row=fila_actual, column=5, value=fila["CANTIDAD"])
-                celda_cant.alignment = Alignment(horizontal="center", vertical="center")
-                celda_cant.border = self.thin_border
-
-                # VALOR UNITARIO
-                celda_vu = ws.cell(row=fila_actual, column=6, value=float(fila["VALOR_UNITARIO"]))
-                celda_vu.number_format = numbers.FORMAT_CURRENCY_USD_SIMPLE
-                celda_vu.alignment = Alignment(horizontal="center", vertical="center")
-                celda_vu.border = self.thin_border
-
-                # VALOR TOTAL
-                celda_vt = ws.cell(row=fila_actual, column=7, value=float(fila["VALOR_TOTAL"]))
-                celda_vt.number_format = numbers.FORMAT_CURRENCY_USD_SIMPLE
-                celda_vt.alignment = Alignment(horizontal="center", vertical="center")
-                celda_vt.border = self.thin_border
+            ws.append([celda(texto, "tabla_encabezado") for texto in encabezados])
+            fila_actual += 1
 
+            # Filas de datos (el grupo es un tramo contiguo de filas_ordenadas)
+            for f in filas_ordenadas[inicio:inicio + len(grupo)]:
+                ws.append([
+                    celda(f.fecha_excel, "centro"),
+                    celda(f.zona, "centro_arriba"),
+                    celda(f.descripcion, "texto"),     # DESCRIPCIÓN (SE LLENA COMPLETA)
+                    celda(f.unidad, "centro"),
+                    celda(f.cantidad, "centro"),
+                    celda(f.valor_unitario, "moneda"),
+                    celda(f.valor_total, "moneda"),
+                ])
                 fila_actual += 1
-
+            inicio += len(grupo)
 
             # Subtotal por día
-            subtotal = float(grupo["VALOR_TOTAL"].sum())
-            ws.cell(row=fila_actual, column=6, value="Total día").font = Font(bold=True)
-            celda_subtotal = ws.cell(row=fila_actual, column=7, value=subtotal)
-            celda_subtotal.font = Font(bold=True)
-            celda_subtotal.number_format = numbers.FORMAT_CURRENCY_USD_SIMPLE
-
-            for col_idx in range(1, 8):
-                ws.cell(row=fila_actual, column=col_idx).border = self.thin_border
-
+            subtotal = agregados.subtotal_dia(fecha)
+            ws.append(
+                [celda(estilo="borde") for _ in range(5)]
+                + [celda("Total día", "borde_negrita"), celda(subtotal, "subtotal")]
+            )
+            ws.append([])
             fila_actual += 2  # Espacio entre días
 
-        # Ajustar anchos de columna
-        anchos = {
-            1: 12,   # Fecha
-            2: 25,   # Área / Ubicación
-            3: 60,   # Actividad
-            4: 8,    # Unidad
-            5: 10,   # Cantidad
-            6: 18,   # Valor Unitario
-            7: 18,   # Valor Total
-        }
-        for col_idx, ancho in anchos.items():
-            ws.column_dimensions[get_column_letter(col_idx)].width = ancho
-
         # RESUMEN POR UNIDAD DE MEDIDA (en el orden solicitado)
         # ---------------------------------------------------------
         # RESUMEN POR UNIDAD DE MEDIDA EN RECUADROS + TOTAL GENERAL
         # ---------------------------------------------------------
+        ws.append([])
         fila_actual += 1
-        unidades_orden = ["ML", "M2", "M3", "UND"]
-
-        colores_unidad = {
-            "ML": "99CCFF",
-            "M2": "CC99FF",
-            "M3": "99CC00",
-            "UND": "FFCC99",
-        }
+        unidades_orden = AGREGADOS_INFORME.UNIDADES_ORDEN
 
         total_general_cant = 0
         total_general_val = 0
 
         for unidad in unidades_orden:
-            df_u = df[df["UNIDAD_MEDIDA"] == unidad]
-            cantidad_total = float(df_u["CANTIDAD"].sum()) if not df_u.empty else 0.0
-            valor_total = float(df_u["VALOR_TOTAL"].sum()) if not df_u.empty else 0.0
+            cantidad_total, valor_total = agregados.resumen_unidad(unidad)
 
             total_general_cant += cantidad_total
             total_general_val += valor_total
 
-            # --- TÍTULO SOLO SOBRE LAS COLUMNAS 1 Y 2 ---
-            ws.merge_cells(start_row=fila_actual, start_column=1,
-                        end_row=fila_actual, end_column=2)
-            celda_bloque = ws.cell(
-                row=fila_actual,
-                column=1,
-                value=f"RESUMEN ACTIVIDADES EN {unidad}"
-            )
-            celda_bloque.font = Font(bold=True)
-            celda_bloque.alignment = Alignment(horizontal="center")
-            celda_bloque.fill = PatternFill("solid",
-                                            fgColor=colores_unidad.get(unidad, "D9D9D9"))
-
-            # Bordes solo en col 1 y 2
-            for c in range(1, 3):
-                ws.cell(row=fila_actual, column=c).border = self.thin_border
-
-            fila_actual += 1
+            # --- TÍTULO SOLO SOBRE LAS COLUMNAS 1 Y 2 (con bordes en ambas) ---
+            estilo_unidad = f"unidad_{unidad}" if unidad in self.COLORES_UNIDAD else "unidad_otra"
+            ws.merged_cells.add(f"A{fila_actual}:B{fila_actual}")
+            ws.append([celda(f"RESUMEN ACTIVIDADES EN {unidad}", estilo_unidad), celda(estilo="borde")])
 
             # Fila cantidad
-            ws.cell(row=fila_actual, column=1, value=unidad)
-            ws.cell(row=fila_actual, column=2, value=cantidad_total)
-            for c in range(1, 3):
-                ws.cell(row=fila_actual, column=c).border = self.thin_border
-            fila_actual += 1
+            ws.append([celda(unidad, "borde"), celda(cantidad_total, "borde")])
 
             # Fila valor total
-            ws.cell(row=fila_actual, column=1, value="$")
-            celda_valor = ws.cell(row=fila_actual, column=2, value=valor_total)
-            celda_valor.number_format = numbers.FORMAT_CURRENCY_USD_SIMPLE
-            for c in range(1, 3):
-                ws.cell(row=fila_actual, column=c).border = self.thin_border
+            ws.append([celda("$", "borde"), celda(valor_total, "borde_moneda")])
+            ws.append([])
 
-            fila_actual += 2  # espacio entre bloques
+            fila_actual += 4  # título, cantidad, valor y espacio entre bloques
 
         # ------------------------------
         # TOTAL GENERAL DEL INFORME
         # ------------------------------
-        ws.merge_cells(start_row=fila_actual, start_column=1,
-                    end_row=fila_actual, end_column=2)
-        celda_total = ws.cell(
-            row=fila_actual,
-            column=1,
-            value="TOTAL GENERAL DE TODAS LAS ACTIVIDADES"
-        )
-        celda_total.font = Font(bold=True, size=12, color="00008B")
-        celda_total.alignment = Alignment(horizontal="center")
-        celda_total.fill = PatternFill("solid", fgColor="BDD7EE")
-
-        for c in range(1, 3):
-            ws.cell(row=fila_actual, column=c).border = self.thin_border
-
-        fila_actual += 1
-
-        ws.cell(row=fila_actual, column=1, value="Valor Total")
-        celda_vt = ws.cell(row=fila_actual, column=2, value=total_general_val)
-        celda_vt.number_format = numbers.FORMAT_CURRENCY_USD_SIMPLE
-        for c in range(1, 3):
-            ws.cell(row=fila_actual, column=c).border = self.thin_border
+        ws.merged_cells.add(f"A{fila_actual}:B{fila_actual}")
+        ws.append([celda("TOTAL GENERAL DE TODAS LAS ACTIVIDADES", "total_general"), celda(estilo="borde")])
+        ws.append([celda("Valor Total", "borde"), celda(total_general_val, "borde_moneda")])
@@ -1,12 +1,62 @@
 from fpdf import FPDF
+from fpdf.enums import XPos, YPos
+from fpdf.image_parsing import preload_image
 import os
 
+from modules.CATALOGO_FOTOS import CATALOGO_FOTOS
+from modules.FILAS_INFORME import FILAS_INFORME
+from modules.INSTRUMENTACION import INSTRUMENTACION
+from modules.LIMPIAR_TEXTO import LIMPIAR_TEXTO
+from modules.MINIATURAS_FOTOS import MINIATURAS_FOTOS
+
 class PDFHeaderFooter(FPDF):
     """
     PDF oficio horizontal con encabezado y pie de página (imágenes locales).
     """
-    
-    def __init__(self):
+
+    # --- TABLA DE ACTIVIDADES: ANCHO DE COLUMNAS (mm) ---
+    # Antes:
+    # 25 + 40 + 105 + 18 + 18 + 28 + 28 + 50 = 312
+    # Ahora hacemos DESCRIPCION ~la mitad (52) y ese espacio se lo damos a FOTOS (103):
+    # 25 + 40 + 52 + 18 + 18 + 28 + 28 + 103 = 312
+    COL_WIDTHS = {
+        "FECHA": 20,         # reducido
+        "ZONA": 40,          # igual
+        "DESCRIPCION": 70,   # aumentado
+        "UNIDAD": 13,        # reducido
+        "CANTIDAD": 13,      # reducido
+        "V_UNIT": 28,        # igual
+        "V_TOTAL": 28,       # igual
+        "FOTOS": 100         # ajustado para cuadrar total 312 mm
+    }
+
+    ALIGNS_FILA = [
+        "C",  # Fecha
+        "L",  # Área / Ubicación
+        "L",  # Actividad Realizada
+        "C",  # Unidad
+        "C",  # Cantidad
+        "C",  # Valor Unitario
+        "C",  # Valor Total
+        "C",  # Fotografías (si hubiera texto)
+    ]
+
+    LINE_HEIGHT_FILA = 5
+    ALTO_MIN_FILA_FOTOS = 25   # altura "tipo tarjeta" mínima para fotos (mm aprox)
+    ALTO_MAX_FILA = 80         # límite para que la fila no sea gigante (60–80 según veas)
+    MARGEN_FOTOS = 2           # margen arriba/abajo de las fotos
+    GAP_FOTOS = 2              # separación ENTRE fotos (visible pero pequeña)
+    MAX_FOTOS_FILA = 3
+
+    def __init__(self, usar_miniaturas=True, catalogo_fotos=None):
+        """
+        - usar_miniaturas: si True, las fotos de actividades se insertan como
+          miniaturas en caché (ver MINIATURAS_FOTOS) con la resolución que
+          necesita su celda, en lugar del archivo original a resolución completa.
+        - catalogo_fotos: CATALOGO_FOTOS ya construido (por ejemplo, compartido
+          entre varios informes). Si no se pasa, se crea uno con las rutas por
+          defecto y se escanea la primera vez que se necesita.
+        """
         # --- CONFIGURACIÓN BÁSICA DEL PDF ---
         super().__init__(orientation="L", unit="mm", format=(216, 340))  # L = horizontal, oficio 216x340 mm
         self.left_margin = 14
@@ -27,6 +77,24 @@ class PDFHeaderFooter(FPDF):
         if not os.path.isfile(self.footer_img):
             raise FileNotFoundError(f"No se encontró la imagen de pie de página: {self.footer_img}")
 
+        # --- ENCABEZADO Y PIE: SE DECODIFICAN Y DIMENSIONAN UNA SOLA VEZ ---
+        # fpdf2 guarda cada imagen una vez por nombre (un XObject) y cada página
+        # solo la referencia; aquí además se evita volver a medirla por página.
+        _, _, info_header = preload_image(self.image_cache, self.header_img)
+        _, _, info_footer = preload_image(self.image_cache, self.footer_img)
+        self._ratio_header = info_header["h"] / info_header["w"]   # alto / ancho
+        self._ratio_footer = info_footer["h"] / info_footer["w"]
+
+        # --- PIE DE PÁGINA: PDF_PARALELO lo apaga en los procesos de trabajo ---
+        self.dibujar_pie = True
+
+        # --- CACHÉ DE ALTURAS DE TEXTO (medición sin dibujar) ---
+        self._cache_alturas = {}
+
+        # --- MINIATURAS DE LAS FOTOS DE ACTIVIDADES ---
+        self.miniaturas = MINIATURAS_FOTOS() if usar_miniaturas else None
+        self.catalogo_fotos = catalogo_fotos if catalogo_fotos is not None else CATALOGO_FOTOS()
+
         # --- CONFIGURACIÓN DE MÁRGENES EFECTIVOS ---
         self.set_margins(left=self.left_margin,
                          top=self.top_margin + self.header_height,
@@ -43,13 +111,13 @@ class PDFHeaderFooter(FPDF):
     def header(self):
         usable_width = self.w - self.left_margin - self.right_margin
         y = self.top_margin
-        target_height = self.header_height * 0.98
 
         # Dibuja imagen centrada con márgenes laterales blancos
         self.image(self.header_img,
                    x=self.left_margin,
                    y=y,
-                   w=usable_width)
+                   w=usable_width,
+                   h=usable_width * self._ratio_header)
 
         # Cursor justo debajo del encabezado
         self.set_y(self.top_margin + self.header_height)
@@ -61,6 +129,9 @@ class PDFHeaderFooter(FPDF):
         """
         Footer centrado y 50% más pequeño.
         """
+        if not self.dibujar_pie:
+            return
+
         # Altura visual (ajustable)
         target_h = 10
         y = self.h - self.bottom_margin - target_h - 2
@@ -79,7 +150,8 @@ class PDFHeaderFooter(FPDF):
             self.footer_img,
             x=x,
             y=y,
-            w=footer_width
+            w=footer_width,
+            h=footer_width * self._ratio_footer
         )
     # ------------------------------------------------------------------
     # Portada informativa
@@ -90,21 +162,77 @@ class PDFHeaderFooter(FPDF):
         """
         Elimina y reemplaza caracteres Unicode incompatibles con Helvetica en FPDF.
         """
-        if texto is None:
-            return ""
-        reemplazos = {
-            "–": "-",    # en dash
-            "—": "-",    # em dash
-            "’": "'",    # comilla curva derecha
-            "‘": "'",    # comilla curva izquierda
-            "“": '"',    # comilla doble curva izquierda
-            "”": '"',    # comilla doble curva derecha
-            "…": "...",  # puntos suspensivos unicode
-            "•": "-",    # viñeta
-        }
-        for viejo, nuevo in reemplazos.items():
-            texto = texto.replace(viejo, nuevo)
-        return texto
+        return LIMPIAR_TEXTO.basico(texto)
+
+    def _altura_texto(self, texto, w, line_height, align="L"):
+        """
+        Altura que ocuparía `texto` en un multi_cell de ancho `w`, calculada
+        con dry_run (no escribe nada en el PDF). Se memoriza por fuente,
+        ancho y texto, porque las descripciones y zonas se repiten mucho.
+        """
+        clave = (self.font_family, self.font_style, self.font_size_pt, w, line_height, align, texto)
+        altura = self._cache_alturas.get(clave)
+        if altura is None:
+            lineas = self.multi_cell(
+                w, line_height, texto, border=0, align=align,
+                dry_run=True, output="LINES"
+            )
+            altura = len(lineas) * line_height
+            self._cache_alturas[clave] = altura
+        return altura
+
+    def medidas_fila(self, celdas, widths, fotos=None):
+        """
+        Medidas de una fila de la tabla de actividades, sin dibujar nada
+        (con la fuente de las filas ya puesta):
+        (alto del texto, alto de la fila, alto de las fotos, [(foto, ancho)]).
+
+        Con fotos la fila mide al menos ALTO_MIN_FILA_FOTOS; ninguna fila
+        pasa de ALTO_MAX_FILA. Las fotos (máximo MAX_FOTOS_FILA) comparten
+        el mismo alto y conservan su proporción (dimensiones tomadas del
+        catálogo, sin abrir la imagen); si no caben a lo ancho, se reducen.
+        """
+        line_height = self.LINE_HEIGHT_FILA
+
+        # Altura del texto SIN dibujar nada (solo cálculo de líneas)
+        row_height_text = max(
+            self._altura_texto(texto, w, line_height, align)
+            for texto, w, align in zip(celdas, widths, self.ALIGNS_FILA)
+        )
+
+        row_height = row_height_text
+        if fotos and row_height < self.ALTO_MIN_FILA_FOTOS:
+            row_height = self.ALTO_MIN_FILA_FOTOS
+        if row_height > self.ALTO_MAX_FILA:
+            row_height = self.ALTO_MAX_FILA
+
+        fotos_mostrar = (fotos or [])[:self.MAX_FOTOS_FILA]
+        num_fotos = len(fotos_mostrar)
+        if num_fotos == 0:
+            return row_height_text, row_height, 0, []
+
+        # ancho útil descontando los gaps internos
+        disp_w = widths[-1] - (num_fotos - 1) * self.GAP_FOTOS
+        h_base = row_height - 2 * self.MARGEN_FOTOS
+
+        # calcular anchos en función de la altura
+        anchos = []
+        for foto in fotos_mostrar:
+            if foto["ancho"] and foto["alto"]:
+                ratio = foto["ancho"] / foto["alto"]      # ancho / alto
+                anchos.append(h_base * ratio)
+            else:
+                anchos.append(0)
+
+        suma_anchos = sum(anchos)
+
+        # escalar si no caben en el ancho útil
+        if suma_anchos > disp_w and suma_anchos > 0:
+            factor = disp_w / suma_anchos
+            anchos = [w * factor for w in anchos]
+            h_base = h_base * factor
+
+        return row_height_text, row_height, h_base, list(zip(fotos_mostrar, anchos))
 
     def agregar_portada(self, anio, nombre_mes, nombre_mes_anterior, fechas_mes, resumen_general):
         """
@@ -119,7 +247,7 @@ class PDFHeaderFooter(FPDF):
 
         # Título centrado
         self.set_font("Helvetica", "B", 14)
-        self.cell(0, 10, "INFORME GENERAL DE ACTIVIDADES DE LLENADO Y SUMINISTRO DE AGUA", ln=True, align="C")
+        self.cell(0, 10, "INFORME GENERAL DE ACTIVIDADES DE LLENADO Y SUMINISTRO DE AGUA", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
 
         # Espacio
         self.ln(2)
@@ -153,6 +281,7 @@ class PDFHeaderFooter(FPDF):
         self.set_font("Helvetica", "", 10)
         self.multi_cell(0, 6, resumen_general, align="J")
 
+    @INSTRUMENTACION.medir("pdf.dia")
     def agregar_tabla_actividades_dia(
             self,
             num_dia,
@@ -161,7 +290,8 @@ class PDFHeaderFooter(FPDF):
             df_dia,
             titulo_dia=None,
             descripcion_servicio="",   # 👈 NUEVO
-            nueva_pagina=True
+            nueva_pagina=True,
+            total_dia=None
         ):
         """
         Dibuja una tabla tipo Excel con las actividades de un día.
@@ -174,6 +304,8 @@ class PDFHeaderFooter(FPDF):
         - titulo_dia: texto opcional para el encabezado del bloque.
         - descripcion_servicio: texto que se mostrará luego del título.
         - nueva_pagina: si True, agrega una nueva página antes de dibujar la tabla.
+        - total_dia: suma de VALOR_TOTAL del día si ya se calculó
+          (AGREGADOS_INFORME.subtotal_dia); si no, se suma df_dia.
         """
 
         # ------------------------------------------------
@@ -204,7 +336,7 @@ class PDFHeaderFooter(FPDF):
             titulo_dia = f"DÍA {num_dia} - {nombre_dia} {fecha_dia.day} de {nombre_mes} de {fecha_dia.year}"
 
 
-        self.cell(0, 8, titulo_dia, ln=True, align="L")
+        self.cell(0, 8, titulo_dia, new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="L")
 
         # ------------------------------------------------
         # 4. Descripción del servicio (texto configurable)
@@ -217,44 +349,29 @@ class PDFHeaderFooter(FPDF):
                 0,
                 5,
                 f"Descripción del servicio: {descripcion_servicio}",
-                ln=True
+                new_x=XPos.LMARGIN,
+                new_y=YPos.NEXT
             )
         else:
             # Solo la etiqueta si no pasas descripción
-            self.multi_cell(0, 5, "Descripción del servicio:", ln=True)
+            self.multi_cell(0, 5, "Descripción del servicio:", new_x=XPos.LMARGIN, new_y=YPos.NEXT)
 
         # Total del día (suma VALOR_TOTAL)
-        total_dia = float(df_dia["VALOR_TOTAL"].sum())
+        if total_dia is None:
+            total_dia = float(df_dia["VALOR_TOTAL"].sum())
         total_dia_str = f"{total_dia:,.0f}".replace(",", ".")
         self.ln(2)
         self.set_font("Helvetica", "B", 9)
-        self.cell(0, 6, f"ACTIVIDADES EJECUTADAS - TOTAL: ${total_dia_str}", ln=True, align="L")
+        self.cell(0, 6, f"ACTIVIDADES EJECUTADAS - TOTAL: ${total_dia_str}", new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="L")
         self.ln(2)
 
         # ------------------------------------------------
         # 5. Configuración de columnas (ancho en mm)
-        #    Usamos TODO el ancho útil: w - márgenes
+        #    COL_WIDTHS ocupa TODO el ancho útil: w - márgenes
         # ------------------------------------------------
-        usable_width = self.w - self.left_margin - self.right_margin  # ≈ 312 mm
-
-        # Antes:
-        # 25 + 40 + 105 + 18 + 18 + 28 + 28 + 50 = 312
-        # Ahora hacemos DESCRIPCION ~la mitad (52) y ese espacio se lo damos a FOTOS (103):
-        # 25 + 40 + 52 + 18 + 18 + 28 + 28 + 103 = 312
-        col_widths = {
-            "FECHA": 20,         # reducido
-            "ZONA": 40,          # igual
-            "DESCRIPCION": 70,   # aumentado
-            "UNIDAD": 13,        # reducido
-            "CANTIDAD": 13,      # reducido
-            "V_UNIT": 28,        # igual
-            "V_TOTAL": 28,       # igual
-            "FOTOS": 100         # ajustado para cuadrar total 312 mm
-        }
+        col_widths = self.COL_WIDTHS
 
-
-
-        line_height = 5
+        line_height = self.LINE_HEIGHT_FILA
 
         # ------------------------------------------------
         # 6. Encabezado de la tabla
@@ -298,71 +415,22 @@ class PDFHeaderFooter(FPDF):
         # ------------------------------------------------
         self.set_font("Helvetica", "", 8)
 
-        # ------------------------------------------------
-        # 7. Filas con datos del DataFrame
-        # ------------------------------------------------
-        self.set_font("Helvetica", "", 8)
-
-        def _dibujar_fila(celdas, widths, fotos_paths=None):
+        def _dibujar_fila(celdas, widths, fotos=None):
             """
             Dibuja UNA fila completa:
-            - Calcula la altura que ocupa el texto
-            - Si hay fotos, aumenta la altura de la fila para que quepan
-              sin deformarse (se respeta la proporción de la imagen).
+            - Calcula la altura de la fila y el tamaño de las fotos
+              (medidas_fila: texto medido sin dibujar, fotos sin deformarse)
             - Dibuja el texto, los bordes y, si aplica, las fotografías
               en la última columna.
             """
             x_fila = self.get_x()
             y_fila = self.get_y()
-            max_y = y_fila
-
-            aligns = [
-                "C",  # Fecha
-                "L",  # Área / Ubicación
-                "L",  # Actividad Realizada
-                "C",  # Unidad
-                "C",  # Cantidad
-                "C",  # Valor Unitario
-                "C",  # Valor Total
-                "C",  # Fotografías (si hubiera texto)
-            ]
 
-            # 1️⃣ Escribimos el texto SIN bordes y medimos altura usada
-            self.set_text_color(255, 255, 255)
+            aligns = self.ALIGNS_FILA
 
-            for texto, w, align in zip(celdas, widths, aligns):
-                x_actual = self.get_x()
-                y_actual = self.get_y()
-
-                self.multi_cell(w, line_height, texto, border=0, align=align)
-
-                max_y = max(max_y, self.get_y())
-                self.set_xy(x_actual + w, y_actual)
-
-            # Volvemos al texto negro para el dibujo real
-            self.set_text_color(0, 0, 0)
-
-            # Altura que pide solo el texto
-            row_height_text = max_y - y_fila
-
-            # Altura que pide solo el texto
-            row_height_text = max_y - y_fila
-
-            # 2️⃣ Si hay fotos, aseguramos una altura mínima para que quepan
-            row_height = row_height_text
-
-            if fotos_paths:
-                # altura "tipo tarjeta" mínima para fotos
-                altura_min_fotos = 25  # mm aprox
-                if row_height < altura_min_fotos:
-                    row_height = altura_min_fotos
-                    max_y = y_fila + row_height
-
-            # 🔥 2.1 (OPCIONAL) Límite máximo de altura para que la fila no sea gigante
-            max_row_height_fotos = 80  # ajústalo 60–80 según veas
-            if row_height > max_row_height_fotos:
-                row_height = max_row_height_fotos
-                max_y = y_fila + row_height
+            # 1️⃣ y 2️⃣ Altura del texto y altura final de la fila (mín./máx. con fotos)
+            row_height_text, row_height, h_base, fotos_anchos = self.medidas_fila(celdas, widths, fotos)
+            max_y = y_fila + row_height
 
             # 3️⃣ Dibujamos los rectángulos de la fila con la altura final
             x_actual = x_fila
@@ -390,62 +458,27 @@ class PDFHeaderFooter(FPDF):
 
             # 4️⃣ Dibujar imágenes en la última columna (Fotografías),
             #     MISMA ALTURA, CON PEQUEÑA SEPARACIÓN ENTRE ELLAS
-            if fotos_paths:
-                from PIL import Image
-
-                x_fotos = x_fila + sum(widths[:-1])
-                w_fotos = widths[-1]
-
-                margin_vertical = 2      # margen arriba/abajo
-                margin_side = 0          # margen contra el borde de la celda
-                gap = 2                  # 👈 separación ENTRE fotos (visible pero pequeña)
-
-                # ancho útil descontando bordes y los gaps internos
-                fotos_mostrar = fotos_paths[:3]
-                num_fotos = len(fotos_mostrar)
-
-                if num_fotos > 0:
-                    disp_w = w_fotos - 2 * margin_side - (num_fotos - 1) * gap
-                    disp_h = row_height - 2 * margin_vertical
-
-                    h_base = disp_h
-
-                    # calcular anchos en función de la altura
-                    anchos = []
-                    for foto in fotos_mostrar:
-                        try:
-                            with Image.open(foto) as img:
-                                img_w, img_h = img.size
-                            ratio = img_w / img_h      # ancho / alto
-                            anchos.append(h_base * ratio)
-                        except Exception as e:
-                            print(f"⚠️ Error cargando imagen {foto}: {e}")
-                            anchos.append(0)
-
-                    suma_anchos = sum(anchos)
-
-                    # escalar si no caben en el ancho útil
-                    if suma_anchos > disp_w and suma_anchos > 0:
-                        factor = disp_w / suma_anchos
-                        anchos = [w * factor for w in anchos]
-                        h_base = h_base * factor
-
-                    # dibujar fotos con gap entre ellas
-                    x_img = x_fotos + margin_side
-                    y_img = y_fila + margin_vertical
-
-                    for foto, w_obj in zip(fotos_mostrar, anchos):
-                        if w_obj <= 0:
-                            continue
-                        try:
-                            self.image(foto, x=x_img, y=y_img, w=w_obj, h=h_base)
-                        except Exception as e:
-                            print(f"⚠️ Error dibujando imagen {foto}: {e}")
-
-                        # 👉 avanza ancho de la foto + separación
-                        x_img += w_obj + gap
-
-
+            if fotos_anchos:
+                # dibujar fotos con gap entre ellas
+                x_img = x_fila + sum(widths[:-1])
+                y_img = y_fila + self.MARGEN_FOTOS
+
+                for foto, w_obj in fotos_anchos:
+                    if w_obj <= 0:
+                        continue
+                    ruta_foto = foto["ruta"]
+                    try:
+                        with INSTRUMENTACION.etapa("pdf.imagenes", imagenes=1):
+                            if self.miniaturas is not None:
+                                ruta_foto = self.miniaturas.obtener(
+                                    ruta_foto, h_base, firma=(foto["mtime_ns"], foto["tamano"])
+                                )
+                            self.image(ruta_foto, x=x_img, y=y_img, w=w_obj, h=h_base)
+                    except Exception as e:
+                        print(f"⚠️ Error dibujando imagen {ruta_foto}: {e}")
+
+                    # 👉 avanza ancho de la foto + separación
+                    x_img += w_obj + self.GAP_FOTOS
 
             # 5️⃣ Cursor al inicio de la siguiente fila
             self.set_xy(x_fila, max_y)
@@ -455,8 +488,10 @@ class PDFHeaderFooter(FPDF):
         # 🔁 AHORA SÍ: recorremos el DataFrame y dibujamos cada fila
         max_row_height = 25  # por ejemplo
 
-        # 🔁 Recorremos el DataFrame y dibujamos cada fila
-        for _, row in df_dia.iterrows():
+        # 🔁 Recorremos las filas ya formateadas (FILAS_INFORME) y dibujamos cada una
+        tiene_id = "ID_ACTIVIDAD" in df_dia.columns
+        INSTRUMENTACION.contar(filas=len(df_dia))
+        for fila in FILAS_INFORME.formatear(df_dia, fecha_defecto=fecha_dia):
         
             # ------------------------------------------------
             # 0. Comprobar espacio disponible en la página
@@ -489,55 +524,19 @@ class PDFHeaderFooter(FPDF):
                 self.set_font("Helvetica", "", 8)
 
             # ------------------------------------------------
-            # 1. FECHA en formato dd-mm-aaaa (siempre string)
-            # ------------------------------------------------
-            try:
-                f = row["FECHA"]
-
-                if isinstance(f, str):
-                    fecha_str = f.strip()
-                elif hasattr(f, "strftime"):
-                    fecha_str = f.strftime("%d-%m-%Y")
-                else:
-                    fecha_str = fecha_dia.strftime("%d-%m-%Y")
-            except Exception:
-                fecha_str = fecha_dia.strftime("%d-%m-%Y")
-
-            # ------------------------------------------------
-            # 2. Valores numéricos formateados
+            # 1. Celdas de texto (fecha dd-mm-aaaa y montos con
+            #    separador de miles ya vienen formateados)
             # ------------------------------------------------
-            v_unit = float(row["VALOR_UNITARIO"])
-            v_total = float(row["VALOR_TOTAL"])
-            v_unit_str = f"{v_unit:,.0f}".replace(",", ".")
-            v_total_str = f"{v_total:,.0f}".replace(",", ".")
-
-            # ------------------------------------------------
-            # 3. Celdas de texto
-            # ------------------------------------------------
-            celdas = [
-                fecha_str,
-                str(row["ZONA"]),
-                str(row["DESCRIPCION"]),
-                str(row["UNIDAD_MEDIDA"]),
-                str(row["CANTIDAD"]),
-                v_unit_str,
-                v_total_str,
-                ""  # texto en Fotografías (no lo usamos)
-            ]
+            celdas = fila.celdas_pdf()
 
             # ------------------------------------------------
-            # 4. Buscar fotos de la actividad (si ya tienes ID_ACTIVIDAD)
+            # 2. Buscar fotos de la actividad (si ya tienes ID_ACTIVIDAD)
             # ------------------------------------------------
-            fotos_paths = []
-            if "ID_ACTIVIDAD" in df_dia.columns:
-                id_act = str(row["ID_ACTIVIDAD"]).strip()
-                carpeta_fotos = os.path.join("BD", "FOTOS", "ACTIVIDADES_FOTOS", id_act)
-                if os.path.isdir(carpeta_fotos):
-                    for nombre in sorted(os.listdir(carpeta_fotos)):
-                        if nombre.lower().endswith((".jpg", ".jpeg", ".png")):
-                            fotos_paths.append(os.path.join(carpeta_fotos, nombre))
+            fotos = []
+            if tiene_id:
+                fotos = self.catalogo_fotos.fotos(fila.id_actividad)
 
             # ------------------------------------------------
-            # 5. Dibujar la fila (texto + fotos)
+            # 3. Dibujar la fila (texto + fotos)
             # ------------------------------------------------
-            _dibujar_fila(celdas, widths_order, fotos_paths=fotos_paths)
+            _dibujar_fila(celdas, widths_order, fotos=fotos)
@@ -1,62 +1,164 @@
 from pathlib import Path
 import pandas as pd
-from dotenv import load_dotenv
-import pandas as pd
-import os
+import sqlite3
+from contextlib import contextmanager
 
-# Importar la clase desde la carpeta modules
-from modules.GENERATE_RESUMS_DAILY import GenerateText 
 
 class CREATE_TABLE_RESUMS:
     """
-    Guarda resúmenes diarios en un archivo Excel evitando duplicados por fecha.
+    Guarda resúmenes diarios (FECHA → RESUMEN) evitando duplicados por fecha.
+
+    Los resúmenes viven en una base SQLite con FECHA ('YYYY-MM-DD') como
+    clave primaria, de modo que guardar uno nuevo es una inserción indexada
+    y no reescribir todo el archivo. La copia en Excel para consulta humana
+    se genera explícitamente con `export_excel()`.
     """
 
-    def __init__(self, ruta_archivo="BD/EXCEL/RESUMENES/resumenes_mensuales.xlsx"):
+    def __init__(self, ruta_archivo="BD/EXCEL/RESUMENES/resumenes_mensuales.xlsx",
+                 ruta_bd="BD/EXCEL/RESUMENES/resumenes.sqlite"):
         """
         Inicializa la clase indicando la ruta donde se guardarán los resúmenes.
         Crea la carpeta si no existe.
+
+        - ruta_archivo: copia en Excel (la que escribe export_excel()).
+        - ruta_bd: base SQLite con los resúmenes.
+
+        Si la base está vacía y ya existe el Excel de versiones anteriores,
+        sus resúmenes se importan una sola vez.
         """
         self.ruta_archivo = Path(ruta_archivo)
         self.ruta_archivo.parent.mkdir(parents=True, exist_ok=True)
+        self.ruta_bd = Path(ruta_bd)
+        self.ruta_bd.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._conectar() as con:
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS resumenes ("
+                "FECHA TEXT PRIMARY KEY, "
+                "RESUMEN TEXT NOT NULL)"
+            )
+            vacia = con.execute("SELECT COUNT(*) FROM resumenes").fetchone()[0] == 0
+
+        if vacia and self.ruta_archivo.exists():
+            self._importar_excel()
+
+    @contextmanager
+    def _conectar(self):
+        """Conexión con commit al salir sin errores (rollback si falla) y cierre."""
+        con = sqlite3.connect(self.ruta_bd)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    @staticmethod
+    def _normalizar_fecha(fecha) -> str:
+        """Cualquier fecha (str, date, Timestamp) como 'YYYY-MM-DD'."""
+        return pd.Timestamp(fecha).strftime("%Y-%m-%d")
+
+    def _importar_excel(self):
+        """Migra el Excel de resúmenes existente a la base SQLite."""
+        try:
+            df = pd.read_excel(self.ruta_archivo)
+        except Exception:
+            # Si el archivo está corrupto, se empieza con la base vacía.
+            return
+        if "FECHA" not in df.columns or "RESUMEN" not in df.columns:
+            return
 
-        # Si el archivo existe, lo carga; si no, crea un DataFrame vacío.
-        if self.ruta_archivo.exists():
-            try:
-                self.df_resumenes = pd.read_excel(self.ruta_archivo)
-            except Exception:
-                # Si el archivo está corrupto, reinicia.
-                self.df_resumenes = pd.DataFrame(columns=["FECHA", "RESUMEN"])
-        else:
-            self.df_resumenes = pd.DataFrame(columns=["FECHA", "RESUMEN"])
+        # Celdas de fecha ilegibles del Excel antiguo quedan como NaT y se omiten
+        fechas = pd.to_datetime(df["FECHA"], errors="coerce")
+        invalidas = int((fechas.isna() & df["FECHA"].notna()).sum())
+        if invalidas:
+            print(f"⚠️ {invalidas} filas con FECHA inválida en {self.ruta_archivo}; no se importan.")
 
+        resumenes = {}
+        for fecha, resumen in zip(fechas, df["RESUMEN"]):
+            if pd.isna(fecha) or not isinstance(resumen, str) or not resumen:
+                continue
+            resumenes.setdefault(fecha, resumen)
+
+        guardados = self.guardar_resumenes(resumenes, verbose=False)
+        print(f"📥 {guardados} resúmenes importados desde {self.ruta_archivo}")
+
+    # ------------------------------------------------------------------
+    # Escritura
+    # ------------------------------------------------------------------
     def guardar_resumen(self, fecha: str, resumen: str):
         """
-        Guarda el resumen en el archivo Excel si la fecha no existe.
+        Guarda el resumen si la fecha no existe.
         """
 
         # Validación por si viene vacío
         if not resumen or not isinstance(resumen, str):
             print(f"⚠️ No se pudo guardar resumen para {fecha} (vacío o inválido).")
             return
-        
-        # Verificar si la fecha ya existe
-        if fecha in self.df_resumenes["FECHA"].astype(str).values:
+
+        with self._conectar() as con:
+            cursor = con.execute(
+                "INSERT OR IGNORE INTO resumenes (FECHA, RESUMEN) VALUES (?, ?)",
+                (self._normalizar_fecha(fecha), resumen),
+            )
+
+        # Verificar si la fecha ya existía
+        if cursor.rowcount == 0:
             print(f"⏭️ Resumen para {fecha} ya existe. Se omite.")
             return
 
-        # Agregar registro
-        nuevo_registro = {
-            "FECHA": fecha,
-            "RESUMEN": resumen
-        }
+        print(f"💾 Resumen guardado correctamente para: {fecha}")
 
-        self.df_resumenes = pd.concat(
-            [self.df_resumenes, pd.DataFrame([nuevo_registro])],
-            ignore_index=True
-        )
+    def guardar_resumenes(self, resumenes: dict, verbose: bool = True) -> int:
+        """
+        Guarda varios resúmenes {fecha: resumen} en una sola transacción.
+        Las fechas que ya existen y los resúmenes vacíos se omiten.
+        Devuelve cuántos se guardaron.
+        """
+        registros = []
+        for fecha, resumen in resumenes.items():
+            if not resumen or not isinstance(resumen, str):
+                if verbose:
+                    print(f"⚠️ No se pudo guardar resumen para {fecha} (vacío o inválido).")
+                continue
+            registros.append((self._normalizar_fecha(fecha), resumen))
 
-        # Guardar en el archivo
-        self.df_resumenes.to_excel(self.ruta_archivo, index=False)
+        with self._conectar() as con:
+            antes = con.total_changes
+            con.executemany(
+                "INSERT OR IGNORE INTO resumenes (FECHA, RESUMEN) VALUES (?, ?)",
+                registros,
+            )
+            guardados = con.total_changes - antes
 
-        print(f"💾 Resumen guardado correctamente para: {fecha}")
+        if verbose:
+            omitidos = len(registros) - guardados
+            print(f"💾 {guardados} resúmenes guardados" + (f" ({omitidos} ya existían)." if omitidos else "."))
+        return guardados
+
+    # ------------------------------------------------------------------
+    # Lectura / exportación
+    # ------------------------------------------------------------------
+    @property
+    def df_resumenes(self) -> pd.DataFrame:
+        """Todos los resúmenes como DataFrame (FECHA como fecha, ordenados)."""
+        with self._conectar() as con:
+            df = pd.read_sql_query("SELECT FECHA, RESUMEN FROM resumenes ORDER BY FECHA", con)
+        df["FECHA"] = pd.to_datetime(df["FECHA"])
+        return df
+
+    def leer_rango(self, fecha_inicio, fecha_fin) -> dict:
+        """Resúmenes {'YYYY-MM-DD': resumen} con FECHA entre ambas fechas (incluidas)."""
+        with self._conectar() as con:
+            filas = con.execute(
+                "SELECT FECHA, RESUMEN FROM resumenes WHERE FECHA BETWEEN ? AND ?",
+                (self._normalizar_fecha(fecha_inicio), self._normalizar_fecha(fecha_fin)),
+            ).fetchall()
+        return dict(filas)
+
+    def export_excel(self, ruta_archivo=None) -> Path:
+        """Escribe la copia legible en Excel (FECHA, RESUMEN) y devuelve su ruta."""
+        ruta = Path(ruta_archivo) if ruta_archivo else self.ruta_archivo
+        ruta.parent.mkdir(parents=True, exist_ok=True)
+        self.df_resumenes.to_excel(ruta, index=False)
+        print(f"📄 Resúmenes exportados a: {ruta}")
+        return ruta
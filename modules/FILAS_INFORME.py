@@ -0,0 +1,178 @@
+import pandas as pd
+
+from modules.PARSEAR_MONEDA import PARSEAR_MONEDA
+
+
+class FILA_ACTIVIDAD:
+    """
+    Una actividad ya formateada para los informes (PDF y Excel).
+
+    Registro liviano con __slots__: valores crudos para Excel (números como
+    float, fecha como date) y textos listos para el PDF.
+    """
+
+    __slots__ = (
+        "id_actividad",
+        "fecha",              # datetime.date (NaT si no es válida)
+        "fecha_pdf",          # 'dd-mm-aaaa'
+        "fecha_excel",        # 'dd/mm/aaaa'
+        "zona",
+        "actividad",
+        "descripcion",
+        "unidad",
+        "cantidad",
+        "valor_unitario",     # float
+        "valor_total",        # float
+        "zona_txt",
+        "descripcion_txt",
+        "unidad_txt",
+        "cantidad_txt",
+        "valor_unitario_txt",  # '1.234.567'
+        "valor_total_txt",
+    )
+
+    def __init__(
+        self, id_actividad, fecha, fecha_pdf, fecha_excel, zona, actividad,
+        descripcion, unidad, cantidad, valor_unitario, valor_total,
+        zona_txt, descripcion_txt, unidad_txt, cantidad_txt, valor_unitario_txt, valor_total_txt,
+    ):
+        self.id_actividad = id_actividad
+        self.fecha = fecha
+        self.fecha_pdf = fecha_pdf
+        self.fecha_excel = fecha_excel
+        self.zona = zona
+        self.actividad = actividad
+        self.descripcion = descripcion
+        self.unidad = unidad
+        self.cantidad = cantidad
+        self.valor_unitario = valor_unitario
+        self.valor_total = valor_total
+        self.zona_txt = zona_txt
+        self.descripcion_txt = descripcion_txt
+        self.unidad_txt = unidad_txt
+        self.cantidad_txt = cantidad_txt
+        self.valor_unitario_txt = valor_unitario_txt
+        self.valor_total_txt = valor_total_txt
+
+    def celdas_pdf(self) -> list:
+        """Textos de las 8 columnas de la tabla del PDF (la de fotos va vacía)."""
+        return [
+            self.fecha_pdf,
+            self.zona_txt,
+            self.descripcion_txt,
+            self.unidad_txt,
+            self.cantidad_txt,
+            self.valor_unitario_txt,
+            self.valor_total_txt,
+            "",  # texto en Fotografías (no lo usamos)
+        ]
+
+
+class FILAS_INFORME:
+    """
+    Etapa de pre-formateo compartida por CREATE_PDF_V1 y CREATE_EXCEL_RESUME.
+
+    Convierte un DataFrame de actividades en una lista de FILA_ACTIVIDAD
+    haciendo cada conversión UNA vez por columna (fechas a texto, montos con
+    separador de miles, textos con str) en lugar de fila por fila con
+    iterrows(), que además empaqueta cada fila en una Series y pierde los dtypes.
+    """
+
+    # ------------------------------------------------------------------
+    # Conversiones por columna
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _por_unicos(serie: pd.Series, funcion) -> list:
+        """
+        Aplica `funcion` solo a los valores distintos de la columna (los
+        precios, zonas y unidades se repiten mucho) y reparte el resultado.
+        """
+        valores = serie.tolist()
+        mapa = {}
+        for valor in valores:
+            if valor not in mapa:
+                mapa[valor] = funcion(valor)
+        return [mapa[v] for v in valores]
+
+    @staticmethod
+    def _moneda(valor) -> str:
+        """1234567.0 -> '1.234.567'"""
+        return f"{float(valor):,.0f}".replace(",", ".")
+
+    @classmethod
+    def fechas_texto(cls, serie: pd.Series, formato: str, defecto: str = "") -> list:
+        """
+        Fechas como texto con `formato`. Los textos se respetan (sin espacios
+        alrededor) y lo que no es fecha toma `defecto`.
+        """
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            # Se formatea cada fecha distinta una vez (un mes tiene ~30)
+            codigos, unicas = pd.factorize(serie)
+            textos = unicas.strftime(formato).tolist() + [defecto]   # código -1 (NaT) -> defecto
+            return [textos[c] for c in codigos]
+
+        def _una(f):
+            if isinstance(f, str):
+                return f.strip()
+            try:
+                return f.strftime(formato)
+            except Exception:
+                return defecto
+
+        return cls._por_unicos(serie, _una)
+
+    @classmethod
+    def montos_texto(cls, serie: pd.Series) -> list:
+        return cls._por_unicos(serie, cls._moneda)
+
+    # ------------------------------------------------------------------
+    # API
+    # ------------------------------------------------------------------
+    @classmethod
+    def formatear(cls, df: pd.DataFrame, fecha_defecto=None) -> list:
+        """
+        Lista de FILA_ACTIVIDAD en el orden de `df`.
+
+        - fecha_defecto: fecha (date/Timestamp) que se usa en los textos del
+          PDF cuando la FECHA de una fila falta o no es válida.
+        """
+        n = len(df)
+        if n == 0:
+            return []
+
+        # Columnas ausentes se tratan como texto vacío (igual que la hoja BD del Excel)
+        def col(nombre):
+            return df[nombre] if nombre in df.columns else pd.Series([""] * n, index=df.index, dtype=object)
+
+        defecto_pdf = fecha_defecto.strftime("%d-%m-%Y") if fecha_defecto is not None else ""
+
+        fecha = col("FECHA")
+        fechas = pd.to_datetime(fecha, errors="coerce")
+        zona = col("ZONA")
+        descripcion = col("DESCRIPCION")
+        unidad = col("UNIDAD_MEDIDA")
+        cantidad = col("CANTIDAD")
+        # Montos en texto ("$1,200") se interpretan; los numéricos pasan directo
+        v_unit = PARSEAR_MONEDA.serie(col("VALOR_UNITARIO")).astype(float)
+        v_total = PARSEAR_MONEDA.serie(col("VALOR_TOTAL")).astype(float)
+
+        columnas = [
+            col("ID_ACTIVIDAD").tolist(),
+            fechas.dt.date.tolist(),
+            cls.fechas_texto(fecha, "%d-%m-%Y", defecto_pdf),
+            cls.fechas_texto(fechas, "%d/%m/%Y"),
+            zona.tolist(),
+            col("ACTIVIDAD").tolist(),
+            descripcion.tolist(),
+            unidad.tolist(),
+            cantidad.tolist(),
+            v_unit.tolist(),
+            v_total.tolist(),
+            zona.astype(str).tolist(),
+            descripcion.astype(str).tolist(),
+            unidad.astype(str).tolist(),
+            cantidad.astype(str).tolist(),
+            cls.montos_texto(v_unit),
+            cls.montos_texto(v_total),
+        ]
+        return [FILA_ACTIVIDAD(*valores) for valores in zip(*columnas)]
@@ -1,66 +1,30 @@
 import pandas as pd
 
+from modules.AGREGADOS_INFORME import AGREGADOS_INFORME
+
 class GENERATE_GENERAL_RESUME:
     """
     Clase que recibe un DataFrame de actividades de mantenimiento y 
     genera un texto resumen general con métricas automáticas.
     """
 
-    def __init__(self, df: pd.DataFrame):
-        self.df = df.copy()
-        self._limpiar_valores()
+    def __init__(self, df: pd.DataFrame, agregados: AGREGADOS_INFORME = None):
+        """
+        - agregados: AGREGADOS_INFORME ya calculado para `df` (por ejemplo,
+          DATAFRAMES_ACTIVIDADES_SPRBUN.get_agregados()); si no se pasa, se
+          calcula aquí.
+        """
+        self.df = df
+        self.agregados = agregados if agregados is not None else AGREGADOS_INFORME(df)
         self.metricas = self._calcular_metricas()
 
-    # ----------------------------------------------------
-    # LIMPIEZA DE VALORES MONETARIOS
-    # ----------------------------------------------------
-    def _limpiar_valores(self):
-        if "VALOR_TOTAL" in self.df.columns:
-            self.df["VALOR_TOTAL_LIMPIO"] = (
-                self.df["VALOR_TOTAL"]
-                .astype(str)
-                .str.replace("$", "", regex=False)
-                .str.replace(",", "", regex=False)
-                .str.replace(" ", "", regex=False)
-            )
-            self.df["VALOR_TOTAL_LIMPIO"] = pd.to_numeric(
-                self.df["VALOR_TOTAL_LIMPIO"], errors="coerce"
-            )
-        else:
-            self.df["VALOR_TOTAL_LIMPIO"] = 0
-
     # ----------------------------------------------------
     # CÁLCULO DE MÉTRICAS DEL DATAFRAME
     # ----------------------------------------------------
     def _calcular_metricas(self):
-        metricas = {}
-
-        # Total de actividades
-        metricas["total_actividades"] = len(self.df)
-
-        # Total de zonas registradas
-        metricas["total_zonas"] = self.df["ZONA"].nunique()
-
-        # Zonas principales (top 3)
-        zonas_top = (
-            self.df["ZONA"]
-            .value_counts()
-            .head(3)
-            .index
-            .tolist()
-        )
-        metricas["zonas_principales"] = ", ".join(zonas_top)
-
-        # Actividades HIDROSANITARIAS
-        metricas["actividades_hidrosanitarias"] = \
-            self.df[self.df["TIPO_ACT"] == "HIDROSANITARIO"].shape[0]
-
-        # Actividades CUBIERTAS (coincidencia parcial)
-        mask_cub = self.df["TIPO_ACT"].astype(str).str.contains("CUB", case=False, na=False)
-        metricas["actividades_cubiertas"] = self.df[mask_cub].shape[0]
-
-        # Valor económico total
-        metricas["valor_global"] = self.df["VALOR_TOTAL_LIMPIO"].sum()
+        # Total de actividades, zonas (y top 3), hidrosanitarias, cubiertas
+        # y valor económico total: salen de la pasada única de AGREGADOS_INFORME
+        metricas = self.agregados.metricas()
 
         # Resultado general genérico (puedes reemplazarlo luego si quieres)
         metricas["resultado_general"] = (
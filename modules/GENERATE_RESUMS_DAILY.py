@@ -1,33 +1,207 @@
 import pandas as pd
-from google import genai
-import os 
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_exponential
+
+from modules.CACHE_RESUMENES_LLM import CACHE_RESUMENES_LLM
+from modules.PROMPT_RESUMEN import PROMPT_RESUMEN
+
+
+class _TokenBucket:
+    """
+    Limitador de tasa tipo token bucket (seguro entre hilos).
+
+    Se recargan `tasa_por_segundo` fichas por segundo hasta `capacidad`;
+    cada petición toma una ficha y, si no hay, espera a que se recargue.
+    """
+
+    def __init__(self, tasa_por_segundo: float, capacidad: int):
+        self.tasa = tasa_por_segundo
+        self.capacidad = capacidad
+        self.fichas = float(capacidad)
+        self.ultimo = time.monotonic()
+        self.lock = threading.Lock()
+
+    def tomar(self):
+        while True:
+            with self.lock:
+                ahora = time.monotonic()
+                self.fichas = min(self.capacidad, self.fichas + (ahora - self.ultimo) * self.tasa)
+                self.ultimo = ahora
+                if self.fichas >= 1:
+                    self.fichas -= 1
+                    return
+                espera = (1 - self.fichas) / self.tasa
+            time.sleep(espera)
+
+
+def _es_reintentable(error: BaseException) -> bool:
+    """
+    Reintenta solo respuestas 429 / 5xx de la API y errores de conexión o
+    de tiempo de espera. Lo demás (400, 403, respuestas vacías, errores de
+    programación como TypeError o KeyError) falla de inmediato.
+    """
+    codigo = getattr(error, "code", None)
+    if isinstance(codigo, int):
+        return codigo == 429 or 500 <= codigo < 600
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+    # httpx (lo usa google.genai) sin importarlo aquí: TransportError cubre
+    # conexión rechazada, timeouts y cortes de red
+    return any(c.__module__.startswith("httpx") and c.__name__ == "TransportError"
+               for c in type(error).__mro__)
+
+
 class GenerateText:
     """
     Clase para interactuar con la API de Gemini y generar resúmenes
     de reportes de mantenimiento, utilizando la columna ZONA como contexto.
     """
 
-    def __init__(self):
+    MODELO = "gemini-2.5-flash"  # Modelo ideal para tareas de texto y resumen
+
+    def __init__(
+        self,
+        client=None,
+        max_concurrencia: int = 4,
+        peticiones_por_minuto: int = 60,
+        max_reintentos: int = 4,
+        cache: Optional[CACHE_RESUMENES_LLM] = None,
+        usar_cache: bool = True,
+        presupuesto_tokens: int = PROMPT_RESUMEN.PRESUPUESTO_DEFAULT,
+    ):
         """
-        Inicializa el cliente de la API de Gemini. 
+        Inicializa el cliente de la API de Gemini.
         Requiere que la variable de entorno 'GEMINI_API_KEY' esté cargada.
+
+        - client: cliente ya creado (por ejemplo, uno falso para pruebas).
+          Debe exponer `client.models.generate_content(model=..., contents=[...])`.
+        - max_concurrencia: peticiones simultáneas a la API, contando las de
+          los bloques de los días grandes (un semáforo compartido en
+          _llamar_modelo; los hilos de días y de bloques solo esperan).
+        - peticiones_por_minuto: límite de tasa compartido por todos los hilos.
+        - max_reintentos: intentos por día ante errores 429/5xx o de red.
+        - cache / usar_cache: caché de respuestas por hash de modelo + prompt
+          (por defecto CACHE_RESUMENES_LLM en BD/CACHE). Con usar_cache=False
+          siempre se llama a la API.
+        - presupuesto_tokens: tamaño máximo estimado de cada petición; los
+          días más grandes se resumen por bloques (ver PROMPT_RESUMEN).
         """
-        try:
-            # El cliente busca automáticamente la clave en el entorno
-            self.client = genai.Client()
-            # print("🤖 Cliente de Gemini inicializado.")
-        except Exception as e:
-            # Si la clave no está, lanzamos un error claro
-            raise ConnectionError(
-                "No se pudo inicializar el cliente de Gemini. "
-                "Asegúrate de que 'GEMINI_API_KEY' esté configurada y sea válida."
-            ) from e
+        if client is not None:
+            self.client = client
+        else:
+            try:
+                # google.genai (con httpx y pydantic) es lento de importar: solo
+                # se carga cuando de verdad hay que llamar a la API
+                from google import genai
+
+                # El cliente busca automáticamente la clave en el entorno
+                self.client = genai.Client()
+                # print("🤖 Cliente de Gemini inicializado.")
+            except Exception as e:
+                # Si la clave no está, lanzamos un error claro
+                raise ConnectionError(
+                    "No se pudo inicializar el cliente de Gemini. "
+                    "Asegúrate de que 'GEMINI_API_KEY' esté configurada y sea válida."
+                ) from e
+
+        self.max_concurrencia = max_concurrencia
+        self.max_reintentos = max_reintentos
+        self.presupuesto_tokens = presupuesto_tokens
+        self._limitador = _TokenBucket(
+            tasa_por_segundo=peticiones_por_minuto / 60,
+            capacidad=max(1, max_concurrencia),
+        )
+        # El token bucket limita la tasa; esto, cuántas peticiones hay en vuelo
+        self._en_vuelo = threading.BoundedSemaphore(max(1, max_concurrencia))
+
+        if cache is None and usar_cache:
+            cache = CACHE_RESUMENES_LLM()
+        self.cache = cache
+
+    # ------------------------------------------------------------------
+    # Construcción del prompt
+    # ------------------------------------------------------------------
+    def _plan(self, df: pd.DataFrame) -> PROMPT_RESUMEN:
+        """Descripciones del día sin duplicados y con el presupuesto de tokens."""
+        return PROMPT_RESUMEN(df, presupuesto_tokens=self.presupuesto_tokens)
+
+    def _resumir_dia(self, plan: PROMPT_RESUMEN) -> str:
+        """
+        Resumen de un día. Si cabe en el presupuesto es una sola petición; si
+        no, se resume cada bloque en paralelo y los parciales se unen en el
+        resumen final (varios niveles si hace falta).
+        """
+        if plan.cabe():
+            return self._resumir_prompt(plan.prompt_dia())
+
+        prompts = plan.prompts_bloques()
+        print(f"✂️ {plan.n_descripciones} descripciones ({len(plan.descripciones)} distintas) "
+              f"superan ~{plan.presupuesto_tokens} tokens: se resumen en {len(prompts)} bloques.")
+        if plan.recortadas:
+            print(f"⚠️ {plan.recortadas} descripciones no caben ni solas en un bloque: se recortan con '[…]'.")
+        while True:
+            parciales = self._resumir_varios(prompts)
+            if not all(isinstance(t, str) and t.strip() for t in parciales):
+                raise ValueError("Gemini devolvió un resumen parcial vacío.")
+            prompts = plan.prompts_reduccion(parciales)
+            if len(prompts) == 1:
+                return PROMPT_RESUMEN.recortar(self._resumir_prompt(prompts[0]))
+
+    def _resumir_varios(self, prompts: list) -> list:
+        """Respuestas de varios prompts, en paralelo y en el mismo orden."""
+        if len(prompts) == 1:
+            return [self._resumir_prompt(prompts[0])]
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_concurrencia, len(prompts)))) as pool:
+            return list(pool.map(self._resumir_prompt, prompts))
 
+    def _resumir_prompt(self, prompt: str) -> str:
+        """Respuesta para un prompt: de la caché si ya existe, si no, de Gemini."""
+        if self.cache is not None:
+            texto = self.cache.obtener(self.MODELO, prompt)
+            if texto is not None:
+                return texto
+
+        texto = self._llamar_modelo(prompt)
+
+        if self.cache is not None:
+            self.cache.guardar(self.MODELO, prompt, texto)
+        return texto
+
+    def _llamar_modelo(self, prompt: str) -> str:
+        """
+        Una llamada a Gemini respetando el límite de tasa y el de peticiones
+        simultáneas, con reintentos y backoff (la espera entre reintentos no
+        ocupa un lugar del semáforo).
+        """
+        for intento in Retrying(
+            stop=stop_after_attempt(self.max_reintentos),
+            wait=wait_exponential(multiplier=1, min=1, max=30),
+            retry=retry_if_exception(_es_reintentable),
+            reraise=True,
+        ):
+            with intento:
+                with self._en_vuelo:
+                    self._limitador.tomar()
+                    response = self.client.models.generate_content(
+                        model=self.MODELO,
+                        contents=[prompt]
+                    )
+                texto = response.text
+                # Respuesta bloqueada (seguridad) o sin candidatos: es un error, no un resumen
+                if not isinstance(texto, str) or not texto.strip():
+                    raise ValueError("Gemini devolvió una respuesta vacía.")
+                return texto
+
+    # ------------------------------------------------------------------
+    # API pública
+    # ------------------------------------------------------------------
     def generate_summary(self, df: pd.DataFrame) -> Optional[str]:
         """
-        Genera un resumen de la columna 'DESCRIPCION', añadiendo 
+        Genera un resumen de la columna 'DESCRIPCION', añadiendo
         el contexto de las ubicaciones de la columna 'ZONA'.
 
         Args:
@@ -38,66 +212,70 @@ class GenerateText:
         """
         if df.empty:
             return "El DataFrame está vacío. No hay descripciones para resumir."
-            
+
         if 'DESCRIPCION' not in df.columns or 'ZONA' not in df.columns:
             return "ERROR: El DataFrame debe contener las columnas 'DESCRIPCION' y 'ZONA'."
-            
-        # --- 1. Preparar el Contexto de las Zonas ---
-        # Obtener las zonas únicas para dar contexto al modelo
-        zonas_unicas = df['ZONA'].astype(str).unique()
-        zonas_str = ", ".join(zonas_unicas)
-
-        # --- 2. Preparar el Texto Completo de Descripciones ---
-        # Unir todas las descripciones en una sola cadena para el modelo
-        descripciones_series = df['DESCRIPCION'].dropna()
-        texto_descripciones = '\n---\n'.join(descripciones_series.astype(str))
-
-        # --- 3. Definir el Prompt (Instrucción) ---
-        prompt_instruccion = f"""
-        **INSTRUCCIÓN:**
-        A continuación, se te proporcionarán varias descripciones de mantenimiento y reportes, 
-        separadas por el delimitador '---'.
-
-        Estas descripciones están asociadas a las siguientes ubicaciones (Zonas): **{zonas_str}**.
-        Tu tarea es generar un resumen único de maximo 150 palabras, coherente y conciso de estos reportes y debe que la información es un resumen de los reportes de las zonas listadas ({zonas_str}) ignora los nan. 
-        El resumen debe estar en español.
-
-        --- DESCRIPCIONES DE ENTRADA ---
-        {texto_descripciones}
-        """
 
-        # --- 4. Llamar a la API de Gemini ---
-        print(f"\n⏳ Enviando {len(descripciones_series)} descripciones a Gemini para resumen de zonas: {zonas_str}...")
-        
+        plan = self._plan(df)
+
+        # --- Llamar a la API de Gemini ---
+        print(f"\n⏳ Enviando {plan.n_descripciones} descripciones a Gemini para resumen de zonas: {plan.zonas_str}...")
+
         try:
-            response = self.client.models.generate_content(
-                model="gemini-2.5-flash",  # Modelo ideal para tareas de texto y resumen
-                contents=[prompt_instruccion]
-            )
-            
-            return response.text
+            return self._resumir_dia(plan)
 
         except Exception as e:
             print(f"❌ Error al llamar a la API de Gemini durante el resumen: {e}")
             return None
-        
-
-
-
-
-
-
-
-
-
-
-
-
 
+    def generate_summaries(self, dfs_por_fecha: dict) -> tuple:
+        """
+        Genera en paralelo los resúmenes de varios días.
 
+        Args:
+            dfs_por_fecha: {fecha: DataFrame del día} (por ejemplo, lo que
+                produce DATAFRAMES_ACTIVIDADES_SPRBUN.iter_days).
 
+        Returns:
+            (resumenes, errores):
+            - resumenes: {fecha: texto} de los días que se resumieron.
+            - errores: {fecha: excepción} de los días que fallaron
+              (sin actividades, columnas faltantes, respuesta vacía o
+              bloqueada, o error de la API después de agotar los reintentos).
+        """
+        resumenes = {}
+        errores = {}
+        pendientes = {}
 
+        for fecha, df in dfs_por_fecha.items():
+            if df is None or df.empty:
+                errores[fecha] = ValueError("No hay actividades para resumir.")
+            elif 'DESCRIPCION' not in df.columns or 'ZONA' not in df.columns:
+                errores[fecha] = ValueError(
+                    "El DataFrame debe contener las columnas 'DESCRIPCION' y 'ZONA'."
+                )
+            else:
+                pendientes[fecha] = self._plan(df)
 
+        if not pendientes:
+            return resumenes, errores
 
+        print(f"\n⏳ Enviando {len(pendientes)} días a Gemini (máx. {self.max_concurrencia} en paralelo)...")
 
+        with ThreadPoolExecutor(max_workers=max(1, self.max_concurrencia)) as pool:
+            futuros = {
+                fecha: pool.submit(self._resumir_dia, plan)
+                for fecha, plan in pendientes.items()
+            }
+            for fecha, futuro in futuros.items():
+                try:
+                    resumenes[fecha] = futuro.result()
+                except Exception as e:
+                    errores[fecha] = e
 
+        if errores:
+            print(f"⚠️ {len(errores)} días sin resumen.")
+        if self.cache is not None:
+            e = self.cache.estadisticas()
+            print(f"🗃️ Caché de resúmenes: {e['aciertos']} aciertos / {e['fallos']} fallos")
+        return resumenes, errores
@@ -1,114 +1,159 @@
 import pandas as pd
-from datetime import datetime
-import unicodedata
+
+from modules.AGREGADOS_INFORME import AGREGADOS_INFORME
+from modules.CACHE_EXCEL import CACHE_EXCEL
+from modules.INSTRUMENTACION import INSTRUMENTACION
+from modules.LECTOR_BD import LECTOR_BD
+from modules.LIMPIAR_TEXTO import LIMPIAR_TEXTO
+from modules.PARSEAR_MONEDA import PARSEAR_MONEDA
+from modules.STORE_ACTIVIDADES import STORE_ACTIVIDADES
 
 class DATAFRAMES_ACTIVIDADES_SPRBUN:
 
-    def __init__(self, ruta_excel):
+    # Columnas numéricas (montos pueden venir como texto "$1,200")
+    COLUMNAS_NUMERICAS = ["CANTIDAD", "VALOR_UNITARIO", "VALOR_TOTAL"]
 
-        self.ruta_excel = ruta_excel
-        self.df_excel = pd.ExcelFile(ruta_excel)
-        self.df_actividades = pd.read_excel(self.df_excel, sheet_name='BD')
-       
-    def get_dataframe_diario(self, fecha):
-        df_actividades_diario = self.df_actividades[self.df_actividades['FECHA'] == fecha]
-        return df_actividades_diario
+    # Columnas de texto con pocos valores distintos
+    COLUMNAS_CATEGORIA = ["ZONA", "UNIDAD_MEDIDA", "TIPO_ACT"]
 
-    def _to_latin1(self, text):
-        """
-        Asegura que el texto sea compatible con latin-1
-        (core fonts de FPDF), reemplazando guiones largos,
-        comillas curvas, viñetas, etc., y eliminando lo que
-        no se pueda codificar.
+    def __init__(self, ruta_excel, usar_cache=True, filtrar_al_leer=False,
+                 ruta_store=None, rango_fechas=None):
         """
-        if text is None:
-            return ""
+        Carga la hoja 'BD' del libro de actividades.
 
-        text = str(text)
+        Con usar_cache=True la hoja ya parseada se guarda en una caché binaria
+        junto al libro (ver CACHE_EXCEL) y solo se vuelve a leer el .xlsx
+        cuando el archivo cambia (tamaño o fecha de modificación).
 
-        reemplazos = {
-            "–": "-",   # en dash
-            "—": "-",   # em dash
-            "“": '"',
-            "”": '"',
-            "’": "'",
-            "´": "'",
-            "•": "-",   # viñetas
-        }
+        Con filtrar_al_leer=True la hoja se lee en streaming (ver LECTOR_BD)
+        con solo las columnas necesarias y las filas ID_ITEM == 3.1, de modo
+        que el resto del histórico nunca llega a ser un DataFrame.
 
-        for raro, simple in reemplazos.items():
-            text = text.replace(raro, simple)
+        Con ruta_store, las filas nuevas del libro se importan a un almacén
+        SQLite particionado por mes (ver STORE_ACTIVIDADES) y, si además se
+        pasa rango_fechas=(inicio, fin), solo se cargan las actividades de
+        ese rango (ej. del 26 del mes anterior al 25 del mes actual).
+        """
 
-        # filtro final: quitar cualquier cosa fuera de latin-1
-        text = text.encode("latin-1", "ignore").decode("latin-1")
-        return text
+        self.ruta_excel = ruta_excel
 
-    @staticmethod
-    def limpiar_texto_pdf(texto):
+        if filtrar_al_leer:
+            lector = LECTOR_BD(ruta_excel, hoja='BD')
+            leer = lambda: lector.leer(columnas=LECTOR_BD.COLUMNAS_NECESARIAS, id_item=3.1)
+            variante = "item_3.1"
+        else:
+            leer = lambda: pd.read_excel(ruta_excel, sheet_name='BD')
+            variante = ""
+
+        with INSTRUMENTACION.etapa("actividades.carga") as etapa:
+            if ruta_store is not None:
+                # El almacén ya hace de caché: el libro solo se lee si cambió
+                store = STORE_ACTIVIDADES(ruta_store)
+                store.ingerir(ruta_excel, leer, variante=variante)
+                if rango_fechas is not None:
+                    self.df_actividades = store.cargar_rango(*rango_fechas)
+                else:
+                    self.df_actividades = store.cargar_todo()
+            elif usar_cache:
+                self.df_actividades = CACHE_EXCEL(ruta_excel, hoja='BD', variante=variante).cargar(leer)
+            else:
+                self.df_actividades = leer()
+            etapa.contar(filas=len(self.df_actividades))
+
+        # Partición por día y agregados (se construyen la primera vez que se necesitan)
+        self._indice_diario = None
+        self._agregados = None
+
+    @classmethod
+    def desde_dataframe(cls, df: pd.DataFrame, ruta_excel=None):
         """
-        Limpia de forma profunda caracteres que FPDF (latin-1) no soporta.
-        Ideal para textos que vienen de ChatGPT, Word, WhatsApp o correos.
+        Envuelve un DataFrame ya cargado (y limpio) sin volver a leer el libro.
+        Sirve para trabajar por periodos sobre una sola carga.
+        """
+        instancia = cls.__new__(cls)
+        instancia.ruta_excel = ruta_excel
+        instancia.df_actividades = df
+        instancia._indice_diario = None
+        instancia._agregados = None
+        return instancia
+
+    def periodo(self, inicio, fin):
         """
+        Actividades entre `inicio` y `fin` (días completos, ambos incluidos)
+        como otra instancia, con su propia partición diaria y agregados.
+        Usar después de get_dataframe_actividades().
+        """
+        fechas = pd.to_datetime(self.df_actividades['FECHA'], errors='coerce').dt.normalize()
+        en_rango = fechas.between(pd.Timestamp(inicio).normalize(), pd.Timestamp(fin).normalize())
+        return self.desde_dataframe(
+            self.df_actividades[en_rango.to_numpy()].reset_index(drop=True), self.ruta_excel
+        )
+
+    # ------------------------------------------------------------------
+    # Partición de actividades por fecha
+    # ------------------------------------------------------------------
+    def _construir_indice_diario(self):
+        """
+        Agrupa UNA sola vez las actividades por fecha normalizada (sin hora)
+        y guarda un diccionario {Timestamp: DataFrame del día}.
+        """
+        fechas = pd.to_datetime(self.df_actividades['FECHA'], errors='coerce').dt.normalize()
 
-        if pd.isna(texto):
-            return ""
-
-        texto = str(texto)
-
-        # 1️⃣ ELIMINAR saltos raros, espacios invisibles, caracteres ocultos
-        textos_raros = [
-            "\u200b",  # zero-width space
-            "\u200c",  # non-joiner
-            "\u200d",  # joiner
-            "\ufeff",  # BOM
-            "\xa0",    # espacio duro
-            "\t",      # tabulaciones
-            "\r",      # retorno de carro
-        ]
-        for t in textos_raros:
-            texto = texto.replace(t, " ")
-
-        # 2️⃣ REEMPLAZOS DE CARACTERES PROBLEMÁTICOS
-        reemplazos = {
-            "–": "-",    # en dash
-            "—": "-",    # em dash
-            "―": "-",    # horizontal bar
-            "•": "-",    # viñetas
-            "∙": "-",    # viñetas pequeñas
-            "·": "-",    # bullet punto medio
-            "“": '"',
-            "”": '"',
-            "„": '"',
-            "‟": '"',
-            "’": "'",
-            "‘": "'",
-            "´": "'",
-            "`": "'",
-            "¨": "",
-            "…": "...",  # puntos suspensivos Unicode
-            "¶": "",     # símbolo de párrafo
-            "°": "°",    # mantenemos grados pero normalizados
+        self._indice_diario = {
+            fecha: grupo
+            for fecha, grupo in self.df_actividades.groupby(fechas, sort=False)
         }
+        self._df_vacio = self.df_actividades.iloc[0:0]
 
-        for raro, simple in reemplazos.items():
-            texto = texto.replace(raro, simple)
+    def get_dataframe_diario(self, fecha):
+        """
+        Devuelve las actividades de un día. La búsqueda es O(1) sobre la
+        partición por fecha construida en _construir_indice_diario().
+        """
+        if self._indice_diario is None:
+            self._construir_indice_diario()
 
-        # 3️⃣ REMOVER EMOJIS Y SÍMBOLOS NO LATIN-1
-        import re
-        texto = re.sub(r'[^\x00-\xFF]', '', texto)
+        clave = pd.Timestamp(fecha).normalize()
+        return self._indice_diario.get(clave, self._df_vacio)
 
-        # 4️⃣ NORMALIZAR UNICODE → quitar diacríticos raros
-        import unicodedata
-        texto = unicodedata.normalize("NFKD", texto)
+    def iter_days(self, fechas):
+        """
+        Recorre varias fechas y produce (fecha, df_dia) para cada una,
+        en el mismo orden recibido. Los días sin actividades producen
+        un DataFrame vacío con las mismas columnas.
+        """
+        for fecha in fechas:
+            yield fecha, self.get_dataframe_diario(fecha)
 
-        # 5️⃣ FILTRO FINAL: eliminar cualquier cosa fuera de latin-1
-        texto = texto.encode("latin-1", "ignore").decode("latin-1")
+    def get_agregados(self) -> AGREGADOS_INFORME:
+        """
+        Subtotales por día, resumen por unidad y métricas generales del
+        DataFrame actual, calculados en una pasada y guardados para que el
+        PDF, el Excel y el resumen general no vuelvan a recorrerlo.
+        """
+        if self._agregados is None:
+            self._agregados = AGREGADOS_INFORME(self.df_actividades)
+        return self._agregados
 
-        # 6️⃣ QUITAR ESPACIOS EXTRA GENERADOS
-        texto = " ".join(texto.split())
+    def _to_latin1(self, text):
+        """
+        Asegura que el texto sea compatible con latin-1
+        (core fonts de FPDF), reemplazando guiones largos,
+        comillas curvas, viñetas, etc., y eliminando lo que
+        no se pueda codificar.
+        """
+        return LIMPIAR_TEXTO.latin1(text)
 
-        return texto
+    @staticmethod
+    def limpiar_texto_pdf(texto):
+        """
+        Limpia de forma profunda caracteres que FPDF (latin-1) no soporta.
+        Ideal para textos que vienen de ChatGPT, Word, WhatsApp o correos.
+        Para columnas completas usar LIMPIAR_TEXTO.serie_pdf (vectorizado).
+        """
+        return LIMPIAR_TEXTO.pdf(texto)
 
+    @INSTRUMENTACION.medir("actividades.limpieza")
     def get_dataframe_actividades(self) -> pd.DataFrame:
         """
         Limpia directamente self.df_actividades sin crear copias.
@@ -116,6 +161,10 @@ class DATAFRAMES_ACTIVIDADES_SPRBUN:
         Además, filtra solo las filas con ID_ITEM == 3.1
         """
 
+        # La partición diaria y los agregados anteriores dejan de corresponder al DataFrame limpio
+        self._indice_diario = None
+        self._agregados = None
+
         # -----------------------------
         # 1. Limpiar DESCRIPCION
         # -----------------------------
@@ -123,10 +172,8 @@ class DATAFRAMES_ACTIVIDADES_SPRBUN:
 
         for col in columnas_a_liminar:
             if col in self.df_actividades.columns:
-                self.df_actividades[col] = (
-                    self.df_actividades[col]
-                    .astype(str)
-                    .apply(self.limpiar_texto_pdf)
+                self.df_actividades[col] = LIMPIAR_TEXTO.serie_pdf(
+                    self.df_actividades[col].astype(str)
                 )
 
         # -----------------------------
@@ -149,5 +196,42 @@ class DATAFRAMES_ACTIVIDADES_SPRBUN:
                 f"Columnas disponibles: {self.df_actividades.columns.tolist()}"
             )
 
+        # -----------------------------
+        # 3. Tipar columnas
+        # -----------------------------
+        self._tipar_columnas()
+
+        INSTRUMENTACION.contar(filas=len(self.df_actividades))
         return self.df_actividades
 
+    def _tipar_columnas(self):
+        """
+        Deja los montos y cantidades como números y las columnas repetitivas
+        como category, para que el PDF, el Excel y los resúmenes no tengan
+        que limpiar ni convertir nada fila por fila.
+
+        - Columnas ya numéricas: no se tocan salvo reducir enteros (int64 -> int32...).
+        - Columnas de texto: se interpretan con PARSEAR_MONEDA; si todos los
+          valores resultan enteros y no falta ninguno, se guardan como entero.
+        - Los float se mantienen en float64: float32 perdería precisión en
+          montos de millones y cambiaría los textos del PDF.
+        """
+        df = self.df_actividades
+
+        for col in self.COLUMNAS_NUMERICAS:
+            if col not in df.columns:
+                continue
+            serie = df[col]
+            era_texto = not pd.api.types.is_numeric_dtype(serie)
+            if era_texto:
+                serie = PARSEAR_MONEDA.serie(serie)
+            if pd.api.types.is_integer_dtype(serie) or (
+                era_texto and serie.notna().all() and (serie % 1 == 0).all()
+            ):
+                serie = pd.to_numeric(serie, downcast="integer")
+            df[col] = serie
+
+        for col in self.COLUMNAS_CATEGORIA:
+            if col in df.columns and not isinstance(df[col].dtype, pd.CategoricalDtype):
+                df[col] = df[col].astype("category")
+
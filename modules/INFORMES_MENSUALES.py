@@ -0,0 +1,380 @@
+import contextlib
+import hashlib
+import io
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import pandas as pd
+
+from modules.AGREGADOS_INFORME import AGREGADOS_INFORME
+from modules.CATALOGO_FOTOS import CATALOGO_FOTOS
+from modules.CONFIG_INFORMES import CONFIG_INFORMES
+from modules.GENERATE_GENERAL_RESUME import GENERATE_GENERAL_RESUME
+from modules.GET_DATAFRAMES import DATAFRAMES_ACTIVIDADES_SPRBUN
+from modules.INSTRUMENTACION import INSTRUMENTACION
+from modules.MENU import AdminFechas
+from modules.PIPELINE import PIPELINE
+from modules.REPOSITORIO_RESUMENES import REPOSITORIO_RESUMENES
+
+
+# Instancia ya cargada que heredan los procesos hijos (fork, copia en escritura)
+_INFORMES_COMPARTIDOS = None
+
+
+def _generar_mes_proceso(anio, mes, solo=None):
+    """
+    Trabajo de un proceso del backfill: genera un mes con los datos que el
+    proceso padre ya cargó. Devuelve (anio, mes, rutas o None, error, segundos).
+    """
+    inicio = time.perf_counter()
+    # Los mensajes de cada mes se mezclarían entre procesos; el padre informa el avance
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            rutas = _INFORMES_COMPARTIDOS.generar_mes(anio, mes, solo)
+            error = None
+        except Exception as e:
+            rutas, error = None, f"{type(e).__name__}: {e}"
+    return anio, mes, rutas, error, time.perf_counter() - inicio
+
+
+class INFORMES_MENSUALES:
+    """
+    Genera el PDF y el Excel de uno o varios meses en un solo proceso.
+
+    Lo costoso se carga UNA vez para todos los meses pedidos, y solo si
+    algún mes lo necesita:
+    - las actividades del periodo completo (libro/almacén),
+    - el catálogo de fotos,
+    - los resúmenes diarios del periodo.
+
+    Cada mes es un PIPELINE de etapas sobre su rango 26 → 25:
+
+        cargar → limpiar → agregar ─┬─→ pdf    (+ resumenes, fotos)
+                                    └─→ excel  (+ resumenes)
+
+    El PDF y el Excel corren a la vez. Las etapas cargar, limpiar, agregar,
+    pdf y excel se guardan en disco (config.dir_memo); si el Excel falla,
+    al repetir solo se rehace el Excel, sin releer el libro ni el PDF.
+    """
+
+    # Cambiar al modificar las etapas: invalida lo guardado en disco
+    VERSION_PIPELINE = 1
+
+    def __init__(self, config: CONFIG_INFORMES = None):
+        self.config = config or CONFIG_INFORMES()
+        self.actividades = None
+        self.catalogo_fotos = None
+        self.resumenes = None
+        self._meses = []
+        self._lock_carga = threading.Lock()
+
+    # ------------------------------------------------------------------
+    # Periodos
+    # ------------------------------------------------------------------
+    @staticmethod
+    def rango_mes(anio: int, mes: int) -> pd.DatetimeIndex:
+        """Días del informe de un mes: del 26 del mes anterior al 25 del mes."""
+        return AdminFechas(anio, mes).rango_fechas_25a25()
+
+    @staticmethod
+    def meses_entre(desde, hasta) -> list:
+        """[(anio, mes), ...] de `desde` a `hasta` (tuplas (anio, mes)), ambos incluidos."""
+        return [(p.year, p.month) for p in pd.period_range(pd.Period(year=desde[0], month=desde[1], freq="M"),
+                                                             pd.Period(year=hasta[0], month=hasta[1], freq="M"))]
+
+    # ------------------------------------------------------------------
+    # Carga única
+    # ------------------------------------------------------------------
+    def cargar(self, meses=None):
+        """
+        Carga actividades (sin limpiar), fotos y resúmenes. Con `meses` solo
+        se leen las actividades de esos periodos (del primer 26 al último 25);
+        sin `meses`, todo el histórico (lo usa meses_faltantes). Devuelve self.
+        """
+        rango = self._cargar_actividades(meses)
+        self._catalogo()
+
+        # Resúmenes de todo el periodo cargado
+        if rango is None:
+            fechas = pd.to_datetime(self.actividades.df_actividades["FECHA"], errors="coerce").dropna()
+            rango = (fechas.min(), fechas.max()) if not fechas.empty else ()
+        self.resumenes = REPOSITORIO_RESUMENES().prefetch(rango)
+        return self
+
+    def meses_con_datos(self) -> list:
+        """Meses (anio, mes) cuyo rango 26 → 25 tiene al menos una actividad."""
+        if self.actividades is None:
+            self.cargar()
+        fechas = pd.to_datetime(self.actividades.df_actividades["FECHA"], errors="coerce").dropna()
+        periodos = fechas.dt.to_period("M")
+        # Del 26 en adelante el día pertenece al informe del mes siguiente
+        periodos = periodos.where(fechas.dt.day <= 25, periodos + 1)
+        return sorted({(p.year, p.month) for p in periodos.unique()})
+
+    def meses_faltantes(self, solo=None) -> list:
+        """Meses con actividades a los que les falta el PDF o el Excel (o solo uno: 'pdf'/'excel')."""
+        def falta(anio, mes):
+            rutas = {"pdf": self.config.ruta_pdf(anio, mes), "excel": self.config.ruta_excel_informe(anio, mes)}
+            return any(not os.path.isfile(ruta) for tipo, ruta in rutas.items() if solo in (None, tipo))
+
+        return [(anio, mes) for anio, mes in self.meses_con_datos() if falta(anio, mes)]
+
+    def _cargar_actividades(self, meses=None):
+        """Lee las actividades de `meses` (o todas). Devuelve el rango pedido o None."""
+        rango = None
+        if meses:
+            rango = (self.rango_mes(*min(meses))[0], self.rango_mes(*max(meses))[-1])
+
+        cfg = self.config
+        print(f"📥 Cargando actividades de {cfg.ruta_excel}")
+        self.actividades = DATAFRAMES_ACTIVIDADES_SPRBUN(
+            cfg.ruta_excel,
+            filtrar_al_leer=True,
+            ruta_store=cfg.ruta_store,
+            rango_fechas=rango if cfg.ruta_store is not None else None,
+        )
+        return rango
+
+    def _actividades(self) -> DATAFRAMES_ACTIVIDADES_SPRBUN:
+        """Actividades de los meses pedidos, leídas una vez aunque las pidan varias etapas a la vez."""
+        with self._lock_carga:
+            if self.actividades is None:
+                self._cargar_actividades(self._meses)
+        return self.actividades
+
+    def _catalogo(self) -> CATALOGO_FOTOS:
+        """Catálogo de fotos, escaneado una sola vez."""
+        with self._lock_carga:
+            if self.catalogo_fotos is None:
+                with INSTRUMENTACION.etapa("fotos.catalogo") as etapa:
+                    self.catalogo_fotos = CATALOGO_FOTOS(revalidar_fotos=self.config.revalidar_fotos)
+                    etapa.contar(actividades=len(self.catalogo_fotos))
+        return self.catalogo_fotos
+
+    # ------------------------------------------------------------------
+    # Etapas de un mes
+    # ------------------------------------------------------------------
+    def _firma_base(self, anio, mes) -> str:
+        """Identifica las entradas del mes: libro (tamaño y fecha), almacén y salidas."""
+        cfg = self.config
+        try:
+            estado = os.stat(cfg.ruta_excel)
+            libro = f"{estado.st_size}:{estado.st_mtime_ns}"
+        except OSError:
+            libro = "?"
+        return "|".join(map(str, [
+            self.VERSION_PIPELINE, os.path.abspath(cfg.ruta_excel), libro, cfg.ruta_store,
+            anio, mes, os.path.abspath(cfg.dir_pdf), os.path.abspath(cfg.dir_excel),
+        ]))
+
+    @staticmethod
+    def _hash(partes) -> str:
+        return hashlib.sha1(repr(list(partes)).encode("utf-8")).hexdigest()
+
+    def pipeline_mes(self, anio: int, mes: int, forzar=False) -> PIPELINE:
+        """Etapas del informe de un mes (ver la descripción de la clase)."""
+        cfg = self.config
+        menu = AdminFechas(anio, mes)
+        fechas_mes = menu.rango_fechas_25a25()
+        nombre_mes = AdminFechas.MESES_NUM_A_NOMBRE[mes]
+
+        def cargar():
+            # Actividades del periodo (26 del mes anterior → 25 del mes actual)
+            return self._actividades().periodo(fechas_mes[0], fechas_mes[-1]).df_actividades
+
+        def limpiar(df):
+            return DATAFRAMES_ACTIVIDADES_SPRBUN.desde_dataframe(df.copy(), cfg.ruta_excel).get_dataframe_actividades()
+
+        def resumenes():
+            # Los del periodo completo ya cargado, o solo los del mes
+            if self.resumenes is not None:
+                return self.resumenes
+            return REPOSITORIO_RESUMENES().prefetch(fechas_mes)
+
+        ids_mes = []
+
+        def fotos(df):
+            ids_mes[:] = df["ID_ACTIVIDAD"].tolist() if "ID_ACTIVIDAD" in df.columns else []
+            return self._catalogo()
+
+        def pdf(df, agregados, repo, catalogo):
+            # fpdf y openpyxl se importan solo en la etapa que los usa (--only excel no carga fpdf)
+            from modules.PDF_PARALELO import PDF_PARALELO
+
+            datos_mes = DATAFRAMES_ACTIVIDADES_SPRBUN.desde_dataframe(df)
+            texto = GENERATE_GENERAL_RESUME(df, agregados).generate_text()
+
+            dias_pdf = []
+            for i, (fecha_dia, df_dia) in enumerate(datos_mes.iter_days(fechas_mes[:-1])):
+                dias_pdf.append(dict(
+                    num_dia=i+1,
+                    anio=anio,
+                    fecha_dia=fecha_dia,
+                    df_dia=df_dia,
+                    descripcion_servicio=repo.get(fecha_dia, "Sin resumen disponible."),
+                    nueva_pagina=True,
+                    total_dia=agregados.subtotal_dia(fecha_dia)
+                ))
+
+            os.makedirs(cfg.dir_pdf, exist_ok=True)
+            ruta_pdf = PDF_PARALELO(max_procesos=cfg.max_procesos, catalogo_fotos=catalogo).generar(
+                dias_pdf,
+                cfg.ruta_pdf(anio, mes),
+                portada=(anio, nombre_mes, menu.nombre_mes_anterior(), fechas_mes, texto),
+            )
+            print(f"✅ PDF generado correctamente en: {ruta_pdf}")
+            return ruta_pdf
+
+        def excel(df, agregados, repo):
+            from modules.CREATE_EXCEL_RESUME import CREATE_EXCEL_RESUME
+
+            ruta_excel = CREATE_EXCEL_RESUME(output_dir=cfg.dir_excel).crear_informe(
+                df,
+                fechas_mes[0],
+                fechas_mes[-1],
+                resumenes=repo,
+                agregados=agregados
+            )
+            print(f"✅ Excel generado correctamente en: {ruta_excel}")
+            return ruta_excel
+
+        # Firmas de las etapas que no se guardan: si cambian, se rehacen PDF/Excel
+        def firma_resumenes(repo):
+            return self._hash((str(f.date()), repo.get(f)) for f in fechas_mes)
+
+        def firma_fotos(catalogo):
+            # Solo las fotos de las actividades del mes (ruta, fecha y tamaño)
+            return self._hash(
+                (i, [(f["ruta"], f["mtime_ns"], f["tamano"]) for f in catalogo.fotos(i)]) for i in ids_mes
+            )
+
+        carpeta = os.path.join(cfg.dir_memo, f"{anio}-{mes:02d}")
+        p = PIPELINE(carpeta_memo=carpeta, firma_base=self._firma_base(anio, mes), forzar=forzar)
+        p.agregar("cargar", cargar, memo=True)
+        p.agregar("limpiar", limpiar, ["cargar"], memo=True)
+        p.agregar("agregar", AGREGADOS_INFORME, ["limpiar"], memo=True)
+        p.agregar("resumenes", resumenes, firma=firma_resumenes)
+        p.agregar("fotos", fotos, ["limpiar"], firma=firma_fotos)
+        p.agregar("pdf", pdf, ["limpiar", "agregar", "resumenes", "fotos"], memo=True, valido=os.path.isfile)
+        p.agregar("excel", excel, ["limpiar", "agregar", "resumenes"], memo=True, valido=os.path.isfile)
+        return p
+
+    # ------------------------------------------------------------------
+    # Generación
+    # ------------------------------------------------------------------
+    @INSTRUMENTACION.medir("mes")
+    def generar_mes(self, anio: int, mes: int, solo=None) -> dict:
+        """
+        Genera el PDF y el Excel de un mes (o solo uno: solo='pdf'/'excel').
+        Devuelve {'pdf': ruta, 'excel': ruta} con lo generado.
+        """
+        if not self._meses:
+            self._meses = [(anio, mes)]
+
+        objetivos = [solo] if solo else ["pdf", "excel"]
+        pipeline = self.pipeline_mes(anio, mes, forzar=self.config.forzar)
+        resultados = pipeline.ejecutar(objetivos)
+        if pipeline.memorizadas:
+            print(f"⏭️ Reutilizado de {pipeline.carpeta_memo}: {', '.join(sorted(pipeline.memorizadas))}")
+        return {nombre: resultados[nombre] for nombre in objetivos}
+
+    def generar(self, meses, solo=None) -> dict:
+        """
+        Genera varios meses con una sola carga de datos (hecha la primera vez
+        que un mes la necesita). Un mes que falla no detiene a los demás.
+        Devuelve {(anio, mes): resultado o excepción}.
+        """
+        meses = sorted(set(meses))
+        if not meses:
+            print("⏭️ No hay meses por generar.")
+            return {}
+
+        if self.actividades is None:
+            self._meses = meses
+
+        resultados = {}
+        inicio = time.perf_counter()
+        for n, (anio, mes) in enumerate(meses, start=1):
+            print(f"\n📄 [{n}/{len(meses)}] Informe {AdminFechas.MESES_NUM_A_NOMBRE[mes].capitalize()} {anio}")
+            try:
+                resultados[(anio, mes)] = self.generar_mes(anio, mes, solo)
+            except Exception as e:
+                print(f"⚠️ Falló el informe {mes:02d}/{anio}: {e}")
+                resultados[(anio, mes)] = e
+
+        self.imprimir_resumen(resultados, time.perf_counter() - inicio)
+        return resultados
+
+    def generar_paralelo(self, meses, procesos=None, solo=None) -> dict:
+        """
+        Backfill: genera muchos meses repartiéndolos entre procesos.
+
+        Los datos se cargan una vez en este proceso y los hijos se crean con
+        fork, así heredan actividades, fotos y resúmenes sin copiarlos ni
+        volver a leer el libro (copia en escritura). Cada hijo dibuja su PDF
+        sin procesos extra. Devuelve {(anio, mes): rutas o RuntimeError}.
+
+        Donde no existe fork (Windows) se genera en serie con generar().
+        """
+        global _INFORMES_COMPARTIDOS
+
+        meses = sorted(set(meses))
+        procesos = min(procesos or os.cpu_count() or 1, len(meses))
+        if procesos <= 1 or "fork" not in multiprocessing.get_all_start_methods():
+            return self.generar(meses, solo)
+
+        if self.actividades is None:
+            self._meses = meses
+            self.cargar(meses)
+
+        # En los hijos el PDF se dibuja en serie: el paralelismo es por mes
+        procesos_pdf = self.config.max_procesos
+        self.config.max_procesos = 1
+        _INFORMES_COMPARTIDOS = self
+
+        print(f"⚡ Backfill de {len(meses)} meses con {procesos} procesos")
+        resultados = {}
+        inicio = time.perf_counter()
+        try:
+            with ProcessPoolExecutor(max_workers=procesos,
+                                     mp_context=multiprocessing.get_context("fork")) as pool:
+                futuros = [pool.submit(_generar_mes_proceso, anio, mes, solo) for anio, mes in meses]
+                for n, futuro in enumerate(as_completed(futuros), start=1):
+                    try:
+                        anio, mes, rutas, error, segundos = futuro.result()
+                    except Exception as e:
+                        # El proceso murió (memoria, señal): no se sabe qué mes era
+                        print(f"⚠️ [{n}/{len(meses)}] Un proceso de trabajo falló: {e}")
+                        continue
+                    if error is None:
+                        resultados[(anio, mes)] = rutas
+                        print(f"✅ [{n}/{len(meses)}] {mes:02d}/{anio} en {segundos:.1f} s")
+                    else:
+                        resultados[(anio, mes)] = RuntimeError(error)
+                        print(f"⚠️ [{n}/{len(meses)}] {mes:02d}/{anio} falló: {error}")
+        finally:
+            _INFORMES_COMPARTIDOS = None
+            self.config.max_procesos = procesos_pdf
+
+        for mes in meses:
+            resultados.setdefault(mes, RuntimeError("el proceso de trabajo terminó sin resultado"))
+
+        self.imprimir_resumen(resultados, time.perf_counter() - inicio)
+        return resultados
+
+    @staticmethod
+    def imprimir_resumen(resultados: dict, segundos: float = None):
+        """Tabla final por mes: ✅ con las rutas generadas o ⚠️ con el error."""
+        fallidos = 0
+        print("\n🗃️ Resultado por mes:")
+        for (anio, mes), resultado in sorted(resultados.items()):
+            if isinstance(resultado, Exception):
+                fallidos += 1
+                print(f"   ⚠️ {mes:02d}/{anio}  {resultado}")
+            else:
+                print(f"   ✅ {mes:02d}/{anio}  {', '.join(os.path.basename(r) for r in resultado.values())}")
+        tiempo = f" en {segundos:.1f} s" if segundos is not None else ""
+        print(f"🗃️ Meses generados: {len(resultados) - fallidos}/{len(resultados)}{tiempo}")
@@ -0,0 +1,330 @@
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource
+except ImportError:   # Windows: sin pico de RSS
+    resource = None
+
+
+class _EtapaNula:
+    """Etapa que no mide nada: la que se usa con la instrumentación apagada."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def contar(self, **conteos):
+        pass
+
+
+_ETAPA_NULA = _EtapaNula()
+
+
+class _Etapa:
+    """Una medición en curso: tiempos, memoria y conteos de una etapa."""
+
+    __slots__ = ("nombre", "conteos", "_t0", "_cpu0", "_pico_tm")
+
+    def __init__(self, nombre, conteos):
+        self.nombre = nombre
+        self.conteos = dict(conteos)
+
+    def contar(self, **conteos):
+        """Suma conteos a la etapa (filas=..., imagenes=..., paginas=...)."""
+        for clave, n in conteos.items():
+            self.conteos[clave] = self.conteos.get(clave, 0) + n
+
+    def __enter__(self):
+        INSTRUMENTACION._entrar(self)
+        self._cpu0 = time.thread_time()
+        self._t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        wall = time.perf_counter() - self._t0
+        cpu = time.thread_time() - self._cpu0
+        INSTRUMENTACION._salir(self, wall, cpu, error=exc[0] is not None)
+        return False
+
+
+class INSTRUMENTACION:
+    """
+    Registro de tiempos y memoria por etapa del informe.
+
+    Uso:
+        with INSTRUMENTACION.etapa("pdf.output") as e:
+            pdf.output(ruta)
+            e.contar(paginas=pdf.page_no())
+
+        @INSTRUMENTACION.medir("excel.crear_informe")
+        def crear_informe(...): ...
+
+    Por cada nombre de etapa se acumulan: llamadas, tiempo real y de CPU,
+    RSS del proceso al terminar, pico de RSS, pico de tracemalloc (memoria
+    de Python asignada durante la etapa) y los conteos (filas, imágenes,
+    páginas...). Las etapas se pueden anidar.
+
+    Está apagada por defecto: etapa() devuelve un objeto vacío compartido y
+    medir() solo revisa un booleano, así que el costo sin activar es casi
+    nulo. Se enciende con activar() (ver --instrumentar en CLI) y el
+    resultado se escribe como JSON con guardar(); con perfil=... además se
+    guarda un volcado de cProfile (abrir con pstats o snakeviz). cProfile
+    solo ve el hilo que lo enciende: el código que corre en otros hilos se
+    envuelve con perfil_hilo() (PIPELINE lo hace con cada etapa) y su
+    perfil se suma al volcado.
+
+    Solo mide el proceso actual: lo que se hace en procesos hijos
+    (PDF_PARALELO, backfill) cuenta como el tiempo de espera del padre.
+    Cada hilo anida sus propias etapas (PIPELINE corre etapas en hilos); el
+    pico de tracemalloc es del proceso, así que con etapas simultáneas es
+    el de todas juntas.
+    """
+
+    activa = False
+
+    _etapas = {}          # nombre -> acumulado (en orden de primera aparición)
+    _hilo = threading.local()   # .pila: etapas abiertas del hilo (para anidar)
+    _lock = threading.Lock()
+    _memoria = False
+    _perfil = None
+    _ruta_perfil = None
+    _hilo_perfil = None
+    _perfiles_hilos = []  # perfiles de otros hilos (perfil_hilo), se suman en guardar()
+    _inicio = None
+
+    # ------------------------------------------------------------------
+    # Encendido / apagado
+    # ------------------------------------------------------------------
+    @classmethod
+    def activar(cls, memoria=True, perfil=None):
+        """
+        - memoria: medir picos con tracemalloc (hace más lento el programa, ~2x).
+        - perfil: ruta de un volcado cProfile (.prof) que se escribe en guardar().
+        """
+        cls.reiniciar()
+        cls.activa = True
+        cls._inicio = (time.perf_counter(), time.process_time(), datetime.now().isoformat(timespec="seconds"))
+
+        cls._memoria = memoria
+        if memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+        cls._perfil = None
+        if perfil:
+            cls._ruta_perfil = perfil
+            cls._hilo_perfil = threading.get_ident()
+            cls._perfil = cProfile.Profile()
+            cls._perfil.enable()
+
+    @classmethod
+    def desactivar(cls):
+        if cls._perfil is not None:
+            cls._perfil.disable()
+        if cls._memoria and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        cls.activa = False
+
+    @classmethod
+    def reiniciar(cls):
+        cls._etapas = {}
+        cls._hilo = threading.local()
+        cls._perfiles_hilos = []
+
+    @classmethod
+    @contextlib.contextmanager
+    def perfil_hilo(cls):
+        """
+        Perfila con cProfile lo que corre dentro del bloque en el hilo actual,
+        si se pidió perfil en activar() y el hilo no es el que lo encendió.
+        No-op en otro caso.
+        """
+        perfil = None
+        if cls.activa and cls._perfil is not None and threading.get_ident() != cls._hilo_perfil:
+            perfil = cProfile.Profile()
+            try:
+                perfil.enable()
+            except ValueError:
+                # Python 3.12+: un solo perfilador a la vez, y ya ve todos los hilos
+                perfil = None
+        try:
+            yield
+        finally:
+            if perfil is not None:
+                perfil.disable()
+                with cls._lock:
+                    cls._perfiles_hilos.append(perfil)
+
+    @classmethod
+    def _pila(cls) -> list:
+        pila = getattr(cls._hilo, "pila", None)
+        if pila is None:
+            pila = cls._hilo.pila = []
+        return pila
+
+    # ------------------------------------------------------------------
+    # Medición
+    # ------------------------------------------------------------------
+    @classmethod
+    def etapa(cls, nombre: str, **conteos):
+        """Context manager que mide la etapa `nombre` (no-op si está apagada)."""
+        if not cls.activa:
+            return _ETAPA_NULA
+        return _Etapa(nombre, conteos)
+
+    @classmethod
+    def medir(cls, nombre: str = None):
+        """Decorador: mide cada llamada de la función como la etapa `nombre`."""
+        def decorador(funcion):
+            etiqueta = nombre or funcion.__qualname__
+
+            @functools.wraps(funcion)
+            def envoltura(*args, **kwargs):
+                if not cls.activa:
+                    return funcion(*args, **kwargs)
+                with _Etapa(etiqueta, {}):
+                    return funcion(*args, **kwargs)
+            return envoltura
+        return decorador
+
+    @classmethod
+    def contar(cls, **conteos):
+        """Suma conteos a la etapa abierta más interna (no-op si está apagada)."""
+        if cls.activa:
+            pila = cls._pila()
+            if pila:
+                pila[-1].contar(**conteos)
+
+    @staticmethod
+    def _rss_mb():
+        """RSS actual del proceso en MB (Linux: /proc/self/statm)."""
+        try:
+            with open("/proc/self/statm") as f:
+                return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 2**20
+        except (OSError, ValueError, IndexError):
+            return None
+
+    @staticmethod
+    def _rss_pico_mb():
+        if resource is None:
+            return None
+        pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # Linux lo da en KB y macOS en bytes
+        return pico / 2**20 if sys.platform == "darwin" else pico / 2**10
+
+    @classmethod
+    def _entrar(cls, etapa):
+        etapa._pico_tm = 0
+        pila = cls._pila()
+        if cls._memoria and tracemalloc.is_tracing():
+            # El pico que llevaba la etapa de afuera se guarda antes de reiniciarlo
+            if pila:
+                padre = pila[-1]
+                padre._pico_tm = max(padre._pico_tm, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        pila.append(etapa)
+
+    @classmethod
+    def _salir(cls, etapa, wall, cpu, error=False):
+        pila = cls._pila()
+        if pila and pila[-1] is etapa:
+            pila.pop()
+
+        pico_tm = None
+        if cls._memoria and tracemalloc.is_tracing():
+            pico_tm = max(etapa._pico_tm, tracemalloc.get_traced_memory()[1])
+            if pila:
+                padre = pila[-1]
+                padre._pico_tm = max(padre._pico_tm, pico_tm)
+
+        with cls._lock:
+            cls._acumular(etapa, wall, cpu, error, pico_tm)
+
+    @classmethod
+    def _acumular(cls, etapa, wall, cpu, error, pico_tm):
+        acumulado = cls._etapas.setdefault(etapa.nombre, {
+            "llamadas": 0,
+            "errores": 0,
+            "wall_s": 0.0,
+            "cpu_s": 0.0,
+            "wall_max_s": 0.0,
+            "rss_mb": None,
+            "rss_pico_mb": None,
+            "tracemalloc_pico_mb": None,
+            "conteos": {},
+        })
+        acumulado["llamadas"] += 1
+        acumulado["errores"] += int(error)
+        acumulado["wall_s"] += wall
+        acumulado["cpu_s"] += cpu
+        acumulado["wall_max_s"] = max(acumulado["wall_max_s"], wall)
+        acumulado["rss_mb"] = cls._rss_mb()
+        acumulado["rss_pico_mb"] = cls._rss_pico_mb()
+        if pico_tm is not None:
+            acumulado["tracemalloc_pico_mb"] = max(acumulado["tracemalloc_pico_mb"] or 0, pico_tm / 2**20)
+        for clave, n in etapa.conteos.items():
+            acumulado["conteos"][clave] = acumulado["conteos"].get(clave, 0) + n
+
+    # ------------------------------------------------------------------
+    # Reporte
+    # ------------------------------------------------------------------
+    @classmethod
+    def reporte(cls) -> dict:
+        """Reporte de la corrida como dict (lo que guardar() escribe en JSON)."""
+        total = {}
+        if cls._inicio is not None:
+            wall0, cpu0, fecha = cls._inicio
+            total = {
+                "inicio": fecha,
+                "wall_s": round(time.perf_counter() - wall0, 4),
+                "cpu_s": round(time.process_time() - cpu0, 4),
+                "rss_pico_mb": cls._rss_pico_mb(),
+            }
+
+        etapas = {}
+        for nombre, datos in cls._etapas.items():
+            etapas[nombre] = {
+                clave: (round(valor, 4) if isinstance(valor, float) else valor)
+                for clave, valor in datos.items()
+            }
+        return {
+            "python": sys.version.split()[0],
+            "argv": sys.argv,
+            "total": total,
+            "etapas": etapas,
+        }
+
+    @classmethod
+    def guardar(cls, ruta) -> str:
+        """Escribe el reporte JSON (y el volcado de cProfile si se pidió)."""
+        if cls._perfil is not None:
+            cls._perfil.disable()
+            estadisticas = pstats.Stats(cls._perfil)
+            for perfil in cls._perfiles_hilos:
+                try:
+                    estadisticas.add(perfil)
+                except TypeError:
+                    pass    # el hilo no llegó a ejecutar nada perfilable
+            estadisticas.dump_stats(cls._ruta_perfil)
+            print(f"💾 Perfil cProfile guardado en {cls._ruta_perfil}")
+
+        carpeta = os.path.dirname(ruta)
+        if carpeta:
+            os.makedirs(carpeta, exist_ok=True)
+        with open(ruta, "w", encoding="utf-8") as f:
+            json.dump(cls.reporte(), f, ensure_ascii=False, indent=2)
+        print(f"💾 Reporte de etapas guardado en {ruta}")
+        return ruta
@@ -0,0 +1,124 @@
+import pandas as pd
+
+
+class LECTOR_BD:
+    """
+    Lector en streaming de la hoja 'BD' del libro de actividades.
+
+    En lugar de cargar todas las columnas y filas con `pd.read_excel` y
+    filtrar después, recorre la hoja con openpyxl en modo `read_only`
+    (`iter_rows(values_only=True)`) y:
+
+    - proyecta solo las columnas pedidas (usecols), y
+    - descarta las filas cuyo ID_ITEM no coincide ANTES de convertirlas
+      en filas del DataFrame.
+
+    Así la memoria depende del resultado filtrado y no del histórico completo.
+    """
+
+    # Columnas que usan el PDF, el Excel y los resúmenes
+    COLUMNAS_NECESARIAS = [
+        "ID_ACTIVIDAD",
+        "FECHA",
+        "ID_ITEM",
+        "ACTIVIDAD",
+        "TIPO_ACT",
+        "ZONA",
+        "DESCRIPCION",
+        "UNIDAD_MEDIDA",
+        "CANTIDAD",
+        "VALOR_UNITARIO",
+        "VALOR_TOTAL",
+    ]
+
+    # Tipos que se aplican al construir el DataFrame
+    DTYPES = {
+        "FECHA": "datetime64[ns]",
+        "ID_ITEM": "float64",
+    }
+
+    def __init__(self, ruta_excel, hoja="BD"):
+        self.ruta_excel = ruta_excel
+        self.hoja = hoja
+
+    def leer(self, columnas=None, id_item=None) -> pd.DataFrame:
+        """
+        Lee la hoja aplicando proyección y filtro durante el recorrido.
+
+        - columnas: lista de columnas a conservar (None = todas). Las que no
+          existan en la hoja se ignoran.
+        - id_item: si se indica (ej. 3.1), solo se conservan las filas con
+          ese ID_ITEM (comparado con 2 decimales, como en
+          DATAFRAMES_ACTIVIDADES_SPRBUN.get_dataframe_actividades).
+        """
+        from openpyxl import load_workbook   # solo al leer el libro (no con el almacén SQLite)
+
+        wb = load_workbook(self.ruta_excel, read_only=True, data_only=True)
+        try:
+            ws = wb[self.hoja]
+            filas = ws.iter_rows(values_only=True)
+
+            try:
+                encabezado = next(filas)
+            except StopIteration:
+                return pd.DataFrame(columns=columnas or [])
+
+            nombres = [
+                str(nombre).strip() if nombre is not None else f"Unnamed: {i}"
+                for i, nombre in enumerate(encabezado)
+            ]
+            posiciones = {nombre: i for i, nombre in enumerate(nombres)}
+
+            if columnas is None:
+                columnas_leer = nombres
+            else:
+                columnas_leer = [c for c in columnas if c in posiciones]
+            indices = [posiciones[c] for c in columnas_leer]
+
+            pos_item = None
+            if id_item is not None:
+                if "ID_ITEM" not in posiciones:
+                    raise KeyError(
+                        f"No existe la columna 'ID_ITEM' en la hoja '{self.hoja}'. "
+                        f"Columnas disponibles: {nombres}"
+                    )
+                pos_item = posiciones["ID_ITEM"]
+                objetivo = round(float(id_item), 2)
+
+            registros = []
+            for fila in filas:
+                if pos_item is not None:
+                    if pos_item >= len(fila) or not self._coincide_item(fila[pos_item], objetivo):
+                        continue
+                elif not any(v is not None for v in fila):
+                    # fila completamente vacía (típico al final de la hoja)
+                    continue
+
+                registros.append(
+                    tuple(fila[i] if i < len(fila) else None for i in indices)
+                )
+        finally:
+            wb.close()
+
+        df = pd.DataFrame.from_records(registros, columns=columnas_leer)
+        return self._aplicar_tipos(df)
+
+    @staticmethod
+    def _coincide_item(valor, objetivo) -> bool:
+        """True si el ID_ITEM de la celda es numérico e igual al objetivo (2 decimales)."""
+        if valor is None:
+            return False
+        try:
+            return round(float(valor), 2) == objetivo
+        except (TypeError, ValueError):
+            return False
+
+    def _aplicar_tipos(self, df: pd.DataFrame) -> pd.DataFrame:
+        for col, dtype in self.DTYPES.items():
+            if col not in df.columns:
+                continue
+            if dtype.startswith("datetime"):
+                df[col] = pd.to_datetime(df[col], errors="coerce")
+            else:
+                df[col] = pd.to_numeric(df[col], errors="coerce").astype(dtype)
+        return df
@@ -0,0 +1,182 @@
+import re
+import unicodedata
+
+import pandas as pd
+
+
+def _tabla_latin1_nfkd() -> dict:
+    """
+    Para cada carácter latin-1 (0x00-0xFF) calcula lo que queda después de
+    normalizar a NFKD y descartar lo que no se puede codificar en latin-1.
+    Equivale a `unicodedata.normalize("NFKD", t).encode("latin-1", "ignore")`
+    aplicado carácter por carácter (los diacríticos combinados quedan fuera
+    de latin-1, por eso se pueden descartar sin mirar el contexto).
+    """
+    tabla = {}
+    for codigo in range(0x100):
+        c = chr(codigo)
+        descompuesto = unicodedata.normalize("NFKD", c)
+        limpio = "".join(ch for ch in descompuesto if ord(ch) <= 0xFF)
+        if limpio != c:
+            tabla[codigo] = limpio
+    return tabla
+
+
+def _tabla_pdf(textos_raros, reemplazos) -> dict:
+    """
+    Combina en una sola tabla de `str.translate` los espacios invisibles,
+    los reemplazos tipográficos y la normalización NFKD/latin-1.
+    Los caracteres reemplazados ya quedan en latin-1; el resto de
+    caracteres latin-1 se normaliza con la tabla NFKD.
+    """
+    nfkd = _tabla_latin1_nfkd()
+    tabla = {chr(k): v for k, v in nfkd.items()}
+    tabla.update({raro: " " for raro in textos_raros})
+    for raro, simple in reemplazos.items():
+        tabla[raro] = "".join(nfkd.get(ord(ch), ch) for ch in simple)
+    return str.maketrans(tabla)
+
+
+class LIMPIAR_TEXTO:
+    """
+    Limpieza de textos para FPDF (core fonts latin-1) con tablas precompiladas.
+
+    Todas las variantes usan un único `str.translate` más expresiones
+    regulares compiladas una sola vez al importar el módulo, en lugar de
+    encadenar `str.replace` por cada carácter problemático.
+    """
+
+    # 1️⃣ Espacios invisibles / caracteres ocultos → espacio
+    TEXTOS_RAROS = [
+        "\u200b",  # zero-width space
+        "\u200c",  # non-joiner
+        "\u200d",  # joiner
+        "\ufeff",  # BOM
+        "\xa0",    # espacio duro
+        "\t",      # tabulaciones
+        "\r",      # retorno de carro
+    ]
+
+    # 2️⃣ Reemplazos de caracteres problemáticos (limpieza profunda)
+    REEMPLAZOS_PDF = {
+        "–": "-",    # en dash
+        "—": "-",    # em dash
+        "―": "-",    # horizontal bar
+        "•": "-",    # viñetas
+        "∙": "-",    # viñetas pequeñas
+        "·": "-",    # bullet punto medio
+        "“": '"',
+        "”": '"',
+        "„": '"',
+        "‟": '"',
+        "’": "'",
+        "‘": "'",
+        "´": "'",
+        "`": "'",
+        "¨": "",
+        "…": "...",  # puntos suspensivos Unicode
+        "¶": "",     # símbolo de párrafo
+        "°": "°",    # mantenemos grados pero normalizados
+    }
+
+    # Reemplazos de DATAFRAMES_ACTIVIDADES_SPRBUN._to_latin1
+    REEMPLAZOS_LATIN1 = {
+        "–": "-",   # en dash
+        "—": "-",   # em dash
+        "“": '"',
+        "”": '"',
+        "’": "'",
+        "´": "'",
+        "•": "-",   # viñetas
+    }
+
+    # Reemplazos de PDFHeaderFooter.limpiar_texto_pdf (conserva tildes y unicode)
+    REEMPLAZOS_BASICOS = {
+        "–": "-",    # en dash
+        "—": "-",    # em dash
+        "’": "'",    # comilla curva derecha
+        "‘": "'",    # comilla curva izquierda
+        "“": '"',    # comilla doble curva izquierda
+        "”": '"',    # comilla doble curva derecha
+        "…": "...",  # puntos suspensivos unicode
+        "•": "-",    # viñeta
+    }
+
+    # 3️⃣ Todo lo que esté fuera de latin-1 (emojis, símbolos, etc.)
+    RE_FUERA_LATIN1 = re.compile(r"[^\x00-\xFF]")
+
+    # 6️⃣ Espacios repetidos (incluye saltos de línea, como str.split())
+    RE_ESPACIOS = re.compile(r"\s+")
+
+    # --- Tablas de traducción compiladas ---
+    # Limpieza profunda: pasos 1️⃣ + 2️⃣ + 4️⃣ + 5️⃣ en una sola tabla.
+    TABLA_PDF = _tabla_pdf(TEXTOS_RAROS, REEMPLAZOS_PDF)
+    TABLA_LATIN1 = str.maketrans(REEMPLAZOS_LATIN1)
+    TABLA_BASICA = str.maketrans(REEMPLAZOS_BASICOS)
+
+    # ------------------------------------------------------------------
+    # Textos sueltos
+    # ------------------------------------------------------------------
+    @classmethod
+    def pdf(cls, texto) -> str:
+        """
+        Limpieza profunda para FPDF (mismo resultado que la versión original
+        de DATAFRAMES_ACTIVIDADES_SPRBUN.limpiar_texto_pdf):
+        espacios invisibles, comillas/guiones tipográficos, emojis,
+        diacríticos (NFKD) y espacios repetidos.
+        """
+        if pd.isna(texto):
+            return ""
+
+        texto = str(texto).translate(cls.TABLA_PDF)
+        texto = cls.RE_FUERA_LATIN1.sub("", texto)
+        return " ".join(texto.split())
+
+    @classmethod
+    def latin1(cls, texto) -> str:
+        """
+        Reemplaza guiones largos, comillas curvas y viñetas y elimina lo que
+        no se pueda codificar en latin-1 (sin tocar tildes ni espacios).
+        """
+        if texto is None:
+            return ""
+        texto = str(texto).translate(cls.TABLA_LATIN1)
+        return cls.RE_FUERA_LATIN1.sub("", texto)
+
+    @classmethod
+    def basico(cls, texto: str) -> str:
+        """Solo reemplaza guiones, comillas, puntos suspensivos y viñetas Unicode."""
+        if texto is None:
+            return ""
+        return texto.translate(cls.TABLA_BASICA)
+
+    # ------------------------------------------------------------------
+    # Columnas completas
+    # ------------------------------------------------------------------
+    @classmethod
+    def serie_pdf(cls, serie: pd.Series) -> pd.Series:
+        """
+        Aplica `pdf()` a toda una columna de texto.
+
+        La limpieza se hace UNA vez por valor único (las descripciones se
+        repiten mucho) con el accesor `.str` de pandas, y luego se mapea
+        de vuelta a todas las filas. Los nulos quedan como "".
+        """
+        nulos = serie.isna()
+        valores = serie.astype(str)
+        # dict.fromkeys y no pd.unique: la tabla hash de pandas trunca los
+        # textos en el primer "\x00" y mezclaría valores distintos.
+        unicos = pd.Series(list(dict.fromkeys(valores[~nulos])), dtype=object)
+
+        limpios = (
+            unicos
+            .str.translate(cls.TABLA_PDF)
+            .str.replace(cls.RE_FUERA_LATIN1, "", regex=True)
+            .str.replace(cls.RE_ESPACIOS, " ", regex=True)
+            .str.strip()
+        )
+        mapa = dict(zip(unicos, limpios))
+
+        resultado = valores.map(mapa)
+        resultado[nulos] = ""
+        return resultado
@@ -7,9 +7,10 @@ class AdminFechas:
     }
     MESES_NUM_A_NOMBRE = {v: k for k, v in MESES_NOMBRE_A_NUM.items()}
 
-    def __init__(self):
-        self.anio = None
-        self.mes = None
+    def __init__(self, anio=None, mes=None):
+        """anio/mes opcionales: si se pasan, no hace falta el menú interactivo."""
+        self.anio = anio
+        self.mes = mes
 
     # --- Solicitar año ---
     def solicitar_anio(self):
@@ -0,0 +1,155 @@
+import hashlib
+import math
+import os
+import time
+from pathlib import Path
+
+from PIL import Image
+
+
+class MINIATURAS_FOTOS:
+    """
+    Miniaturas en caché de las fotos de actividades para el PDF.
+
+    Las fotos del celular (varios MB, miles de píxeles) se dibujan en celdas
+    de unos pocos centímetros. Esta clase reduce cada foto a la resolución
+    que realmente necesita su celda (según `dpi`), la re-codifica como JPEG
+    optimizado y la guarda en disco con una clave que combina:
+    ruta de origen + mtime + tamaño del archivo + alto objetivo en píxeles.
+
+    Si la foto de origen no cambia, las siguientes ejecuciones reutilizan la
+    miniatura sin volver a decodificar el original.
+
+    Desalojo (podar()), como en CACHE_RESUMENES_LLM: cada uso renueva el
+    mtime de la miniatura; las que no se usan hace más de `max_dias` se
+    borran (fotos editadas o borradas, otro dpi o calidad) y, si la carpeta
+    supera `max_mb`, se borran las menos usadas recientemente.
+    """
+
+    CARPETA_DEFAULT = "BD/CACHE/MINIATURAS"
+    MAX_DIAS_DEFAULT = 90
+    MAX_MB_DEFAULT = 1024
+
+    # Los altos objetivo se redondean hacia arriba a múltiplos de este valor
+    # para que filas de alturas parecidas compartan la misma miniatura.
+    PASO_PX = 64
+
+    def __init__(self, carpeta=CARPETA_DEFAULT, dpi: int = 200, calidad: int = 80,
+                 max_dias: float = MAX_DIAS_DEFAULT, max_mb: float = MAX_MB_DEFAULT):
+        self.carpeta = Path(carpeta)
+        self.carpeta.mkdir(parents=True, exist_ok=True)
+        self.dpi = dpi
+        self.calidad = calidad
+        self.max_dias = max_dias
+        self.max_mb = max_mb
+
+    def alto_px(self, alto_mm: float) -> int:
+        """Alto en píxeles para dibujar `alto_mm` a `dpi`, redondeado a PASO_PX."""
+        px = alto_mm / 25.4 * self.dpi
+        return max(self.PASO_PX, int(math.ceil(px / self.PASO_PX) * self.PASO_PX))
+
+    def ruta_miniatura(self, ruta_foto, alto_px: int, firma=None) -> Path:
+        """firma: (mtime_ns, tamaño) de la foto; si no se pasa, se lee con os.stat."""
+        if firma is None or None in firma:
+            stat = os.stat(ruta_foto)
+            firma = (stat.st_mtime_ns, stat.st_size)
+        mtime_ns, tamano = firma
+        origen = os.path.abspath(ruta_foto)
+        clave = f"{origen}|{mtime_ns}|{tamano}|{alto_px}|{self.calidad}"
+        nombre = hashlib.sha1(clave.encode("utf-8")).hexdigest()
+        return self.carpeta / f"{nombre}.jpg"
+
+    def obtener(self, ruta_foto, alto_mm: float, firma=None) -> str:
+        """
+        Devuelve la ruta de la miniatura de `ruta_foto` para dibujarla con
+        `alto_mm` de alto. Si la foto ya es suficientemente pequeña, o no se
+        puede procesar, devuelve la ruta original.
+
+        firma: (mtime_ns, tamaño) ya conocidos (por ejemplo, del
+        CATALOGO_FOTOS), para no hacer os.stat por cada foto.
+        """
+        alto_px = self.alto_px(alto_mm)
+        try:
+            destino = self.ruta_miniatura(ruta_foto, alto_px, firma)
+        except OSError:
+            return ruta_foto
+
+        if destino.is_file():
+            try:
+                os.utime(destino)   # marca de uso para podar()
+            except OSError:
+                pass
+            return str(destino)
+
+        try:
+            with Image.open(ruta_foto) as img:
+                ancho, alto = img.size
+                if alto <= alto_px:
+                    return ruta_foto
+
+                ancho_px = max(1, round(ancho * alto_px / alto))
+
+                # En JPEG, draft() decodifica directamente a escala reducida (mucho más rápido)
+                img.draft("RGB", (ancho_px, alto_px))
+                icc = img.info.get("icc_profile")
+
+                if img.mode in ("RGBA", "LA", "P", "PA"):
+                    img = img.convert("RGBA")
+                    fondo = Image.new("RGB", img.size, (255, 255, 255))
+                    fondo.paste(img, mask=img.getchannel("A"))
+                    img = fondo
+                elif img.mode != "RGB":
+                    img = img.convert("RGB")
+
+                img = img.resize((ancho_px, alto_px), Image.LANCZOS)
+
+                tmp = destino.with_suffix(f".{os.getpid()}.tmp")
+                opciones = {"quality": self.calidad, "optimize": True}
+                if icc:
+                    opciones["icc_profile"] = icc
+                img.save(tmp, "JPEG", **opciones)
+                os.replace(tmp, destino)
+        except Exception as e:
+            print(f"⚠️ No se pudo crear miniatura de {ruta_foto}: {e}")
+            return ruta_foto
+
+        return str(destino)
+
+    def podar(self) -> int:
+        """
+        Borra las miniaturas sin usar hace más de `max_dias` y, si aún se
+        supera `max_mb`, las menos usadas recientemente. También borra los
+        .tmp que haya dejado un proceso interrumpido. Devuelve cuántos
+        archivos se borraron.
+        """
+        limite = time.time() - self.max_dias * 86400
+        vigentes, borradas = [], 0
+        with os.scandir(self.carpeta) as entradas:
+            for entrada in entradas:
+                if not entrada.is_file():
+                    continue
+                try:
+                    stat = entrada.stat()
+                    if stat.st_mtime < limite or (entrada.name.endswith(".tmp") and stat.st_mtime < time.time() - 86400):
+                        os.remove(entrada.path)
+                        borradas += 1
+                    elif entrada.name.endswith(".jpg"):
+                        vigentes.append((stat.st_mtime, stat.st_size, entrada.path))
+                except OSError:
+                    continue   # otro proceso la borró o la reemplazó
+
+        total = sum(tamano for _, tamano, _ in vigentes)
+        maximo = self.max_mb * 2**20
+        for _, tamano, ruta in sorted(vigentes):
+            if total <= maximo:
+                break
+            try:
+                os.remove(ruta)
+                borradas += 1
+            except OSError:
+                pass
+            total -= tamano
+
+        if borradas:
+            print(f"🗃️ {borradas} miniaturas viejas borradas de {self.carpeta}")
+        return borradas
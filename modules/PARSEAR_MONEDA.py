@@ -0,0 +1,51 @@
+import re
+
+import pandas as pd
+
+
+class PARSEAR_MONEDA:
+    """
+    Convierte columnas de montos a número de forma vectorizada.
+
+    - Columnas ya numéricas (int/float): se devuelven tal cual (camino rápido).
+    - Columnas de texto/mixtas: los números se respetan y los textos se
+      interpretan con UNA expresión regular compilada (str.extract), que
+      acepta formatos colombianos y de EE. UU.:
+
+          "$1,200"        -> 1200        "$ 1.200.000"  -> 1200000
+          "1.200,50"      -> 1200.5      "1,200.50"     -> 1200.5
+          "-$ 35.000"     -> -35000      "2500.5"       -> 2500.5
+
+      Un separador seguido de exactamente 3 dígitos es de miles; con 1 o 2
+      dígitos al final es decimal. Lo que no es un monto queda NaN.
+    """
+
+    RE_MONTO = re.compile(
+        r"^\s*(?P<signo>-)?\s*\$?\s*(?P<signo2>-)?\s*"
+        r"(?P<entero>\d{1,3}(?:(?P<sep>[.,])\d{3})(?:(?P=sep)\d{3})*|\d+)"
+        r"(?:[.,](?P<decimales>\d{1,2}))?\s*$"
+    )
+    RE_SEPARADORES = re.compile(r"[.,]")
+
+    @classmethod
+    def serie(cls, serie: pd.Series) -> pd.Series:
+        """Serie de montos como float64 (o el dtype numérico original)."""
+        if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+            return serie
+
+        # Valores que ya son números (celdas numéricas de Excel en columna mixta);
+        # los textos van todos por la regex para que "1.200" sea 1200 y no 1.2
+        es_texto = serie.map(lambda v: isinstance(v, str)).astype(bool)
+        numeros = pd.to_numeric(serie.where(~es_texto), errors="coerce").astype("float64")
+        textos = serie[es_texto]
+        if textos.empty:
+            return numeros
+
+        partes = textos.astype(str).str.extract(cls.RE_MONTO)
+        entero = partes["entero"].str.replace(cls.RE_SEPARADORES, "", regex=True)
+        valor = pd.to_numeric(entero + "." + partes["decimales"].fillna("0"), errors="coerce")
+        negativo = partes["signo"].notna() | partes["signo2"].notna()
+        valor[negativo] = -valor[negativo]
+
+        numeros.loc[valor.index] = valor
+        return numeros
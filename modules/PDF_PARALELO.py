@@ -0,0 +1,230 @@
+import contextlib
+import io
+import multiprocessing
+import os
+import re
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from modules.CATALOGO_FOTOS import CATALOGO_FOTOS
+from modules.CREATE_PDF_V1 import PDFHeaderFooter
+from modules.INSTRUMENTACION import INSTRUMENTACION
+
+# Nombres de fuentes (/F3) e imágenes (/I7) en el contenido de una página. Los
+# textos van entre paréntesis (fpdf escapa los paréntesis que traen) y se
+# reconocen primero para no tocar un "/F1" escrito en una descripción.
+_RE_RECURSOS = re.compile(rb"\((?:\\.|[^\\()])*\)|/([FI])(\d+)(?![\w.])", re.S)
+
+
+def _estado(pdf):
+    """Lo que una página hereda de la anterior (add_page lo vuelve a aplicar)."""
+    return (
+        pdf.font_family, pdf.font_style, pdf.font_size_pt, pdf.underline,
+        pdf.line_width, pdf.draw_color, pdf.fill_color, pdf.text_color,
+        pdf.font_stretching, pdf.char_spacing, pdf.dash_pattern,
+    )
+
+
+def _renderizar_bloque(dias, catalogo_fotos, previo=None, portada=None):
+    """
+    Trabajo de un proceso: dibuja un bloque de días consecutivos y devuelve
+    sus páginas para que el proceso principal las una (PDF_PARALELO._unir).
+
+    - previo / portada: el día anterior al bloque (None en el primero) y
+      la portada. Se dibujan y se descartan para que la fuente y los colores
+      al empezar el bloque sean los del dibujo secuencial; _unir comprueba
+      que así sea con el estado inicial y final de cada bloque.
+
+    Devuelve {"paginas": [contenido de cada página, sin el pie],
+    "fuentes": {i: (familia, estilo)}, "imagenes": {i: ruta},
+    "estado_inicial": ..., "estado_final": ...}.
+    """
+    pdf = PDFHeaderFooter(catalogo_fotos=catalogo_fotos)
+    pdf.dibujar_pie = False   # el pie lo pone el proceso principal al unir
+
+    # Los avisos del día previo ya salen en su propio bloque
+    with contextlib.redirect_stdout(io.StringIO()):
+        if portada is not None:
+            pdf.agregar_portada(*portada)
+        if previo is not None:
+            pdf.agregar_tabla_actividades_dia(**previo)
+
+    estado_inicial = _estado(pdf)
+    primera = pdf.page + 1
+    for dia in dias:
+        pdf.agregar_tabla_actividades_dia(**dia)
+
+    paginas = [pdf.pages[n] for n in range(primera, pdf.page + 1)]
+    if any(pagina.get_text_substitutions() for pagina in paginas):
+        # El total de páginas ({nb}) solo se conoce en el documento final
+        raise ValueError("el bloque usa el alias del total de páginas")
+
+    fuentes = {}
+    for fuente in pdf.fonts.values():
+        if fuente.type != "core":
+            raise ValueError(f"fuente no estándar: {fuente.fontkey}")
+        familia = fuente.fontkey.rstrip("BI")
+        fuentes[fuente.i] = (familia, fuente.fontkey[len(familia):])
+
+    return {
+        "paginas": [bytes(pagina.contents) for pagina in paginas],
+        "fuentes": fuentes,
+        "imagenes": {info["i"]: nombre for nombre, info in pdf.image_cache.images.items()},
+        "estado_inicial": estado_inicial,
+        "estado_final": _estado(pdf),
+    }
+
+
+class PDF_PARALELO:
+    """
+    Genera el informe PDF aprovechando varios núcleos.
+
+    Cada día empieza en una página nueva, así que las páginas de un día no
+    dependen de cuántas hubo antes:
+
+    1. Los días se reparten en bloques consecutivos entre procesos
+       (ProcessPoolExecutor). Cada proceso dibuja su bloque completo con
+       PDFHeaderFooter (medir el texto, partir líneas, reducir fotos a
+       miniaturas) y devuelve el contenido de sus páginas.
+    2. El proceso principal dibuja la portada y une los bloques en orden
+       (_unir): abre cada página con add_page(), registra sus fuentes e
+       imágenes y copia el contenido con los nombres del documento final.
+       El encabezado y el pie siguen siendo un XObject cada uno.
+
+    El resultado es el mismo archivo que el dibujo secuencial. Con un solo
+    proceso o un solo bloque, si algún día no empieza en página nueva, o si
+    falla un bloque, se dibuja en serie como el bucle de main.py.
+    """
+
+    def __init__(self, max_procesos=None, dias_por_bloque=None, catalogo_fotos=None):
+        """
+        - max_procesos: procesos de trabajo (None = núcleos disponibles).
+        - dias_por_bloque: días que dibuja cada tarea (None = un bloque por
+          proceso, con un número de filas parecido). Cada bloque dibuja
+          además el día anterior, así que bloques muy pequeños no compensan.
+        - catalogo_fotos: CATALOGO_FOTOS a compartir; si no se pasa, se crea
+          y escanea una vez aquí para no repetir el recorrido en cada proceso.
+        """
+        self.max_procesos = max_procesos or os.cpu_count() or 1
+        self.dias_por_bloque = dias_por_bloque
+        self.catalogo_fotos = catalogo_fotos if catalogo_fotos is not None else CATALOGO_FOTOS()
+
+    def _bloques(self, dias):
+        if self.max_procesos <= 1 or not all(dia.get("nueva_pagina", True) for dia in dias):
+            return [dias]
+        if self.dias_por_bloque:
+            tam = self.dias_por_bloque
+            return [dias[i:i + tam] for i in range(0, len(dias), tam)]
+
+        n_bloques = min(self.max_procesos, len(dias))
+        filas = [len(dia["df_dia"]) + 1 for dia in dias]
+        objetivo = sum(filas) / max(1, n_bloques)
+        bloques, actual, acumulado = [], [], 0
+        for dia, n in zip(dias, filas):
+            actual.append(dia)
+            acumulado += n
+            if len(bloques) < n_bloques - 1 and acumulado >= objetivo * (len(bloques) + 1):
+                bloques.append(actual)
+                actual = []
+        if actual:
+            bloques.append(actual)
+        return bloques
+
+    @staticmethod
+    def _unir(pdf, bloque):
+        """
+        Agrega al final de `pdf` las páginas de un bloque. add_page() pone el
+        pie de la página anterior y abre la nueva; set_font()+text() e
+        image() registran en `pdf` las fuentes e imágenes que usa la página
+        (lo que escriben se descarta) y el contenido pasa a ser el del
+        bloque, con los nombres /F e /I del documento final.
+        """
+        for contenido in bloque["paginas"]:
+            pdf.add_page()
+            nombres = {}
+            for m in _RE_RECURSOS.finditer(contenido):
+                if m.group(1) is None or m.group(0) in nombres:
+                    continue
+                i = int(m.group(2))
+                if m.group(1) == b"F":
+                    pdf.set_font(*bloque["fuentes"][i])
+                    pdf.text(0, 0, " ")    # la fuente queda en los recursos de la página
+                    nombres[m.group(0)] = b"/F%d" % pdf.current_font.i
+                else:
+                    info = pdf.image(bloque["imagenes"][i], x=0, y=0, w=1, h=1)
+                    nombres[m.group(0)] = b"/I%d" % info["i"]
+            pdf.pages[pdf.page].contents = bytearray(
+                _RE_RECURSOS.sub(lambda m: nombres.get(m.group(0), m.group(0)), contenido)
+            )
+
+    @INSTRUMENTACION.medir("pdf.paralelo")
+    def _generar_en_paralelo(self, dias, bloques, portada):
+        """PDF con los bloques dibujados en procesos y unidos en orden (None si falla alguno)."""
+        # Con otros hilos activos (PIPELINE dibuja el PDF mientras se escribe el
+        # Excel) no se hace fork: un hijo podría heredar un lock tomado
+        contexto = None
+        if threading.active_count() > 1 and "forkserver" in multiprocessing.get_all_start_methods():
+            contexto = multiprocessing.get_context("forkserver")
+
+        pdf = PDFHeaderFooter(catalogo_fotos=self.catalogo_fotos)
+        if portada is not None:
+            pdf.agregar_portada(*portada)
+
+        with ProcessPoolExecutor(max_workers=min(self.max_procesos, len(bloques)), mp_context=contexto) as pool:
+            futuros, inicio = [], 0
+            for bloque in bloques:
+                previo = dias[inicio - 1] if inicio else None
+                futuros.append(pool.submit(_renderizar_bloque, bloque, self.catalogo_fotos, previo, portada))
+                inicio += len(bloque)
+
+            # Se une cada bloque apenas termina, mientras los siguientes se dibujan
+            try:
+                estado = _estado(pdf)
+                for futuro in futuros:
+                    bloque = futuro.result()
+                    if bloque["estado_inicial"] != estado:
+                        raise ValueError("un bloque empezó con otra fuente o colores que el secuencial")
+                    self._unir(pdf, bloque)
+                    estado = bloque["estado_final"]
+            except Exception as e:
+                for futuro in futuros:
+                    futuro.cancel()
+                print(f"⚠️ Falló el dibujo en paralelo ({e}); se dibuja en serie.")
+                return None
+
+        print(f"⚡ Días dibujados en paralelo: {len(dias)} en {len(bloques)} bloques")
+        return pdf
+
+    def _generar_en_serie(self, dias, portada):
+        pdf = PDFHeaderFooter(catalogo_fotos=self.catalogo_fotos)
+        if portada is not None:
+            pdf.agregar_portada(*portada)
+        for dia in dias:
+            pdf.agregar_tabla_actividades_dia(**dia)
+        return pdf
+
+    def generar(self, dias, ruta_salida, portada=None):
+        """
+        - dias: lista de dicts con los argumentos de agregar_tabla_actividades_dia
+          (num_dia, anio, fecha_dia, df_dia, descripcion_servicio, ...).
+        - ruta_salida: ruta del PDF final.
+        - portada: tupla de argumentos de agregar_portada (opcional).
+        """
+        # Escanear aquí: los procesos reciben el índice ya construido
+        len(self.catalogo_fotos)
+
+        pdf = None
+        bloques = self._bloques(dias)
+        if len(bloques) > 1:
+            pdf = self._generar_en_paralelo(dias, bloques, portada)
+        if pdf is None:
+            pdf = self._generar_en_serie(dias, portada)
+
+        with INSTRUMENTACION.etapa("pdf.output") as etapa:
+            pdf.output(ruta_salida)
+            etapa.contar(paginas=pdf.page_no())
+
+        # Las miniaturas usadas quedaron con el mtime renovado: se podan las demás
+        if pdf.miniaturas is not None:
+            pdf.miniaturas.podar()
+        return ruta_salida
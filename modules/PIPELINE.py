@@ -0,0 +1,190 @@
+import hashlib
+import os
+import pickle
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+from modules.INSTRUMENTACION import INSTRUMENTACION
+
+
+class ETAPA:
+    """Una etapa del pipeline: función, dependencias y cómo se memoriza."""
+
+    __slots__ = ("nombre", "funcion", "dependencias", "memo", "firma", "valido")
+
+    def __init__(self, nombre, funcion, dependencias=(), memo=False, firma=None, valido=None):
+        self.nombre = nombre
+        self.funcion = funcion
+        self.dependencias = tuple(dependencias)
+        self.memo = memo
+        self.firma = firma
+        self.valido = valido
+
+
+class ERROR_ETAPA(Exception):
+    """Una o más etapas fallaron. `errores` = {etapa: excepción}."""
+
+    def __init__(self, errores: dict):
+        self.errores = errores
+        super().__init__("; ".join(f"{nombre}: {e}" for nombre, e in errores.items()))
+
+
+class PIPELINE:
+    """
+    Ejecutor de etapas con dependencias (un DAG pequeño).
+
+        p = PIPELINE(carpeta_memo="BD/CACHE/PIPELINE/2025-11", firma_base="...")
+        p.agregar("cargar", cargar, memo=True)
+        p.agregar("limpiar", limpiar, ["cargar"], memo=True)
+        p.agregar("pdf", pdf, ["limpiar"], memo=True, valido=os.path.isfile)
+        p.ejecutar(["pdf"])
+
+    - Cada etapa recibe como argumentos los resultados de sus dependencias,
+      en orden. Las etapas independientes corren a la vez (un hilo por
+      etapa; cada una espera solo a sus dependencias).
+    - Con memo=True el resultado se guarda en disco (pickle) con una clave
+      que combina firma_base, el nombre de la etapa y las firmas de sus
+      dependencias. Si la clave coincide se reutiliza sin ejecutar la etapa
+      ni lo que está antes de ella (ej. reintentar solo el Excel sin releer
+      el libro ni rehacer el PDF). `valido(resultado)` permite descartar un
+      resultado guardado (ej. el archivo de salida ya no existe).
+    - Las etapas sin memo pueden dar `firma(resultado)`: un texto que cambia
+      cuando cambia su contenido (ej. los resúmenes del periodo), para que
+      invalide a las etapas memorizadas que dependen de ella.
+    - forzar=True ignora lo guardado (pero lo vuelve a guardar).
+    """
+
+    def __init__(self, carpeta_memo=None, firma_base="", forzar=False):
+        self.carpeta_memo = carpeta_memo
+        self.firma_base = firma_base
+        self.forzar = forzar
+        self.etapas = {}
+        self.memorizadas = []     # etapas que se tomaron de disco en la última ejecución
+
+        self._futuros = {}
+        self._claves = {}
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def agregar(self, nombre, funcion, dependencias=(), memo=False, firma=None, valido=None):
+        for dep in dependencias:
+            if dep not in self.etapas:
+                raise KeyError(f"La etapa '{nombre}' depende de '{dep}', que no está definida (agregarla antes).")
+        self.etapas[nombre] = ETAPA(nombre, funcion, dependencias, memo, firma, valido)
+        return self
+
+    # ------------------------------------------------------------------
+    # Memoización en disco
+    # ------------------------------------------------------------------
+    def _ruta_memo(self, nombre):
+        return os.path.join(self.carpeta_memo, f"{nombre}.pkl")
+
+    def _leer_memo(self, etapa, clave):
+        if self.forzar or not etapa.memo or self.carpeta_memo is None:
+            return False, None
+        try:
+            with open(self._ruta_memo(etapa.nombre), "rb") as f:
+                guardada, valor = pickle.load(f)
+        except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+            return False, None
+        if guardada != clave or (etapa.valido is not None and not etapa.valido(valor)):
+            return False, None
+        return True, valor
+
+    def _guardar_memo(self, etapa, clave, valor):
+        if not etapa.memo or self.carpeta_memo is None:
+            return
+        os.makedirs(self.carpeta_memo, exist_ok=True)
+        ruta = self._ruta_memo(etapa.nombre)
+        tmp = ruta + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                pickle.dump((clave, valor), f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, ruta)
+        except Exception as e:
+            print(f"⚠️ No se pudo guardar el resultado de la etapa '{etapa.nombre}': {e}")
+
+    # ------------------------------------------------------------------
+    # Firmas
+    # ------------------------------------------------------------------
+    def _firma_salida(self, nombre) -> str:
+        """Lo que una etapa aporta a la clave de las que dependen de ella."""
+        etapa = self.etapas[nombre]
+        if etapa.memo:
+            return self._clave(nombre)
+        valor = self._resolver(nombre).result()
+        return etapa.firma(valor) if etapa.firma is not None else ""
+
+    def _clave(self, nombre) -> str:
+        if nombre not in self._claves:
+            partes = [self.firma_base, nombre] + [self._firma_salida(d) for d in self.etapas[nombre].dependencias]
+            self._claves[nombre] = hashlib.sha1("\x1f".join(partes).encode("utf-8")).hexdigest()
+        return self._claves[nombre]
+
+    # ------------------------------------------------------------------
+    # Ejecución
+    # ------------------------------------------------------------------
+    def _ejecutar_etapa(self, etapa):
+        # Cada etapa corre en un hilo del pool: con --cprofile se perfila aparte
+        with INSTRUMENTACION.perfil_hilo():
+            return self._ejecutar_etapa_en_hilo(etapa)
+
+    def _ejecutar_etapa_en_hilo(self, etapa):
+        if etapa.memo:
+            clave = self._clave(etapa.nombre)
+            encontrada, valor = self._leer_memo(etapa, clave)
+            if encontrada:
+                self.memorizadas.append(etapa.nombre)
+                return valor
+
+        argumentos = []
+        for dep in etapa.dependencias:
+            try:
+                argumentos.append(self._resolver(dep).result())
+            except Exception as e:
+                raise RuntimeError(f"falló la dependencia '{dep}'") from e
+
+        valor = etapa.funcion(*argumentos)
+        if etapa.memo:
+            self._guardar_memo(etapa, self._clave(etapa.nombre), valor)
+        return valor
+
+    def _resolver(self, nombre) -> Future:
+        with self._lock:
+            futuro = self._futuros.get(nombre)
+            if futuro is None:
+                futuro = self._pool.submit(self._ejecutar_etapa, self.etapas[nombre])
+                self._futuros[nombre] = futuro
+        return futuro
+
+    def ejecutar(self, objetivos=None) -> dict:
+        """
+        Ejecuta las etapas `objetivos` (por defecto todas) y lo que necesiten.
+        Devuelve {etapa: resultado} de las etapas que se resolvieron; si
+        alguna falló, lanza ERROR_ETAPA después de terminar las demás.
+        """
+        objetivos = list(objetivos or self.etapas)
+        self._futuros, self._claves, self.memorizadas = {}, {}, []
+
+        # Un hilo por etapa: una etapa que espera a otra nunca deja al pool sin hilos
+        with ThreadPoolExecutor(max_workers=max(1, len(self.etapas)), thread_name_prefix="etapa") as pool:
+            self._pool = pool
+            for nombre in objetivos:
+                self._resolver(nombre)
+
+            resultados, errores = {}, {}
+            for nombre in objetivos:
+                try:
+                    resultados[nombre] = self._futuros[nombre].result()
+                except Exception as e:
+                    errores[nombre] = e
+
+            # Lo que se resolvió de paso (dependencias) también se devuelve
+            for nombre, futuro in list(self._futuros.items()):
+                if nombre not in resultados and nombre not in errores and futuro.done() and not futuro.exception():
+                    resultados[nombre] = futuro.result()
+        self._pool = None
+
+        if errores:
+            raise ERROR_ETAPA(errores)
+        return resultados
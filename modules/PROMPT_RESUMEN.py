@@ -0,0 +1,227 @@
+import difflib
+import math
+import re
+
+import pandas as pd
+
+from modules.LIMPIAR_TEXTO import LIMPIAR_TEXTO
+
+
+class PROMPT_RESUMEN:
+    """
+    Prompts para el resumen diario de Gemini, con presupuesto de tokens.
+
+    - Las descripciones casi iguales (mismo texto salvo mayúsculas, tildes,
+      puntuación o espacios, o con similitud >= UMBRAL_SIMILITUD y los
+      mismos números) se envían una sola vez, marcadas con cuántas veces se
+      repiten: "(x3)". Los números se respetan porque distinguen apartamentos,
+      torres o cantidades.
+    - Si el prompt del día cabe en `presupuesto_tokens`, se usa tal cual
+      (prompt_dia).
+    - Si no, las descripciones se reparten en bloques que sí caben
+      (prompts_bloques: un resumen parcial por bloque) y los parciales se
+      unen después en el resumen final de máximo MAX_PALABRAS palabras
+      (prompts_reduccion, por niveles si los parciales tampoco caben juntos).
+      Una descripción larga va completa en su propio bloque; solo la que no
+      cabe ni sola en un bloque se recorta, con la marca MARCA_RECORTE, y se
+      cuenta en `recortadas` para que el resumen final lo advierta.
+
+    Los tokens se estiman por caracteres (CARACTERES_POR_TOKEN); no hace
+    falta el tokenizador del modelo para decidir cuándo dividir.
+    """
+
+    PRESUPUESTO_DEFAULT = 4000      # tokens por petición
+    CARACTERES_POR_TOKEN = 4        # aproximación para texto en español
+    UMBRAL_SIMILITUD = 0.9
+    MAX_PALABRAS = 150
+    PALABRAS_PARCIAL = 120
+    SEPARADOR = "\n---\n"
+    MARCA_RECORTE = " […]"
+
+    RE_NO_PALABRA = re.compile(r"[\W_]+")
+    RE_NUMEROS = re.compile(r"\d+")
+
+    def __init__(self, df: pd.DataFrame, presupuesto_tokens: int = PRESUPUESTO_DEFAULT):
+        """
+        - df: actividades de un día, con las columnas 'DESCRIPCION' y 'ZONA'.
+        - presupuesto_tokens: tamaño máximo estimado de cada prompt.
+        """
+        self.presupuesto_tokens = presupuesto_tokens
+        self.zonas_str = ", ".join(df['ZONA'].astype(str).unique())
+
+        descripciones = df['DESCRIPCION'].dropna().astype(str)
+        self.n_descripciones = len(descripciones)
+        self.descripciones = self.deduplicar(descripciones)
+        self.recortadas = 0
+
+    # ------------------------------------------------------------------
+    # Tokens y duplicados
+    # ------------------------------------------------------------------
+    @classmethod
+    def estimar_tokens(cls, texto: str) -> int:
+        return math.ceil(len(texto) / cls.CARACTERES_POR_TOKEN)
+
+    @classmethod
+    def _clave(cls, texto: str) -> str:
+        """Texto comparable: sin tildes, mayúsculas, puntuación ni espacios repetidos."""
+        return cls.RE_NO_PALABRA.sub(" ", LIMPIAR_TEXTO.pdf(texto).lower()).strip()
+
+    @classmethod
+    def deduplicar(cls, descripciones) -> list:
+        """
+        Descripciones sin repetir, en el orden en que aparecen. Las que se
+        repiten llevan " (xN)". La comparación por similitud solo se hace
+        entre textos con los mismos números y de largo parecido
+        (real_quick_ratio / quick_ratio descartan el resto rápido).
+        """
+        claves, textos, repeticiones = [], [], []
+        por_clave, por_numeros = {}, {}
+        for texto in descripciones:
+            clave = cls._clave(texto)
+            if not clave:
+                continue
+
+            i = por_clave.get(clave)
+            if i is None:
+                grupo = por_numeros.setdefault(tuple(cls.RE_NUMEROS.findall(clave)), [])
+                # seq2 = la clave nueva: difflib guarda su índice y solo cambia seq1
+                comparador = difflib.SequenceMatcher(None, "", clave, autojunk=False)
+                for j in grupo:
+                    comparador.set_seq1(claves[j])
+                    if (comparador.real_quick_ratio() >= cls.UMBRAL_SIMILITUD
+                            and comparador.quick_ratio() >= cls.UMBRAL_SIMILITUD
+                            and comparador.ratio() >= cls.UMBRAL_SIMILITUD):
+                        i = j
+                        break
+
+            if i is None:
+                por_clave[clave] = len(claves)
+                grupo.append(len(claves))
+                claves.append(clave)
+                textos.append(texto)
+                repeticiones.append(1)
+            else:
+                por_clave[clave] = i
+                repeticiones[i] += 1
+
+        return [t if n == 1 else f"{t} (x{n})" for t, n in zip(textos, repeticiones)]
+
+    @classmethod
+    def recortar(cls, texto, max_palabras: int = MAX_PALABRAS):
+        """Corta `texto` en la palabra `max_palabras` (si el modelo se pasó)."""
+        if not isinstance(texto, str):
+            return texto
+        corte = re.match(r"\s*(?:\S+\s+){%d}" % max_palabras, texto)
+        if corte is None or not texto[corte.end():].strip():
+            return texto
+        return texto[:corte.end()].rstrip() + "…"
+
+    # ------------------------------------------------------------------
+    # Prompts
+    # ------------------------------------------------------------------
+    def prompt_dia(self) -> str:
+        """El prompt de siempre: todas las descripciones del día en una petición."""
+        zonas_str = self.zonas_str
+        texto_descripciones = self.SEPARADOR.join(self.descripciones)
+        prompt_instruccion = f"""
+        **INSTRUCCIÓN:**
+        A continuación, se te proporcionarán varias descripciones de mantenimiento y reportes, 
+        separadas por el delimitador '---'.
+
+        Estas descripciones están asociadas a las siguientes ubicaciones (Zonas): **{zonas_str}**.
+        Tu tarea es generar un resumen único de maximo 150 palabras, coherente y conciso de estos reportes y debe que la información es un resumen de los reportes de las zonas listadas ({zonas_str}) ignora los nan. 
+        El resumen debe estar en español.
+
+        --- DESCRIPCIONES DE ENTRADA ---
+        {texto_descripciones}
+        """
+
+        return prompt_instruccion
+
+    def cabe(self) -> bool:
+        return self.estimar_tokens(self.prompt_dia()) <= self.presupuesto_tokens
+
+    def _prompt_parcial(self, textos, parte, total, de_que) -> str:
+        return f"""
+        **INSTRUCCIÓN:**
+        A continuación tienes {de_que} de mantenimiento de un mismo día (parte {parte} de {total}),
+        separados por el delimitador '---'. Corresponden a las zonas: **{self.zonas_str}**.
+        Resume en máximo {self.PALABRAS_PARCIAL} palabras los trabajos realizados, conservando zonas,
+        equipos y cantidades; no inventes información e ignora los nan. El resumen debe estar en español.
+        {self._nota_bloque(textos)}
+        --- ENTRADA ---
+        {self.SEPARADOR.join(textos)}
+        """
+
+    def _prompt_final(self, parciales) -> str:
+        return f"""
+        **INSTRUCCIÓN:**
+        A continuación tienes resúmenes parciales de los reportes de mantenimiento de un mismo día,
+        separados por el delimitador '---'. Corresponden a las zonas: **{self.zonas_str}**.
+        Tu tarea es unirlos en un resumen único de máximo {self.MAX_PALABRAS} palabras, coherente y conciso,
+        sin repetir información, que deje claro que resume los reportes de las zonas listadas. Ignora los nan.
+        El resumen debe estar en español.
+
+        {self._nota_recorte()}
+        --- RESÚMENES PARCIALES ---
+        {self.SEPARADOR.join(parciales)}
+        """
+
+    def _nota_bloque(self, textos) -> str:
+        if not any(t.endswith(self.MARCA_RECORTE) for t in textos):
+            return ""
+        return f"Los textos que terminan en '{self.MARCA_RECORTE.strip()}' se recortaron por largos: menciónalo.\n"
+
+    def _nota_recorte(self) -> str:
+        if not self.recortadas:
+            return ""
+        return (f"Nota: {self.recortadas} textos eran demasiado largos y se recortaron "
+                f"(terminan en '{self.MARCA_RECORTE.strip()}'); indica que ese detalle está incompleto.\n")
+
+    def _bloques(self, textos, de_que) -> list:
+        """
+        Reparte `textos`, en orden, en bloques cuyo prompt parcial cabe en el
+        presupuesto. Un texto que no cabe junto a los anteriores abre un
+        bloque nuevo; si no cabe ni solo, se recorta con MARCA_RECORTE.
+        """
+        # Prompt sin textos, pero con la nota de recorte (el peor caso)
+        base = self.estimar_tokens(self._prompt_parcial([self.MARCA_RECORTE], 99, 99, de_que))
+        disponible = max(2, self.presupuesto_tokens - base)
+        max_caracteres = (disponible - 1) * self.CARACTERES_POR_TOKEN - len(self.SEPARADOR + self.MARCA_RECORTE)
+
+        bloques, actual, tokens = [], [], 0
+        for texto in textos:
+            if len(texto) > max_caracteres:
+                texto = texto[:max(1, max_caracteres)].rstrip() + self.MARCA_RECORTE
+                self.recortadas += 1
+            costo = self.estimar_tokens(texto + self.SEPARADOR)
+            if actual and tokens + costo > disponible:
+                bloques.append(actual)
+                actual, tokens = [], 0
+            actual.append(texto)
+            tokens += costo
+        if actual:
+            bloques.append(actual)
+        return bloques
+
+    def prompts_bloques(self) -> list:
+        """Un prompt de resumen parcial por bloque de descripciones."""
+        bloques = self._bloques(self.descripciones, "descripciones")
+        return [self._prompt_parcial(b, i + 1, len(bloques), "descripciones")
+                for i, b in enumerate(bloques)]
+
+    def prompts_reduccion(self, parciales) -> list:
+        """
+        Siguiente nivel de la reducción. Una lista de un solo prompt es la
+        del resumen final; si los parciales no caben juntos, se devuelven
+        los prompts que los agrupan en parciales más pocos.
+        """
+        final = self._prompt_final(parciales)
+        if self.estimar_tokens(final) <= self.presupuesto_tokens or len(parciales) <= 2:
+            return [final]
+        bloques = self._bloques(parciales, "resúmenes parciales")
+        if len(bloques) >= len(parciales):
+            # Ningún par de parciales cabe junto: agrupar más no reduce nada
+            return [final]
+        return [self._prompt_parcial(b, i + 1, len(bloques), "resúmenes parciales")
+                for i, b in enumerate(bloques)]
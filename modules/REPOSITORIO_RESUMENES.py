@@ -0,0 +1,66 @@
+import pandas as pd
+
+from modules.CREATE_TABLE_RESUMS import CREATE_TABLE_RESUMS
+from modules.INSTRUMENTACION import INSTRUMENTACION
+
+
+class REPOSITORIO_RESUMENES:
+    """
+    Índice en memoria {fecha: resumen} de los resúmenes diarios.
+
+    Las fechas se normalizan UNA vez al cargar (día sin hora), de modo que
+    `get()` es una búsqueda O(1) en un diccionario, sin recorrer ningún
+    DataFrame por cada día del informe. Lo usan tanto el PDF como el Excel.
+    """
+
+    def __init__(self, tabla_resumenes: CREATE_TABLE_RESUMS = None):
+        """
+        - tabla_resumenes: almacén de resúmenes del que se leen los datos
+          (por defecto CREATE_TABLE_RESUMS con sus rutas por defecto).
+        """
+        self.tabla_resumenes = tabla_resumenes
+        self._indice = {}
+
+    @staticmethod
+    def _clave(fecha) -> pd.Timestamp:
+        return pd.Timestamp(fecha).normalize()
+
+    @classmethod
+    def desde_dataframe(cls, df: pd.DataFrame):
+        """Construye el índice desde un DataFrame con columnas FECHA y RESUMEN."""
+        repo = cls()
+        fechas = pd.to_datetime(df["FECHA"], errors="coerce").dt.normalize()
+        for fecha, resumen in zip(fechas, df["RESUMEN"]):
+            if pd.isna(fecha) or not isinstance(resumen, str):
+                continue
+            repo._indice.setdefault(fecha, resumen)
+        return repo
+
+    @INSTRUMENTACION.medir("resumenes.prefetch")
+    def prefetch(self, fechas):
+        """
+        Carga solo los resúmenes del periodo del informe (entre la primera y
+        la última fecha de `fechas`, ej. el rango 26→25). Devuelve self.
+        """
+        if self.tabla_resumenes is None:
+            self.tabla_resumenes = CREATE_TABLE_RESUMS()
+
+        fechas = pd.DatetimeIndex(pd.to_datetime(list(fechas)))
+        if fechas.empty:
+            return self
+
+        resumenes = self.tabla_resumenes.leer_rango(fechas.min(), fechas.max())
+        for fecha, resumen in resumenes.items():
+            self._indice[self._clave(fecha)] = resumen
+        INSTRUMENTACION.contar(resumenes=len(resumenes))
+        return self
+
+    def get(self, fecha, default=None):
+        """Resumen del día `fecha` (date, datetime, Timestamp o str) o `default`."""
+        return self._indice.get(self._clave(fecha), default)
+
+    def __contains__(self, fecha) -> bool:
+        return self._clave(fecha) in self._indice
+
+    def __len__(self) -> int:
+        return len(self._indice)
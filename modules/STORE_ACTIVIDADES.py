@@ -0,0 +1,213 @@
+import json
+import sqlite3
+from contextlib import contextmanager
+from pathlib import Path
+
+import pandas as pd
+
+from modules.CACHE_EXCEL import CACHE_EXCEL
+
+
+class STORE_ACTIVIDADES:
+    """
+    Almacén local (SQLite) de actividades, particionado por año-mes
+    (columna PERIODO = 'YYYY-MM', indexada).
+
+    - `ingerir()` importa del libro de Excel las filas nuevas y actualiza las
+      que cambiaron (upsert por ID_ACTIVIDAD): si se corrige un valor o una
+      descripción en el libro, el almacén lo sigue. Si el libro no cambió
+      desde la última importación (misma ruta, tamaño y mtime) ni siquiera
+      se vuelve a leer.
+    - `cargar_rango()` lee solo las particiones que se cruzan con el rango
+      pedido (por ejemplo, del 26 del mes anterior al 25 del mes actual).
+
+    Las filas que se borran del libro no se borran del almacén; para eso,
+    `reconstruir()` vacía el almacén y la próxima ingesta importa todo.
+    """
+
+    RUTA_DEFAULT = "BD/CACHE/actividades.sqlite"
+    TABLA = "actividades"
+    CLAVE = "ID_ACTIVIDAD"
+
+    # Montos que el libro trae a veces como número y a veces como texto ('$ 1.200')
+    COLUMNAS_MIXTAS = ["CANTIDAD", "VALOR_UNITARIO", "VALOR_TOTAL"]
+
+    def __init__(self, ruta_bd=RUTA_DEFAULT):
+        self.ruta_bd = Path(ruta_bd)
+        self.ruta_bd.parent.mkdir(parents=True, exist_ok=True)
+
+        with self._conectar() as con:
+            con.execute(
+                f'CREATE TABLE IF NOT EXISTS {self.TABLA} ('
+                f'"{self.CLAVE}" PRIMARY KEY, '
+                f'"PERIODO" TEXT NOT NULL, '
+                f'"FECHA" TEXT)'
+            )
+            con.execute(
+                f'CREATE INDEX IF NOT EXISTS idx_{self.TABLA}_periodo '
+                f'ON {self.TABLA} ("PERIODO", "FECHA")'
+            )
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS meta (clave TEXT PRIMARY KEY, valor TEXT)"
+            )
+
+    @contextmanager
+    def _conectar(self):
+        """Conexión con commit al salir sin errores (rollback si falla) y cierre."""
+        con = sqlite3.connect(self.ruta_bd)
+        try:
+            with con:
+                yield con
+        finally:
+            con.close()
+
+    # ------------------------------------------------------------------
+    # Importación
+    # ------------------------------------------------------------------
+    def ingerir(self, ruta_excel, leer, variante="") -> int:
+        """
+        Importa las filas nuevas del libro y actualiza las que cambiaron.
+
+        - ruta_excel: libro de origen (se usa su firma para saber si cambió).
+        - leer: función sin argumentos que devuelve el DataFrame de la hoja.
+        - variante: identifica el tipo de lectura (por ejemplo 'item_3.1'),
+          para no mezclar firmas de lecturas distintas.
+
+        Devuelve el número de filas insertadas o actualizadas.
+        """
+        firma = CACHE_EXCEL(ruta_excel, hoja="BD", variante=variante).firma()
+        clave_meta = f"firma:{variante}"
+
+        with self._conectar() as con:
+            fila = con.execute("SELECT valor FROM meta WHERE clave = ?", (clave_meta,)).fetchone()
+        if fila is not None and json.loads(fila[0]) == firma:
+            return 0
+
+        df = leer()
+        cambios = self._insertar(df)
+
+        with self._conectar() as con:
+            con.execute(
+                "INSERT OR REPLACE INTO meta (clave, valor) VALUES (?, ?)",
+                (clave_meta, json.dumps(firma)),
+            )
+
+        if cambios:
+            print(f"📥 {cambios} actividades nuevas o actualizadas en {self.ruta_bd}")
+        return cambios
+
+    @classmethod
+    def _tipo_sqlite(cls, serie: pd.Series) -> str:
+        """
+        Tipo declarado de una columna nueva según su dtype. Los montos
+        (COLUMNAS_MIXTAS), las columnas object con valores mezclados y las
+        que llegan vacías se declaran BLOB: es la única afinidad de SQLite
+        que no convierte los valores (TEXT guardaría 1200.0 como '1200.0' e
+        INTEGER/REAL leerían el texto '1.200' como 1.2).
+        """
+        if serie.name in cls.COLUMNAS_MIXTAS or not serie.notna().any():
+            return "BLOB"
+        if pd.api.types.is_bool_dtype(serie) or pd.api.types.is_integer_dtype(serie):
+            return "INTEGER"
+        if pd.api.types.is_float_dtype(serie):
+            return "REAL"
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            return "TEXT"
+        valores = serie.dropna()
+        if valores.map(type).eq(str).all():
+            return "TEXT"
+        return "BLOB"
+
+    def _insertar(self, df: pd.DataFrame) -> int:
+        if self.CLAVE not in df.columns:
+            raise KeyError(
+                f"No existe la columna '{self.CLAVE}' en el DataFrame. "
+                f"Columnas disponibles: {df.columns.tolist()}"
+            )
+
+        df = df[df[self.CLAVE].notna()]
+        fechas = pd.to_datetime(df["FECHA"], errors="coerce")
+        df = df[fechas.notna()]
+        fechas = fechas[fechas.notna()]
+        if df.empty:
+            return 0
+
+        # Valores listos para SQLite: fechas en ISO, nulos como None
+        datos = df.astype(object).where(df.notna(), None)
+        for col in df.columns:
+            if pd.api.types.is_datetime64_any_dtype(df[col]):
+                datos[col] = df[col].dt.strftime("%Y-%m-%d %H:%M:%S").where(df[col].notna(), None)
+        datos["FECHA"] = fechas.dt.strftime("%Y-%m-%d %H:%M:%S")
+        datos["PERIODO"] = fechas.dt.strftime("%Y-%m")
+
+        columnas = list(datos.columns)
+        with self._conectar() as con:
+            existentes = {fila[1] for fila in con.execute(f"PRAGMA table_info({self.TABLA})")}
+            for col in columnas:
+                if col not in existentes:
+                    tipo = "TEXT" if col == "PERIODO" else self._tipo_sqlite(df[col])
+                    con.execute(f'ALTER TABLE {self.TABLA} ADD COLUMN "{col}" {tipo}')
+
+            antes = con.total_changes
+            nombres = ", ".join(f'"{c}"' for c in columnas)
+            marcas = ", ".join("?" for _ in columnas)
+            otras = [c for c in columnas if c != self.CLAVE]
+            asignaciones = ", ".join(f'"{c}" = excluded."{c}"' for c in otras)
+            # Solo se reescriben las filas que cambiaron (total_changes no cuenta las iguales)
+            distintas = " OR ".join(f'"{c}" IS NOT excluded."{c}"' for c in otras)
+            con.executemany(
+                f"INSERT INTO {self.TABLA} ({nombres}) VALUES ({marcas}) "
+                f'ON CONFLICT("{self.CLAVE}") DO UPDATE SET {asignaciones} WHERE {distintas}',
+                datos.itertuples(index=False, name=None),
+            )
+            return con.total_changes - antes
+
+    def reconstruir(self):
+        """Vacía el almacén; la próxima ingesta importa de nuevo todo el libro."""
+        with self._conectar() as con:
+            con.execute(f"DELETE FROM {self.TABLA}")
+            con.execute("DELETE FROM meta")
+
+    # ------------------------------------------------------------------
+    # Lectura
+    # ------------------------------------------------------------------
+    @staticmethod
+    def periodos(fecha_inicio, fecha_fin) -> list:
+        """Particiones 'YYYY-MM' que se cruzan con el rango [inicio, fin]."""
+        inicio = pd.Timestamp(fecha_inicio).to_period("M")
+        fin = pd.Timestamp(fecha_fin).to_period("M")
+        return [str(p) for p in pd.period_range(inicio, fin, freq="M")]
+
+    def cargar_rango(self, fecha_inicio, fecha_fin) -> pd.DataFrame:
+        """
+        Devuelve las actividades con FECHA entre fecha_inicio y fecha_fin
+        (ambos días incluidos), leyendo solo las particiones necesarias.
+        """
+        periodos = self.periodos(fecha_inicio, fecha_fin)
+        desde = pd.Timestamp(fecha_inicio).normalize().strftime("%Y-%m-%d %H:%M:%S")
+        hasta = (
+            pd.Timestamp(fecha_fin).normalize() + pd.Timedelta(days=1)
+        ).strftime("%Y-%m-%d %H:%M:%S")
+
+        marcas = ", ".join("?" for _ in periodos)
+        consulta = (
+            f'SELECT * FROM {self.TABLA} '
+            f'WHERE "PERIODO" IN ({marcas}) AND "FECHA" >= ? AND "FECHA" < ? '
+            f'ORDER BY rowid'
+        )
+        with self._conectar() as con:
+            df = pd.read_sql_query(consulta, con, params=[*periodos, desde, hasta])
+        return self._restaurar_tipos(df)
+
+    def cargar_todo(self) -> pd.DataFrame:
+        with self._conectar() as con:
+            df = pd.read_sql_query(f"SELECT * FROM {self.TABLA} ORDER BY rowid", con)
+        return self._restaurar_tipos(df)
+
+    @staticmethod
+    def _restaurar_tipos(df: pd.DataFrame) -> pd.DataFrame:
+        df = df.drop(columns=["PERIODO"])
+        df["FECHA"] = pd.to_datetime(df["FECHA"], errors="coerce")
+        if "ID_ITEM" in df.columns:
+            df["ID_ITEM"] = pd.to_numeric(df["ID_ITEM"], errors="coerce")
+        return df
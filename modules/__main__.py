@@ -0,0 +1,3 @@
+from modules.CLI import main
+
+raise SystemExit(main())
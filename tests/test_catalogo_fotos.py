@@ -0,0 +1,52 @@
+"""CATALOGO_FOTOS: el manifiesto se invalida por carpeta (y por foto con revalidar_fotos)."""
+import os
+
+from PIL import Image
+
+from modules.CATALOGO_FOTOS import CATALOGO_FOTOS
+
+
+def _reemplazar_en_el_sitio(actividad, ruta, tam):
+    """Nueva imagen con el mismo nombre; la carpeta conserva su mtime."""
+    mtime_carpeta = os.stat(actividad).st_mtime_ns
+    Image.new("RGB", tam).save(ruta)
+    os.utime(actividad, ns=(mtime_carpeta, mtime_carpeta))
+
+
+def _carpeta_con_una_foto(tmp_path):
+    actividad = tmp_path / "fotos" / "7"
+    actividad.mkdir(parents=True)
+    ruta = actividad / "foto_0.jpg"
+    Image.new("RGB", (100, 50)).save(ruta)
+    return tmp_path / "fotos", actividad, ruta
+
+
+def test_carpeta_sin_cambios_no_toca_las_fotos(tmp_path, monkeypatch):
+    carpeta, actividad, ruta = _carpeta_con_una_foto(tmp_path)
+    manifiesto = tmp_path / "catalogo.json"
+    assert CATALOGO_FOTOS(str(carpeta), manifiesto).fotos(7)[0]["ancho"] == 100
+
+    _reemplazar_en_el_sitio(actividad, ruta, (40, 80))
+
+    def _sin_stat_por_foto(*args, **kwargs):
+        raise AssertionError("no debía revisar las fotos de una carpeta sin cambios")
+
+    monkeypatch.setattr(CATALOGO_FOTOS, "_leer_foto", staticmethod(_sin_stat_por_foto))
+    foto = CATALOGO_FOTOS(str(carpeta), manifiesto).fotos(7)[0]
+    assert (foto["ancho"], foto["alto"]) == (100, 50)
+
+
+def test_revalidar_fotos_detecta_la_foto_reemplazada(tmp_path):
+    carpeta, actividad, ruta = _carpeta_con_una_foto(tmp_path)
+    manifiesto = tmp_path / "catalogo.json"
+    CATALOGO_FOTOS(str(carpeta), manifiesto).fotos(7)
+
+    _reemplazar_en_el_sitio(actividad, ruta, (40, 80))
+
+    foto = CATALOGO_FOTOS(str(carpeta), manifiesto, revalidar_fotos=True).fotos(7)[0]
+    assert (foto["ancho"], foto["alto"]) == (40, 80)
+    assert foto["tamano"] == os.stat(ruta).st_size
+
+    # Y queda guardado en el manifiesto para las corridas sin revalidar
+    foto = CATALOGO_FOTOS(str(carpeta), manifiesto).fotos(7)[0]
+    assert (foto["ancho"], foto["alto"]) == (40, 80)
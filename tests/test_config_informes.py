@@ -0,0 +1,27 @@
+"""CONFIG_INFORMES: rutas por defecto dentro de BD/ o desde variables de entorno."""
+import os
+
+from modules.CONFIG_INFORMES import CONFIG_INFORMES
+
+
+def test_rutas_por_defecto_relativas_al_proyecto(monkeypatch):
+    monkeypatch.delenv("SPRBUN_RUTA_EXCEL", raising=False)
+    monkeypatch.delenv("SPRBUN_DIR_EXCEL", raising=False)
+    config = CONFIG_INFORMES()
+
+    for ruta in (config.ruta_excel, config.dir_excel, config.dir_pdf):
+        assert not os.path.isabs(ruta)
+        assert ruta.split(os.sep)[0] == "BD"
+
+
+def test_rutas_desde_variables_de_entorno(monkeypatch, tmp_path):
+    monkeypatch.setenv("SPRBUN_RUTA_EXCEL", str(tmp_path / "libro.xlsx"))
+    monkeypatch.setenv("SPRBUN_DIR_EXCEL", str(tmp_path / "excel"))
+
+    config = CONFIG_INFORMES()
+    assert config.ruta_excel == str(tmp_path / "libro.xlsx")
+    assert config.dir_excel == str(tmp_path / "excel")
+
+    # Lo que se pasa explícitamente (p. ej. desde la CLI) manda
+    config = CONFIG_INFORMES(ruta_excel="otro.xlsx", dir_excel="salida")
+    assert (config.ruta_excel, config.dir_excel) == ("otro.xlsx", "salida")
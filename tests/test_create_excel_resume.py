@@ -0,0 +1,87 @@
+"""CREATE_EXCEL_RESUME: libro write_only con valores, celdas combinadas y formatos."""
+import pandas as pd
+from openpyxl import load_workbook
+
+from modules.CREATE_EXCEL_RESUME import CREATE_EXCEL_RESUME
+from modules.REPOSITORIO_RESUMENES import REPOSITORIO_RESUMENES
+
+
+def _actividades():
+    return pd.DataFrame({
+        "FECHA": pd.to_datetime(["2024-04-02", "2024-04-01", "2024-04-01", "2024-03-20"]),
+        "ZONA": ["CUBIERTA B", "CUBIERTA A", "TANQUE", "FUERA DE RANGO"],
+        "ACTIVIDAD": ["Sellado", "Limpieza", "Llenado", "Otra"],
+        "DESCRIPCION": ["Sellado de juntas", "Limpieza de canales", "Llenado de tanque", "No va"],
+        "UNIDAD_MEDIDA": ["M2", "ML", "M3", "UND"],
+        "CANTIDAD": [4, 10, 2.5, 1],
+        "VALOR_UNITARIO": [1000, 500, "$1,200", 7],
+        "VALOR_TOTAL": [4000, 5000, "$3,000", 7],
+    })
+
+
+def _crear(tmp_path):
+    resumenes = REPOSITORIO_RESUMENES.desde_dataframe(
+        pd.DataFrame({"FECHA": ["2024-04-01"], "RESUMEN": ["Se limpiaron canales y se llenó el tanque."]})
+    )
+    ruta = CREATE_EXCEL_RESUME(output_dir=str(tmp_path)).crear_informe(
+        _actividades(), "2024-04-01", "2024-04-25", resumenes=resumenes
+    )
+    return load_workbook(ruta)
+
+
+def test_hoja_informe(tmp_path):
+    ws = _crear(tmp_path)["INFORME"]
+    moneda = CREATE_EXCEL_RESUME._MONEDA
+
+    assert ws["A1"].value == "INFORME GENERAL DE ACTIVIDADES EJECUTADAS - ABRIL 2024"
+    assert ws["A1"].font.bold and ws["A1"].font.size == 14
+
+    # Día 1: título, resumen, encabezado, dos filas y subtotal
+    assert ws["A3"].value == "Fecha: 01/04/2024"
+    assert ws["A4"].value == "Descripción del servicio: Se limpiaron canales y se llenó el tanque."
+    assert ws["C5"].value == "Actividad Realizada" and ws["C5"].fill.fgColor.rgb.endswith("D9D9D9")
+    assert [ws.cell(6, c).value for c in range(1, 8)] == \
+        ["01/04/2024", "CUBIERTA A", "Limpieza de canales", "ML", 10, 500, 5000]
+    assert [ws.cell(7, c).value for c in (3, 5, 6, 7)] == ["Llenado de tanque", 2.5, 1200, 3000]
+    assert ws["G6"].number_format == moneda and ws["G6"].border.left.style == "thin"
+    assert (ws["F8"].value, ws["G8"].value) == ("Total día", 8000)
+    assert ws["G8"].number_format == moneda and ws["G8"].font.bold
+
+    # Día 2 (sin resumen)
+    assert ws["A10"].value == "Fecha: 02/04/2024"
+    assert ws["C12"].value == "Sellado de juntas"
+    assert ws["G13"].value == 4000
+
+    # Resumen por unidad (ML, M2, M3, UND) y total general
+    assert ws["A16"].value == "RESUMEN ACTIVIDADES EN ML"
+    assert ws["A16"].fill.fgColor.rgb.endswith("99CCFF")
+    assert (ws["A17"].value, ws["B17"].value) == ("ML", 10)
+    assert ws["B18"].value == 5000 and ws["B18"].number_format == moneda
+    assert ws["A28"].value == "RESUMEN ACTIVIDADES EN UND" and ws["B29"].value == 0
+    assert ws["A32"].value == "TOTAL GENERAL DE TODAS LAS ACTIVIDADES"
+    assert (ws["A33"].value, ws["B33"].value) == ("Valor Total", 12000)
+
+    combinadas = {str(rango) for rango in ws.merged_cells.ranges}
+    assert combinadas == {
+        "A1:G1", "A3:G3", "A4:G4", "A10:G10",
+        "A16:B16", "A20:B20", "A24:B24", "A28:B28", "A32:B32",
+    }
+    assert ws.column_dimensions["C"].width == 60
+
+
+def test_hoja_base_datos(tmp_path):
+    ws = _crear(tmp_path)["BASE DATOS"]
+
+    assert [c.value for c in ws[1]] == [
+        "FECHA", "ZONA", "DESCRIPCION ITEM", "DESCRIPCION",
+        "UNIDAD_MEDIDA", "CANTIDAD", "VALOR_UNITARIO", "VALOR_TOTAL",
+    ]
+    # Solo las filas del rango, en el orden del DataFrame
+    assert ws.max_row == 4
+    assert ws["A2"].value.date() == pd.Timestamp("2024-04-02").date()
+    assert ws["A2"].number_format == "yyyy-mm-dd"
+    assert [ws.cell(4, c).value for c in range(2, 9)] == \
+        ["TANQUE", "Llenado", "Llenado de tanque", "M3", 2.5, 1200, 3000]
+    assert ws["H4"].number_format == CREATE_EXCEL_RESUME._MONEDA
+    assert ws["D4"].alignment.wrap_text
+    assert not ws.merged_cells.ranges
@@ -0,0 +1,169 @@
+"""GenerateText.generate_summaries contra un cliente falso (sin red)."""
+import threading
+import time
+
+import pandas as pd
+import pytest
+import tenacity
+
+import modules.GENERATE_RESUMS_DAILY as generate_resums_daily
+from modules.GENERATE_RESUMS_DAILY import GenerateText
+
+
+class ErrorApi(Exception):
+    """Imita google.genai.errors.APIError: el código HTTP va en `code`."""
+
+    def __init__(self, code):
+        super().__init__(f"HTTP {code}")
+        self.code = code
+
+
+class _Respuesta:
+    def __init__(self, text):
+        self.text = text
+
+
+class ModelosFalsos:
+    """
+    `respuestas` = {marca en el prompt: lista de resultados en orden}. Cada
+    resultado es un texto (o None) o una excepción a lanzar. Lo que no
+    coincide con ninguna marca responde "resumen".
+    """
+
+    def __init__(self, respuestas=None, espera=0.0):
+        self.respuestas = {k: list(v) for k, v in (respuestas or {}).items()}
+        self.espera = espera
+        self.llamadas = []
+        self.activas = 0
+        self.max_activas = 0
+        self._lock = threading.Lock()
+
+    def generate_content(self, model, contents):
+        prompt = contents[0]
+        with self._lock:
+            self.llamadas.append(prompt)
+            self.activas += 1
+            self.max_activas = max(self.max_activas, self.activas)
+            resultado = "resumen"
+            for marca, pendientes in self.respuestas.items():
+                if marca in prompt and pendientes:
+                    resultado = pendientes.pop(0)
+                    break
+        try:
+            time.sleep(self.espera)
+            if isinstance(resultado, BaseException):
+                raise resultado
+            return _Respuesta(resultado)
+        finally:
+            with self._lock:
+                self.activas -= 1
+
+    def llamadas_con(self, marca):
+        return sum(marca in p for p in self.llamadas)
+
+
+class ClienteFalso:
+    def __init__(self, modelos):
+        self.models = modelos
+
+
+@pytest.fixture(autouse=True)
+def sin_espera_entre_reintentos(monkeypatch):
+    monkeypatch.setattr(generate_resums_daily, "wait_exponential", lambda **_: tenacity.wait_none())
+
+
+def _generador(modelos, **kwargs):
+    kwargs.setdefault("peticiones_por_minuto", 60_000)
+    return GenerateText(client=ClienteFalso(modelos), usar_cache=False, **kwargs)
+
+
+def _dia(marca):
+    return pd.DataFrame({"ZONA": ["TORRE 1"], "DESCRIPCION": [f"Revisión de tanque {marca}"]})
+
+
+def test_concurrencia_acotada():
+    modelos = ModelosFalsos(espera=0.05)
+    dias = {f"2025-01-{d:02d}": _dia(f"dia{d}") for d in range(1, 11)}
+
+    resumenes, errores = _generador(modelos, max_concurrencia=3).generate_summaries(dias)
+
+    assert errores == {}
+    assert len(resumenes) == 10
+    assert 1 < modelos.max_activas <= 3
+
+
+def test_reintenta_429_y_5xx():
+    modelos = ModelosFalsos({"dia1": [ErrorApi(429), ErrorApi(503), "ok"]})
+
+    resumenes, errores = _generador(modelos, max_reintentos=4).generate_summaries({"d1": _dia("dia1")})
+
+    assert resumenes == {"d1": "ok"}
+    assert errores == {}
+    assert modelos.llamadas_con("dia1") == 3
+
+
+def test_reintenta_errores_de_conexion():
+    httpx = pytest.importorskip("httpx")
+    modelos = ModelosFalsos({"dia1": [ConnectionError("reset"), TimeoutError(), httpx.ReadTimeout("lento"), "ok"]})
+
+    resumenes, _ = _generador(modelos, max_reintentos=4).generate_summaries({"d1": _dia("dia1")})
+
+    assert resumenes == {"d1": "ok"}
+    assert modelos.llamadas_con("dia1") == 4
+
+
+@pytest.mark.parametrize("error", [ErrorApi(400), TypeError("bug"), KeyError("x"), AttributeError("y")])
+def test_no_reintenta_el_resto(error):
+    modelos = ModelosFalsos({"dia1": [error, "ok"]})
+
+    resumenes, errores = _generador(modelos).generate_summaries({"d1": _dia("dia1")})
+
+    assert resumenes == {}
+    assert errores["d1"] is error
+    assert modelos.llamadas_con("dia1") == 1
+
+
+def test_errores_aislados_por_fecha():
+    modelos = ModelosFalsos({
+        "dia2": [ErrorApi(400)],
+        "dia3": [None],              # respuesta bloqueada
+        "dia4": ["   "],
+        "dia5": [ErrorApi(500)] * 4,  # agota los reintentos
+    })
+    dias = {f"d{i}": _dia(f"dia{i}") for i in range(1, 6)}
+    dias["d6"] = _dia("dia6").iloc[:0]
+
+    resumenes, errores = _generador(modelos, max_reintentos=4).generate_summaries(dias)
+
+    assert resumenes == {"d1": "resumen"}
+    assert set(errores) == {"d2", "d3", "d4", "d5", "d6"}
+    assert isinstance(errores["d3"], ValueError)
+    assert modelos.llamadas_con("dia5") == 4
+
+
+def test_respuesta_vacia_no_se_guarda_en_cache(tmp_path):
+    from modules.CACHE_RESUMENES_LLM import CACHE_RESUMENES_LLM
+
+    cache = CACHE_RESUMENES_LLM(tmp_path / "cache.sqlite")
+    modelos = ModelosFalsos({"dia1": [None, "ok"]})
+    generador = GenerateText(client=ClienteFalso(modelos), cache=cache, peticiones_por_minuto=60_000)
+
+    assert generador.generate_summaries({"d1": _dia("dia1")})[0] == {}
+    assert generador.generate_summaries({"d1": _dia("dia1")})[0] == {"d1": "ok"}
+
+
+def test_concurrencia_acotada_con_dias_por_bloques():
+    # Cada día no cabe en el presupuesto: se resume en varios bloques a la vez
+    modelos = ModelosFalsos(espera=0.02)
+    descripciones = [f"Revisión de tanque {i} " + "con cambio de flotador " * 10 for i in range(12)]
+    dias = {
+        f"2025-01-{d:02d}": pd.DataFrame({"ZONA": ["TORRE 1"] * 12, "DESCRIPCION": descripciones})
+        for d in range(1, 5)
+    }
+
+    resumenes, errores = _generador(modelos, max_concurrencia=3, presupuesto_tokens=450).generate_summaries(dias)
+
+    assert errores == {}
+    assert len(resumenes) == 4
+    assert len(modelos.llamadas) >= 4 * 4      # al menos 3 bloques + el final por día
+    assert 1 < modelos.max_activas <= 3
@@ -0,0 +1,92 @@
+"""
+Presupuesto de importación de la consola: las dependencias pesadas
+(google.genai, fpdf, openpyxl) solo se cargan en la etapa que las usa.
+
+Cada caso corre en un proceso nuevo para que sys.modules esté limpio.
+"""
+import datetime as dt
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PESADAS = ("google.genai", "fpdf", "openpyxl")
+PRESUPUESTO_CLI_MS = 800
+
+# Corre el código dado y al final imprime qué dependencias pesadas se cargaron
+_SONDA = """
+import json, sys
+{codigo}
+cargadas = sorted(p for p in {pesadas!r} if any(m == p or m.startswith(p + ".") for m in sys.modules))
+print("@@" + json.dumps(cargadas))
+"""
+
+
+def _correr(codigo, cwd=RAIZ, argumentos=()):
+    entorno = dict(os.environ, PYTHONPATH=RAIZ)
+    salida = subprocess.run(
+        [sys.executable, *argumentos, "-c", _SONDA.format(codigo=codigo, pesadas=PESADAS)],
+        cwd=cwd, env=entorno, capture_output=True, text=True,
+    )
+    assert salida.returncode == 0, salida.stdout + salida.stderr
+    ultima = [l for l in salida.stdout.splitlines() if l.startswith("@@")][-1]
+    return set(json.loads(ultima[2:])), salida.stderr
+
+
+def _main(*argumentos):
+    return f"from modules.CLI import main\nassert main({list(argumentos)!r}) == 0"
+
+
+def test_importar_la_consola_no_carga_dependencias_pesadas():
+    cargadas, _ = _correr("import modules.CLI")
+    assert cargadas == set()
+
+
+def test_presupuesto_de_importacion_de_la_consola():
+    _, stderr = _correr("import modules.CLI", argumentos=("-X", "importtime"))
+    # "import time: <propio us> | <acumulado us> | <módulo>": el paquete y la consola
+    acumulado_us = sum(
+        int(linea.split("|")[1])
+        for linea in stderr.splitlines()
+        if linea.startswith("import time:") and linea.split("|")[-1].strip() in ("modules", "modules.CLI")
+    )
+    assert acumulado_us / 1000 <= PRESUPUESTO_CLI_MS
+
+
+@pytest.fixture(scope="module")
+def carpeta_con_almacen(tmp_path_factory):
+    """Libro de abril de 2024, plantillas del PDF y el almacén ya importado (con --only excel)."""
+    from benchmarks.datos_sinteticos import generar_libro_actividades, generar_plantillas
+
+    carpeta = tmp_path_factory.mktemp("informes")
+    generar_libro_actividades(str(carpeta / "bd.xlsx"), n_filas=120, proporcion_31=1.0,
+                              fecha_inicio=dt.datetime(2024, 3, 26), dias=30)
+    generar_plantillas(str(carpeta))
+    return carpeta
+
+
+def _argumentos(solo):
+    return ["--anio", "2024", "--mes", "4", "--ruta-excel", "bd.xlsx", "--salida-pdf", "pdf",
+            "--salida-excel", "excel", "--procesos", "1", "--only", solo]
+
+
+def test_only_excel_no_carga_fpdf_ni_gemini(carpeta_con_almacen):
+    cargadas, _ = _correr(_main(*_argumentos("excel")), cwd=carpeta_con_almacen)
+
+    assert "fpdf" not in cargadas
+    assert "google.genai" not in cargadas
+    assert os.listdir(carpeta_con_almacen / "excel")
+
+
+def test_only_pdf_no_carga_openpyxl_ni_gemini(carpeta_con_almacen):
+    # El almacén ya tiene el libro importado (lo hizo --only excel): no se relee
+    test_only_excel_no_carga_fpdf_ni_gemini(carpeta_con_almacen)
+
+    cargadas, _ = _correr(_main(*_argumentos("pdf")), cwd=carpeta_con_almacen)
+
+    assert "openpyxl" not in cargadas
+    assert "google.genai" not in cargadas
+    assert os.listdir(carpeta_con_almacen / "pdf")
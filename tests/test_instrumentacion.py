@@ -0,0 +1,29 @@
+"""--cprofile con PIPELINE: las etapas corren en hilos y deben salir en el volcado."""
+import pstats
+
+from modules.INSTRUMENTACION import INSTRUMENTACION
+from modules.PIPELINE import PIPELINE
+
+
+def _etapa_perfilada_cargar():
+    return sum(i * i for i in range(20000))
+
+
+def _etapa_perfilada_pdf(total):
+    return str(total)
+
+
+def test_el_perfil_incluye_las_etapas_del_pipeline(tmp_path):
+    ruta = tmp_path / "corrida.prof"
+    INSTRUMENTACION.activar(memoria=False, perfil=str(ruta))
+    try:
+        pipeline = PIPELINE()
+        pipeline.agregar("cargar", _etapa_perfilada_cargar)
+        pipeline.agregar("pdf", _etapa_perfilada_pdf, ["cargar"])
+        assert pipeline.ejecutar(["pdf"])["pdf"] == str(sum(i * i for i in range(20000)))
+        INSTRUMENTACION.guardar(str(tmp_path / "corrida.json"))
+    finally:
+        INSTRUMENTACION.desactivar()
+
+    funciones = {nombre for _, _, nombre in pstats.Stats(str(ruta)).stats}
+    assert {"_etapa_perfilada_cargar", "_etapa_perfilada_pdf"} <= funciones
@@ -0,0 +1,47 @@
+"""MINIATURAS_FOTOS.podar(): la caché no crece sin límite."""
+import os
+import time
+
+from PIL import Image
+
+from modules.MINIATURAS_FOTOS import MINIATURAS_FOTOS
+
+
+def _archivo(carpeta, nombre, tamano, dias_sin_uso):
+    ruta = carpeta / nombre
+    ruta.write_bytes(b"x" * tamano)
+    momento = time.time() - dias_sin_uso * 86400
+    os.utime(ruta, (momento, momento))
+    return ruta
+
+
+def test_poda_por_antiguedad_y_tmp_huerfanos(tmp_path):
+    miniaturas = MINIATURAS_FOTOS(tmp_path, max_dias=30)
+    vieja = _archivo(tmp_path, "vieja.jpg", 10, dias_sin_uso=40)
+    reciente = _archivo(tmp_path, "reciente.jpg", 10, dias_sin_uso=5)
+    huerfano = _archivo(tmp_path, "a.jpg.123.tmp", 10, dias_sin_uso=2)
+
+    assert miniaturas.podar() == 2
+    assert not vieja.exists() and not huerfano.exists()
+    assert reciente.exists()
+
+
+def test_poda_por_tamano_empieza_por_las_menos_usadas(tmp_path):
+    miniaturas = MINIATURAS_FOTOS(tmp_path, max_mb=2.5 / 1024)   # 2,5 KiB
+    rutas = [_archivo(tmp_path, f"m{i}.jpg", 1024, dias_sin_uso=i) for i in range(4)]
+
+    assert miniaturas.podar() == 2
+    assert [r.exists() for r in rutas] == [True, True, False, False]
+
+
+def test_usar_una_miniatura_la_protege(tmp_path):
+    origen = tmp_path / "foto.jpg"
+    Image.new("RGB", (400, 300)).save(origen)
+    miniaturas = MINIATURAS_FOTOS(tmp_path / "cache", max_dias=30)
+    ruta = miniaturas.obtener(str(origen), 20)
+    momento = time.time() - 40 * 86400
+    os.utime(ruta, (momento, momento))
+
+    assert miniaturas.obtener(str(origen), 20) == ruta
+    assert miniaturas.podar() == 0
+    assert os.path.exists(ruta)
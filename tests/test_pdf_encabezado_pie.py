@@ -0,0 +1,33 @@
+"""El encabezado y el pie se incrustan una sola vez aunque el PDF tenga muchas páginas."""
+import datetime as dt
+
+import pandas as pd
+
+from modules.CREATE_PDF_V1 import PDFHeaderFooter
+
+
+def test_un_xobject_por_imagen_de_encabezado_y_pie(tmp_path, monkeypatch):
+    from benchmarks.datos_sinteticos import generar_plantillas
+
+    monkeypatch.chdir(tmp_path)
+    generar_plantillas()
+
+    pdf = PDFHeaderFooter(usar_miniaturas=False)
+    pdf.set_compression(False)
+    for i in range(3):
+        fecha = dt.datetime(2025, 1, i + 1)
+        df = pd.DataFrame({
+            "FECHA": fecha,
+            "ZONA": "MUELLE 1",
+            "DESCRIPCION": [f"Llenado de tanque {j}" for j in range(40)],   # más de una página
+            "UNIDAD_MEDIDA": "M3",
+            "CANTIDAD": 10,
+            "VALOR_UNITARIO": 32000,
+            "VALOR_TOTAL": 320000,
+        })
+        pdf.agregar_tabla_actividades_dia(i + 1, 2025, fecha, df, descripcion_servicio="-")
+    contenido = bytes(pdf.output())
+
+    assert pdf.page_no() > 3
+    imagenes_distintas = {pdf.header_img, pdf.footer_img}
+    assert contenido.count(b"/Subtype /Image") == len(imagenes_distintas) == 2
@@ -0,0 +1,63 @@
+"""PDF_PARALELO: los días se dibujan en procesos y el PDF unido es el mismo que en serie."""
+import re
+
+import pandas as pd
+import pytest
+
+import modules.PDF_PARALELO as pdf_paralelo
+from modules.PDF_PARALELO import PDF_PARALELO
+
+
+@pytest.fixture
+def dias(tmp_path, monkeypatch):
+    from benchmarks.datos_sinteticos import generar_fotos, generar_plantillas
+
+    monkeypatch.chdir(tmp_path)
+    fechas = pd.date_range("2025-01-01", periods=5, freq="D")
+    df = pd.DataFrame({
+        "ID_ACTIVIDAD": range(1, 31),
+        "FECHA": [fechas[i % 5] for i in range(30)],
+        "ZONA": "MUELLE 1",
+        # Textos largos (filas altas y saltos de página), con paréntesis y un "/I3" que no es imagen
+        "DESCRIPCION": ["Llenado de tanque (cisterna) /I3 " * (i % 9 + 1) for i in range(30)],
+        "UNIDAD_MEDIDA": "M3",
+        "CANTIDAD": 10,
+        "VALOR_UNITARIO": 32000,
+        "VALOR_TOTAL": 320000,
+    })
+    generar_plantillas()
+    generar_fotos(df["ID_ACTIVIDAD"][::2], tam=(600, 800))
+    return [
+        dict(num_dia=i + 1, anio=fecha.year, fecha_dia=fecha, df_dia=df_dia, descripcion_servicio="-")
+        for i, (fecha, df_dia) in enumerate(df.groupby("FECHA"))
+    ]
+
+
+PORTADA = (2025, "ENERO", "DICIEMBRE", list(pd.date_range("2024-12-26", "2025-01-25")), "Resumen del mes.")
+
+
+def _sin_fechas(ruta):
+    return re.sub(rb"/CreationDate \(.*?\)|/ID \[.*?\]", b"", open(ruta, "rb").read())
+
+
+def test_mismo_pdf_que_en_serie(dias, capsys):
+    PDF_PARALELO(max_procesos=1).generar(dias, "serie.pdf", portada=PORTADA)
+    PDF_PARALELO(max_procesos=3).generar(dias, "paralelo.pdf", portada=PORTADA)
+
+    assert "Días dibujados en paralelo: 5 en 3 bloques" in capsys.readouterr().out
+    assert _sin_fechas("paralelo.pdf") == _sin_fechas("serie.pdf")
+
+
+def _bloque_sin_portada(dias, catalogo_fotos, previo=None, portada=None):
+    return pdf_paralelo._renderizar_bloque(dias, catalogo_fotos, previo)
+
+
+def test_bloque_con_otro_estado_se_dibuja_en_serie(dias, monkeypatch, capsys):
+    PDF_PARALELO(max_procesos=1).generar(dias, "serie.pdf", portada=PORTADA)
+
+    # Sin la portada, los bloques empiezan con otro color de trazo: no se pueden unir
+    monkeypatch.setattr(pdf_paralelo, "_renderizar_bloque", _bloque_sin_portada)
+    PDF_PARALELO(max_procesos=2).generar(dias, "paralelo.pdf", portada=PORTADA)
+
+    assert "se dibuja en serie" in capsys.readouterr().out
+    assert _sin_fechas("paralelo.pdf") == _sin_fechas("serie.pdf")
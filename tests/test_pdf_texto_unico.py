@@ -0,0 +1,32 @@
+"""Las filas de la tabla se miden sin dibujar: cada texto se escribe una sola vez."""
+import datetime as dt
+
+import pandas as pd
+
+from modules.CREATE_PDF_V1 import PDFHeaderFooter
+
+
+def test_cada_descripcion_aparece_una_vez(tmp_path, monkeypatch):
+    from benchmarks.datos_sinteticos import generar_plantillas
+
+    monkeypatch.chdir(tmp_path)
+    generar_plantillas()
+    fecha = dt.datetime(2025, 1, 15)
+    descripciones = [f"Revision bomba sumergible numero {i} zeta" for i in range(12)]
+    df = pd.DataFrame({
+        "FECHA": fecha,
+        "ZONA": "MUELLE 1",
+        "DESCRIPCION": descripciones,
+        "UNIDAD_MEDIDA": "M3",
+        "CANTIDAD": 10,
+        "VALOR_UNITARIO": 32000,
+        "VALOR_TOTAL": 320000,
+    })
+
+    pdf = PDFHeaderFooter(usar_miniaturas=False)
+    pdf.set_compression(False)
+    pdf.agregar_tabla_actividades_dia(1, 2025, fecha, df, descripcion_servicio="-")
+    contenido = bytes(pdf.output())
+
+    for descripcion in descripciones:
+        assert contenido.count(descripcion.encode("latin-1")) == 1, descripcion
@@ -0,0 +1,41 @@
+"""Bloques de PROMPT_RESUMEN para los días que no caben en una petición."""
+import pandas as pd
+
+from modules.PROMPT_RESUMEN import PROMPT_RESUMEN
+
+
+def _plan(descripciones, presupuesto):
+    df = pd.DataFrame({"ZONA": ["TORRE 1"] * len(descripciones), "DESCRIPCION": descripciones})
+    return PROMPT_RESUMEN(df, presupuesto_tokens=presupuesto)
+
+
+def test_descripcion_larga_va_completa_en_su_bloque():
+    larga = "revision de tanque " * 180          # ~850 tokens: más de medio bloque
+    plan = _plan(["corta uno", larga, "corta dos"], presupuesto=1000)
+
+    prompts = plan.prompts_bloques()
+
+    assert plan.recortadas == 0
+    assert sum(larga.strip() in p for p in prompts) == 1
+    assert all(PROMPT_RESUMEN.estimar_tokens(p) <= 1000 for p in prompts)
+
+
+def test_descripcion_que_no_cabe_sola_se_marca_y_se_cuenta():
+    enorme = "palabra " * 3000                  # ~6000 tokens
+    plan = _plan(["corta uno", enorme], presupuesto=1000)
+
+    prompts = plan.prompts_bloques()
+
+    assert plan.recortadas == 1
+    assert all(PROMPT_RESUMEN.estimar_tokens(p) <= 1000 for p in prompts)
+    recortado = [p for p in prompts if PROMPT_RESUMEN.MARCA_RECORTE.strip() in p]
+    assert len(recortado) == 1 and "se recortaron por largos" in recortado[0]
+
+    final = plan.prompts_reduccion(["parcial uno", "parcial dos"])[0]
+    assert "1 textos eran demasiado largos" in final
+
+
+def test_duplicados_casi_iguales_respetan_los_numeros():
+    assert PROMPT_RESUMEN.deduplicar(
+        ["Cambio de llave apto 301.", "cambio de  LLAVE apto 301", "Cambio de llave apto 302"]
+    ) == ["Cambio de llave apto 301. (x2)", "Cambio de llave apto 302"]